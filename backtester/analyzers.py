@@ -0,0 +1,88 @@
+import math
+import numpy as np
+import backtrader as bt
+from backtester.equity_store import CURVE_DTYPE
+from backtester.metrics import PERIODS_PER_YEAR, MetricsAccumulator
+
+# === Single-Pass Run Metrics ===
+# Replaces the SharpeRatio + TradeAnalyzer + DrawDown + EquityCurve analyzers
+# in bulk runs. next() records the broker value and feeds a MetricsAccumulator
+# (drawdown, Sortino, Calmar, exposure, turnover); the Sharpe ratio and the
+# equity curve are computed from the record once in stop(). Results match the
+# stock analyzers with their default params: yearly returns against a 1%
+# risk-free rate (population stddev), and every opened trade counted with
+# break-even closes as wins.
+
+RISK_FREE_RATE = 0.01
+
+
+def yearly_sharpe(dates, values, start_value, riskfreerate=RISK_FREE_RATE):
+    if len(values) == 0:
+        return None
+    years = dates.astype("M8[Y]")
+    year_end = np.flatnonzero(np.append(years[1:] != years[:-1], True))
+    ends = values[year_end].tolist()
+    returns = [v / prev - 1.0 for prev, v in zip([start_value] + ends[:-1], ends)]
+
+    ret_free = [r - riskfreerate for r in returns]
+    avg = math.fsum(ret_free) / len(ret_free)
+    dev = math.sqrt(math.fsum((r - avg) ** 2 for r in ret_free) / len(ret_free))
+    try:
+        return avg / dev
+    except ZeroDivisionError:
+        return None
+
+
+# Accumulator metrics reported next to the Backtrader-style Sharpe / drawdown
+EXTRA_METRICS = ["Sortino Ratio", "Calmar Ratio", "Exposure", "Turnover"]
+
+
+class RunMetrics(bt.Analyzer):
+    # bar_sharpe: report the accumulator's per-bar Sharpe instead of the
+    # yearly one, for intraday runs shorter than a couple of calendar years
+    params = (("periods_per_year", PERIODS_PER_YEAR), ("bar_sharpe", False))
+
+    def start(self):
+        self.start_value = self.strategy.broker.getvalue()
+        self.dates = []
+        self.values = []
+        self.traded = 0.0
+        self.acc = MetricsAccumulator(self.p.periods_per_year)
+
+    def notify_trade(self, trade):
+        if trade.justopened:
+            self.acc.open_trade()
+        elif trade.status == trade.Closed:
+            self.acc.close_trade(trade.pnlcomm >= 0.0)
+
+    def notify_order(self, order):
+        if order.status == order.Completed:
+            self.traded += abs(order.executed.size) * order.executed.price
+
+    def next(self):
+        value = self.strategy.broker.getvalue()
+        self.dates.append(self.data.datetime[0])
+        self.values.append(value)
+        self.acc.update(value, self.strategy.position.size, self.traded)
+        self.traded = 0.0
+
+    def stop(self):
+        values = np.array(self.values)
+        self.curve = np.empty(len(values), dtype=CURVE_DTYPE)
+        self.curve["date"] = [bt.num2date(d) for d in self.dates]
+        self.curve["equity"] = values
+        self.metrics = self.acc.result()
+        if self.p.bar_sharpe:
+            self.sharpe = self.metrics["Sharpe Ratio"]
+        else:
+            self.sharpe = yearly_sharpe(self.curve["date"], values, self.start_value)
+
+    def get_analysis(self):
+        return {
+            "sharperatio": self.sharpe,
+            "total_trades": self.acc.opened,
+            "won_trades": self.acc.wins,
+            "max_drawdown": abs(self.metrics["Max Drawdown"]),
+            "extra": {k: self.metrics[k] for k in EXTRA_METRICS},
+            "curve": self.curve
+        }
@@ -0,0 +1,127 @@
+import pandas as pd
+import numpy as np
+from backtester.engine import positions_from_signals, equity_from_positions
+from backtester.metrics import batch_metrics
+
+# === Matrix Builders ===
+# Align per-symbol frames (as returned by fetch_data / the strategy functions)
+# on a shared date index so the whole universe becomes one dates x symbols array.
+
+def align_matrix(frames, column="Close"):
+    series = {
+        symbol: df.set_index("Date")[column] if "Date" in df.columns else df[column]
+        for symbol, df in frames.items()
+    }
+    wide = pd.DataFrame(series).sort_index()
+    return wide.index, list(wide.columns), wide.to_numpy(dtype=float)
+
+
+def stack_signals(signal_sets):
+    # Stack several dates x symbols signal matrices (one per parameter set)
+    return np.stack([np.asarray(s, dtype=float) for s in signal_sets])
+
+
+# === Batched Kernel ===
+def backtest_batch(close, signals, starting_cash=10000, cost_rate=None):
+    # close:   (dates, symbols) price matrix, NaN where a symbol has no bar
+    # signals: (dates, symbols) or (params, dates, symbols) in the engine's
+    #          1 / -1 / 0 Signal convention
+    # Each column follows backtester.engine.backtest: the first bar a symbol
+    # trades is skipped, then the same all-in long-only rules apply.
+    return _run_batch(close, signals, starting_cash, from_signals=True, cost_rate=cost_rate)
+
+
+def backtest_batch_positions(close, positions, starting_cash=10000, cost_rate=None):
+    # Same as backtest_batch, but takes per-bar positions (1 long, -1 short,
+    # 0 flat) for strategies whose rules aren't a plain buy/sell signal.
+    # cost_rate: fraction of notional lost per fill (backtester/costs.py),
+    # (dates, symbols) or stacked (scenarios, dates, symbols) for cost sweeps
+    return _run_batch(close, positions, starting_cash, from_signals=False, cost_rate=cost_rate)
+
+
+def _run_batch(close, states, starting_cash, from_signals, cost_rate=None):
+    close = np.asarray(close, dtype=float)
+    states = np.asarray(states, dtype=float)
+    if cost_rate is not None:
+        cost_rate = np.asarray(cost_rate, dtype=float)
+        if cost_rate.ndim == 3 and states.ndim == 2:
+            states = np.broadcast_to(states, cost_rate.shape)
+    stacked = states.ndim == 3
+    if stacked:
+        states = np.moveaxis(states, 0, 1)
+        close = close[:, None, :]
+        if cost_rate is not None:
+            cost_rate = np.moveaxis(cost_rate, 0, 1) if cost_rate.ndim == 3 else cost_rate[:, None, :]
+    close, states = np.broadcast_arrays(close, states)
+
+    valid = ~np.isnan(close)
+    first_valid = np.where(valid.any(axis=0), valid.argmax(axis=0), close.shape[0])
+    rows = np.arange(close.shape[0]).reshape((-1,) + (1,) * (close.ndim - 1))
+    active = rows > first_valid
+
+    # Valuation uses the last known price; no trades on missing bars
+    filled = _ffill_prices(close, valid)
+    if from_signals:
+        positions = positions_from_signals(np.where(active & valid, states, 0))
+    else:
+        positions = np.where(active, states, 0).astype(np.int8)
+
+    equity, entries, exits, wins = equity_from_positions(filled, positions, starting_cash, cost_rate)
+    equity = np.where(rows >= first_valid, equity, np.nan)
+
+    metrics = _batch_metrics(equity, active & valid, exits.sum(axis=0), wins.sum(axis=0), positions)
+    if stacked:
+        equity = np.moveaxis(equity, 1, 0)
+    return equity, metrics
+
+
+def _ffill_prices(close, valid):
+    rows = np.arange(close.shape[0]).reshape((-1,) + (1,) * (close.ndim - 1))
+    last = np.maximum.accumulate(np.where(valid, rows, 0), axis=0)
+    return np.take_along_axis(close, last, axis=0)
+
+
+def _batch_metrics(equity, active, total_trades, wins, positions=None):
+    # active marks the bars each column's equity curve is measured on
+    # (see backtester.metrics.batch_metrics)
+    has_data = active.any(axis=0)
+    first_active = active.argmax(axis=0)
+    start_value = np.take_along_axis(equity, first_active[None], axis=0)[0]
+    end_value = equity[-1]
+
+    traded = None
+    if positions is not None:
+        # All-in sizing: a fill trades the whole equity
+        traded = np.abs(np.diff(positions, axis=0, prepend=0)) * equity
+    ratios = batch_metrics(equity, active, positions, traded)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win_rate = wins / np.maximum(1, total_trades) * 100
+        pct_return = (end_value - start_value) / start_value * 100
+
+    metrics = {
+        "Start Equity": np.round(start_value, 2),
+        "End Equity": np.round(end_value, 2),
+        "Percent Return": np.round(pct_return, 2),
+        "Total Trades": total_trades,
+        "Win Rate": np.round(win_rate, 2),
+        **{k: np.round(v, 2) for k, v in ratios.items()}
+    }
+    return {k: np.where(has_data, v, np.nan) for k, v in metrics.items()}
+
+
+# === Results ===
+def metrics_frame(metrics, symbols, param_sets=None):
+    # Flatten batch metrics into one summary row per (params, symbol)
+    # param_sets: list of dicts matching the leading axis of stacked signals
+    n_symbols = len(symbols)
+    columns = {k: np.asarray(v, dtype=float).reshape(-1) for k, v in metrics.items()}
+    n_sets = len(next(iter(columns.values()))) // n_symbols
+
+    df = pd.DataFrame({"Symbol": np.tile(np.asarray(symbols, dtype=object), n_sets)})
+    if param_sets is not None:
+        params = pd.DataFrame(list(param_sets)).loc[np.repeat(np.arange(n_sets), n_symbols)]
+        df = pd.concat([df, params.reset_index(drop=True)], axis=1)
+    for k, v in columns.items():
+        df[k] = v
+    return df
@@ -0,0 +1,233 @@
+import argparse
+from abc import ABC, abstractmethod
+import numpy as np
+import backtrader as bt
+
+# === Transaction Costs ===
+# Cost models price each fill as array operations, so the engines charge costs
+# without a per-bar Python loop:
+#   - cost(shares, price, high, low, volume): cash cost of each fill, for the
+#     share-based engines (fast path, portfolio) and the Cerebro mirror
+#   - rate(price, high, low): cost as a fraction of the traded notional, for
+#     the all-in engines (engine.py / batch.py), where share counts follow
+#     equity
+# Models add up (FixedBps(5) + SpreadSlippage(0.1)). Model parameters may be
+# arrays, and batch.backtest_batch_positions takes a stacked
+# (scenarios, dates, symbols) cost rate, so a cost sensitivity sweep is one
+# batched run (see cost_sweep).
+
+class CostModel(ABC):
+    @abstractmethod
+    def cost(self, shares, price, high=None, low=None, volume=0.0):
+        ...
+
+    def rate(self, price, high=None, low=None):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.nan_to_num(self.cost(1.0, price, high, low) / price)
+
+    def __add__(self, other):
+        return CombinedCost(self, other)
+
+
+class CombinedCost(CostModel):
+    def __init__(self, *models):
+        self.models = [m for model in models for m in getattr(model, "models", [model])]
+
+    def cost(self, shares, price, high=None, low=None, volume=0.0):
+        return sum(m.cost(shares, price, high, low, volume) for m in self.models)
+
+    def rate(self, price, high=None, low=None):
+        return sum(m.rate(price, high, low) for m in self.models)
+
+    def __repr__(self):
+        return " + ".join(map(repr, self.models))
+
+
+class FixedBps(CostModel):
+    # Percentage of the traded notional (commission or a flat slippage guess)
+    def __init__(self, bps):
+        self.bps = np.asarray(bps, dtype=float)
+
+    def cost(self, shares, price, high=None, low=None, volume=0.0):
+        return np.abs(shares) * price * self.bps / 1e4
+
+    def rate(self, price, high=None, low=None):
+        return np.broadcast_to(self.bps / 1e4, np.shape(price))
+
+    def __repr__(self):
+        return f"FixedBps({self.bps})"
+
+
+class PerShare(CostModel):
+    # Broker-style per-share fee with an optional minimum per fill. The
+    # minimum has no notional equivalent, so rate() ignores it.
+    def __init__(self, fee, minimum=0.0):
+        self.fee = np.asarray(fee, dtype=float)
+        self.minimum = np.asarray(minimum, dtype=float)
+
+    def cost(self, shares, price, high=None, low=None, volume=0.0):
+        shares = np.abs(shares)
+        return np.where(shares > 0, np.maximum(shares * self.fee, self.minimum), 0.0)
+
+    def rate(self, price, high=None, low=None):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.nan_to_num(self.fee / np.asarray(price, dtype=float))
+
+    def __repr__(self):
+        return f"PerShare({self.fee}, minimum={self.minimum})"
+
+
+class SpreadSlippage(CostModel):
+    # Crossing the spread, estimated from the fill bar's range: each share
+    # costs fraction * (High - Low)
+    def __init__(self, fraction=0.1):
+        self.fraction = np.asarray(fraction, dtype=float)
+
+    def cost(self, shares, price, high=None, low=None, volume=0.0):
+        if high is None or low is None:
+            raise ValueError("SpreadSlippage needs High/Low prices")
+        return np.abs(shares) * self.fraction * np.nan_to_num(np.subtract(high, low))
+
+    def __repr__(self):
+        return f"SpreadSlippage({self.fraction})"
+
+
+class TieredFees(CostModel):
+    # Exchange fee schedule: tiers = [(traded notional so far, bps), ...] in
+    # ascending order; each fill pays the tier reached before it. The all-in
+    # engines don't track traded notional, so rate() uses the first tier.
+    def __init__(self, tiers):
+        self.thresholds = np.array([t for t, _ in tiers], dtype=float)
+        self.bps = np.array([b for _, b in tiers], dtype=float)
+
+    def cost(self, shares, price, high=None, low=None, volume=0.0):
+        tier = np.maximum(np.searchsorted(self.thresholds, volume, side="right") - 1, 0)
+        return np.abs(shares) * price * self.bps[tier] / 1e4
+
+    def rate(self, price, high=None, low=None):
+        return np.broadcast_to(self.bps[0] / 1e4, np.shape(price))
+
+    def __repr__(self):
+        return f"TieredFees({list(zip(self.thresholds.tolist(), self.bps.tolist()))})"
+
+
+# Taker fees by 30-day volume, Binance-style spot schedule
+EXCHANGE_TIERS = [(0, 10), (1e6, 9), (5e6, 8), (2e7, 7), (1e8, 5)]
+
+
+def parse_costs(spec):
+    # "bps=10,per_share=0.005,min_fee=1,spread=0.1,tiered" -> CostModel or None
+    if not spec:
+        return None
+    options = dict(part.split("=", 1) if "=" in part else (part, "") for part in spec.split(","))
+    models = []
+    if "bps" in options:
+        models.append(FixedBps(float(options["bps"])))
+    if "per_share" in options:
+        models.append(PerShare(float(options["per_share"]), float(options.get("min_fee", 0))))
+    if "spread" in options:
+        models.append(SpreadSlippage(float(options["spread"])))
+    if "tiered" in options:
+        models.append(TieredFees(EXCHANGE_TIERS))
+    unknown = set(options) - {"bps", "per_share", "min_fee", "spread", "tiered"}
+    if unknown or not models:
+        raise ValueError(f"Unknown cost spec {spec!r}")
+    return models[0] if len(models) == 1 else CombinedCost(*models)
+
+
+# === Fills ===
+def split_fills(prev, held):
+    # Share changes split like Backtrader splits an order: the part that
+    # closes the existing position and the part that opens a new one
+    same_side = np.sign(prev) == np.sign(held)
+    reducing = same_side & (np.abs(held) < np.abs(prev))
+    closed = np.where(same_side, np.where(reducing, held - prev, 0.0), -prev)
+    opened = np.where(same_side, np.where(reducing, 0.0, held - prev), held)
+    return closed, opened
+
+
+def fill_costs(model, prev, held, price, high=None, low=None):
+    # Costs of the closing and opening part of each bar's fill; volume is
+    # the notional traded before the bar (for tiered fees)
+    closed, opened = split_fills(prev, held)
+    notional = (np.abs(closed) + np.abs(opened)) * price
+    volume = np.cumsum(notional, axis=-1) - notional
+    return (model.cost(closed, price, high, low, volume),
+            model.cost(opened, price, high, low, volume))
+
+
+# === Cerebro Mirror ===
+class CostCommission(bt.CommInfoBase):
+    # Charges a CostModel as Backtrader commission, reading High/Low from the
+    # fill bar, so Cerebro runs match the fast path with the same costs
+    params = (
+        ("model", None),
+        ("data", None),
+        ("stocklike", True),
+        ("commtype", bt.CommInfoBase.COMM_FIXED),
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.volume = 0.0
+
+    def _getcommission(self, size, price, pseudoexec):
+        data = self.p.data
+        high = data.high[0] if data is not None else None
+        low = data.low[0] if data is not None else None
+        return float(self.p.model.cost(size, price, high, low, self.volume))
+
+    def confirmexec(self, size, price):
+        # Called once per execution, after the closing and opening parts
+        # were charged; only the traded volume is recorded
+        self.volume += abs(size) * price
+        return 0.0
+
+
+# === Cost Sweep ===
+def cost_sweep(close, positions, models, high=None, low=None, starting_cash=10000):
+    # One batched run per (scenario, symbol): close/high/low (dates, symbols),
+    # positions (dates, symbols), models a list of CostModel
+    from backtester.batch import backtest_batch_positions
+    rates = np.stack([np.broadcast_to(m.rate(close, high, low), np.shape(close)) for m in models])
+    return backtest_batch_positions(close, positions, starting_cash, cost_rate=rates)
+
+
+def main():
+    import pandas as pd
+    from fetch_data import fetch_window
+    from strategies.indicators import IndicatorCache
+    from strategies.signals import position_builders
+
+    parser = argparse.ArgumentParser(description="Cost sensitivity of a strategy on one symbol")
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--strategy", choices=list(position_builders.keys()), required=True)
+    parser.add_argument("--start", default="2022-01-01")
+    parser.add_argument("--end", default="2025-05-01")
+    parser.add_argument("--bps", default="0,1,2,5,10,20,50", help="Commission levels in bps")
+    parser.add_argument("--spread", default="0", help="Spread fractions of the High-Low range")
+    args = parser.parse_args()
+
+    df = fetch_window(args.symbol, args.start, args.end)
+    if df is None or df.empty:
+        print(f"❌ No price data for {args.symbol}")
+        return
+    if "Date" in df.columns:
+        df = df.set_index("Date")
+    cache = IndicatorCache(df)
+    positions = cache.positions(args.strategy, {}, position_builders[args.strategy])[:, None]
+    close, high, low = (df[[c]].to_numpy(dtype=float) for c in ("Close", "High", "Low"))
+
+    grid = [(float(b), float(s)) for b in args.bps.split(",") for s in args.spread.split(",")]
+    models = [FixedBps(b) + SpreadSlippage(s) for b, s in grid]
+    _, metrics = cost_sweep(close, positions, models, high, low)
+
+    rows = pd.DataFrame(grid, columns=["Bps", "Spread"])
+    for name in ["Percent Return", "Sharpe Ratio", "Max Drawdown"]:
+        rows[name] = np.round(np.asarray(metrics[name], dtype=float).reshape(-1), 2)
+    print(f"💸 Cost sensitivity for {args.symbol} [{args.strategy}], {len(grid)} scenarios")
+    print(rows.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,182 @@
 import pandas as pd
 import numpy as np
+from backtester.metrics import MetricsAccumulator, batch_metrics
+
+# === Vectorized Core ===
+# Array helpers for the vectorized engine. Time runs along axis 0, so the same
+# helpers work on a single column or on a dates x symbols matrix.
+
+def _last_index(mask):
+    # Index of the most recent True at or before each row (-1 if none yet)
+    rows = np.arange(mask.shape[0]).reshape((-1,) + (1,) * (mask.ndim - 1))
+    idx = np.where(mask, rows, -1)
+    return np.maximum.accumulate(idx, axis=0)
+
+
+def _ffill(values, mask):
+    # Carry values[mask] forward in time, NaN before the first True
+    last = _last_index(mask)
+    filled = np.take_along_axis(values, np.maximum(last, 0), axis=0).astype(float)
+    filled[last < 0] = np.nan
+    return filled
+
+
+def _shift(values, fill):
+    shifted = np.empty_like(values)
+    shifted[:1] = fill
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def positions_from_signals(signals):
+    # Long-only state machine: a 1 opens a position when flat, a -1 closes it
+    # when long, anything else is a no-op. That collapses to "the last non-zero
+    # signal was a buy", which is a forward fill over the event rows.
+    signals = np.asarray(signals, dtype=float)
+    events = (signals == 1) | (signals == -1)
+    last = _ffill(signals, events)
+    return (last == 1).astype(np.int8)
+
+
+def equity_from_positions(close, positions, starting_cash=10000, cost_rate=None):
+    # All-in sizing: each trade compounds the cash left by the previous one.
+    # Positions are +1 (long), -1 (short) or 0 (flat) for each bar.
+    # cost_rate (broadcast like close) is the fraction of the traded notional
+    # lost on a fill at that bar (backtester/costs.py); a flip pays it twice.
+    close = np.asarray(close, dtype=float)
+    positions = np.asarray(positions)
+    prev = _shift(positions, 0)
+
+    changed = positions != prev
+    entries = changed & (positions != 0)
+    exits = changed & (prev != 0)
+
+    entry_price = _ffill(close, entries)
+    prev_entry_price = _shift(entry_price, np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        trade_growth = np.where(exits, 1 + prev * (close / prev_entry_price - 1), 1.0)
+        if cost_rate is not None:
+            keep = np.broadcast_to(1 - np.asarray(cost_rate, dtype=float), trade_growth.shape)
+            net_growth = trade_growth * np.where(exits, keep, 1.0) * _shift(_ffill(keep, entries), np.nan)
+            trade_growth = trade_growth * np.where(exits, keep, 1.0) * np.where(entries, keep, 1.0)
+        cash = starting_cash * np.cumprod(trade_growth, axis=0)
+        equity = np.where(positions != 0, cash * (1 + positions * (close / entry_price - 1)), cash)
+
+    if cost_rate is not None:
+        wins = exits & (net_growth > 1)
+    else:
+        wins = exits & (prev * (close - prev_entry_price) > 0)
+    return equity, entries, exits, wins
+
+
+def trade_list(close, positions):
+    # Rebuild the ('BUY', price) / ('SELL', price) list the loop engine keeps
+    close = np.asarray(close, dtype=float)
+    positions = np.asarray(positions)
+    prev = _shift(positions, 0)
+    trades = []
+    for i in np.flatnonzero(positions != prev):
+        if prev[i] != 0:
+            trades.append(('SELL' if prev[i] > 0 else 'BUY', close[i]))
+        if positions[i] != 0:
+            trades.append(('BUY' if positions[i] > 0 else 'SELL', close[i]))
+    return trades
+
+
+# === Metrics ===
+def _summary(start_value, end_value, total_trades, wins, ratios):
+    pct_return = round((end_value - start_value) / start_value * 100, 2)
+    metrics = {
+        "Start Equity": round(start_value, 2),
+        "End Equity": round(end_value, 2),
+        "Percent Return": pct_return,
+        "Total Trades": total_trades,
+        "Win Rate": round((wins / max(1, total_trades)) * 100, 2),
+        **{k: round(float(v), 2) for k, v in ratios.items()}
+    }
+    return {k: float(v) if hasattr(v, 'item') else v for k, v in metrics.items()}
+
+
+def _compute_metrics(equity_curve, total_trades, wins, positions=None, traded=None):
+    # Whole-curve metrics (backtester/metrics.py); positions / traded add
+    # Exposure and Turnover
+    equity_curve = np.asarray(equity_curve, dtype=float)
+    ratios = batch_metrics(equity_curve, positions=positions, traded=traded)
+    return _summary(equity_curve[0], equity_curve[-1], total_trades, wins, ratios)
+
+
+# === Engines ===
+def backtest(df_with_signals, starting_cash=10000, mode="loop", costs=None):
+    # costs: optional backtester.costs model, charged on every fill
+    if mode == "vectorized":
+        return backtest_vectorized(df_with_signals, starting_cash, costs)
+    if mode != "loop":
+        raise ValueError(f"Unknown backtest mode: {mode}")
 
-def backtest(df_with_signals, starting_cash=10000):
     df = df_with_signals.copy()
     cash = starting_cash
     position = 0
     equity_curve = []
     trades = []
-    wins = 0
     last_buy_price = None
+    rates = _cost_rates(df, costs)
+    acc = MetricsAccumulator()
 
     for i in range(1, len(df)):
         price = df.iloc[i]['Close']
         signal = df.iloc[i]['Signal']
+        traded = False
 
         # Buy
         if signal == 1 and position == 0:
-            position = cash / price
+            position = cash * (1 - rates[i]) / price
             last_buy_price = price
+            cost_basis = cash
             cash = 0
             trades.append(('BUY', price))
+            acc.open_trade()
+            traded = True
 
         # Sell
         elif signal == -1 and position > 0:
-            cash = position * price
-            if price > last_buy_price:
-                wins += 1
+            cash = position * price * (1 - rates[i])
+            acc.close_trade((cash > cost_basis) if costs is not None else (price > last_buy_price))
             position = 0
             trades.append(('SELL', price))
+            traded = True
 
         total_value = cash + (position * price if position > 0 else 0)
         equity_curve.append(total_value)
+        # All-in sizing: a fill trades the whole equity
+        acc.update(total_value, position, total_value if traded else 0.0)
 
     df = df.iloc[1:].copy()
     df['Equity'] = equity_curve
 
-    # Compute metrics
-    start_value = equity_curve[0]
-    end_value = equity_curve[-1]
-    pct_return = round((end_value - start_value) / start_value * 100, 2)
-    returns = pd.Series(equity_curve).pct_change().dropna()
-    sharpe = round((returns.mean() / returns.std()) * np.sqrt(252), 2) if not returns.empty else 0
+    return df, _summary(equity_curve[0], equity_curve[-1], acc.closed, acc.wins, acc.result())
 
-    rolling_max = pd.Series(equity_curve).cummax()
-    drawdown = (pd.Series(equity_curve) - rolling_max) / rolling_max
-    max_drawdown = round(drawdown.min() * 100, 2)
 
-    metrics = {
-        "Start Equity": round(start_value, 2),
-        "End Equity": round(end_value, 2),
-        "Percent Return": pct_return,
-        "Total Trades": len(trades) // 2,
-        "Win Rate": round((wins / max(1, len(trades) // 2)) * 100, 2),
-        "Sharpe Ratio": sharpe,
-        "Max Drawdown": max_drawdown
-    }
-    metrics = {k: float(v) if hasattr(v, 'item') else v for k, v in metrics.items()}
+def backtest_vectorized(df_with_signals, starting_cash=10000, costs=None):
+    # Same contract as the loop engine, computed from whole arrays in one pass.
+    # The first bar is skipped to match the loop, which starts at i = 1.
+    rates = _cost_rates(df_with_signals, costs)[1:] if costs is not None else None
+    df = df_with_signals.iloc[1:].copy()
+    close = df['Close'].to_numpy(dtype=float)
+    positions = positions_from_signals(df['Signal'].to_numpy())
+
+    equity, entries, exits, wins = equity_from_positions(close, positions, starting_cash, rates)
+    df['Equity'] = equity
+
+    traded = np.abs(np.diff(positions, prepend=0)) * equity
+    return df, _compute_metrics(equity, int(exits.sum()), int(wins.sum()), positions, traded)
+
 
-    return df, metrics
+def _cost_rates(df, costs):
+    # Per-bar cost rate of a fill at the close (zeros without a cost model)
+    close = df['Close'].to_numpy(dtype=float)
+    if costs is None:
+        return np.zeros(len(close))
+    high = df['High'].to_numpy(dtype=float) if 'High' in df.columns else None
+    low = df['Low'].to_numpy(dtype=float) if 'Low' in df.columns else None
+    return np.broadcast_to(costs.rate(close, high, low), close.shape)
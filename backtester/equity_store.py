@@ -0,0 +1,92 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+import backtrader as bt
+from data.price_store import DAILY, safe_symbol
+
+# === Equity Curve Store ===
+# One small binary file per (strategy, symbol): a structured .npy array of
+# (date, float64 equity) records. np.load with mmap_mode opens a curve without
+# parsing anything, so top-N plots over hundreds of symbols stay cheap. Full
+# precision keeps returns derived from the curves exact. Older CSV curves
+# (Date, Equity columns) are still read as a fallback. Intraday runs and runs
+# with a cost model keep their curves apart from the daily, cost-free ones,
+# under results/equity_curves/[<timeframe>/][costs_<spec>/]<strategy>/.
+
+EQUITY_DIR = "results/equity_curves"
+CURVE_DTYPE = np.dtype([("date", "M8[s]"), ("equity", "f8")])
+
+
+# === Cerebro Analyzer ===
+# Records the broker value on every bar (prenext included, so warmup bars
+# show up as flat cash)
+class EquityCurve(bt.Analyzer):
+    def start(self):
+        self.dates = []
+        self.values = []
+
+    def next(self):
+        self.dates.append(self.data.datetime[0])
+        self.values.append(self.strategy.broker.getvalue())
+
+    def get_analysis(self):
+        curve = np.empty(len(self.values), dtype=CURVE_DTYPE)
+        curve["date"] = [bt.num2date(d) for d in self.dates]
+        curve["equity"] = self.values
+        return curve
+
+
+def variant_dir(directory=EQUITY_DIR, costs=None, timeframe=DAILY):
+    # Curve directory of a run variant; daily cost-free runs use the base
+    # directory
+    if timeframe != DAILY:
+        directory = f"{directory}/{timeframe}"
+    if costs:
+        directory = f"{directory}/costs_{re.sub(r'[^A-Za-z0-9.]+', '_', costs)}"
+    return directory
+
+
+def curve_path(strategy_name, symbol, directory=EQUITY_DIR, costs=None, timeframe=DAILY):
+    return f"{variant_dir(directory, costs, timeframe)}/{strategy_name}/{safe_symbol(symbol)}.npy"
+
+
+def save_curve(path, curve):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, curve)
+    os.replace(tmp_path, path)
+
+
+def curve_frame(curve):
+    return pd.DataFrame({"Date": curve["date"], "Equity": curve["equity"]})
+
+
+def load_curve_file(path, mmap=True):
+    if path.endswith(".npy"):
+        return curve_frame(np.load(path, mmap_mode="r" if mmap else None))
+    return pd.read_csv(path, parse_dates=["Date"])
+
+
+def load_curve(strategy_name, symbol, directory=EQUITY_DIR, costs=None, timeframe=DAILY):
+    # Binary curve first, then the legacy CSV names
+    directory = variant_dir(directory, costs, timeframe)
+    candidates = [
+        curve_path(strategy_name, symbol, directory),
+        f"{directory}/{strategy_name}/{symbol}.csv",
+        f"{directory}/{strategy_name}/{safe_symbol(symbol)}.csv"
+    ]
+    for path in candidates:
+        if os.path.exists(path):
+            df = load_curve_file(path)
+            return df if "Equity" in df.columns else None
+    return None
+
+
+def load_curves(strategy_name, symbols, directory=EQUITY_DIR, costs=None, timeframe=DAILY):
+    curves = {}
+    for symbol in symbols:
+        df = load_curve(strategy_name, symbol, directory, costs, timeframe)
+        if df is not None:
+            curves[symbol] = df
+    return curves
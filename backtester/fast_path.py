@@ -0,0 +1,244 @@
+import argparse
+import logging
+import os
+import numpy as np
+import pandas as pd
+from backtester.analyzers import EXTRA_METRICS, yearly_sharpe
+from backtester.costs import fill_costs
+from backtester.equity_store import CURVE_DTYPE, curve_path, curve_frame, save_curve
+from backtester.metrics import batch_metrics
+from backtester.profiling import span
+from data.bar_pyramid import PYRAMID, bars_per_year
+from data.price_store import DAILY
+from run_backtest import summary_metrics
+from strategies.indicators import IndicatorCache
+from strategies.signals import position_builders
+
+# === Fast Path ===
+# Runs the Backtrader strategies that have an array translation
+# (strategies/signals.py) without Cerebro. Positions are decided on each bar's
+# close and filled at the next bar's open, one share per order, against
+# 100000 starting cash, which is what the Cerebro setup in run_backtest does.
+# Sharpe / drawdown / trade counts and the backtester/metrics.py ratios use the
+# same definitions as RunMetrics, so summary rows match the Cerebro path.
+# Strategies without a translation go through run_backtest as before.
+
+STARTING_CASH = 100000
+STAKE = 1
+
+
+def has_fast_path(strategy_name):
+    return strategy_name in position_builders
+
+
+def simulate_broker(open_, close, positions, stake=STAKE, starting_cash=STARTING_CASH, costs=None, high=None, low=None):
+    # held[t]: shares held through bar t (orders from bar t-1 fill at its open)
+    # fees: (closing, opening) commission of each bar's fill under the
+    # optional cost model, charged like CostCommission charges Cerebro
+    held = np.zeros(len(positions))
+    held[1:] = np.asarray(positions[:-1], dtype=float) * stake
+    prev = np.concatenate([[0.0], held[:-1]])
+    if costs is not None:
+        fees = fill_costs(costs, prev, held, open_, high, low)
+    else:
+        fees = (np.zeros(len(held)), np.zeros(len(held)))
+    cash = starting_cash - np.cumsum((held - prev) * open_ + fees[0] + fees[1])
+    values = cash + held * close
+    return held, values, fees
+
+
+def trade_records(dates, open_, held, fees=None):
+    # One row per trade, like Backtrader's Trade objects: opened when a
+    # position appears or flips, closed when it goes flat or flips. PnL is
+    # net of the entry and exit fees, like Backtrader's pnlcomm.
+    prev = np.concatenate([[0.0], held[:-1]])
+    changes = np.flatnonzero(held != prev)
+    closing, opening = fees if fees is not None else (np.zeros(len(held)), np.zeros(len(held)))
+    trades = []
+    current = None
+    for i in changes:
+        if np.sign(held[i]) == np.sign(prev[i]):
+            continue
+        if prev[i] != 0:
+            current.update(exit_date=dates[i], exit_price=open_[i])
+            current["pnl"] = current["size"] * (open_[i] - current["entry_price"]) - current.pop("fee") - closing[i]
+        if held[i] != 0:
+            current = {"entry_date": dates[i], "size": held[i], "entry_price": open_[i],
+                       "exit_date": pd.NaT, "exit_price": np.nan, "pnl": np.nan, "fee": opening[i]}
+            trades.append(current)
+    return pd.DataFrame(trades, columns=["entry_date", "exit_date", "size", "entry_price", "exit_price", "pnl"])
+
+
+def run_fast_backtest(symbol, strategy_name, df, params=None, save_path=None, cache=None, costs=None, timeframe=DAILY):
+    if save_path is None:
+        save_path = curve_path(strategy_name, symbol, timeframe=timeframe)
+
+    try:
+        if "Date" in df.columns:
+            df = df.set_index("Date")
+        if cache is None:
+            cache = IndicatorCache(df)
+        with span("signals"):
+            positions = cache.positions(strategy_name, params or {}, position_builders[strategy_name])
+
+        with span("simulate"):
+            open_ = df["Open"].to_numpy(dtype=float)
+            close = df["Close"].to_numpy(dtype=float)
+            dates = np.asarray(df.index, dtype="M8[s]")
+            high = df["High"].to_numpy(dtype=float) if costs is not None else None
+            low = df["Low"].to_numpy(dtype=float) if costs is not None else None
+            held, values, fees = simulate_broker(open_, close, positions, costs=costs, high=high, low=low)
+            trades = trade_records(dates, open_, held, fees)
+
+        with span("metrics"):
+            closed = trades["pnl"].notna()
+            prev = np.concatenate([[0.0], held[:-1]])
+            ratios = batch_metrics(values, positions=held, traded=np.abs(held - prev) * open_,
+                                   periods_per_year=bars_per_year(timeframe))
+            metrics = summary_metrics(
+                STARTING_CASH,
+                float(values[-1]),
+                len(trades),
+                int((trades.loc[closed, "pnl"] >= 0.0).sum()),
+                yearly_sharpe(dates, values, STARTING_CASH) if timeframe == DAILY else float(ratios["Sharpe Ratio"]),
+                abs(float(ratios["Max Drawdown"])),
+                {k: ratios[k] for k in EXTRA_METRICS}
+            )
+
+        with span("save_curve"):
+            curve = np.empty(len(values), dtype=CURVE_DTYPE)
+            curve["date"] = dates
+            curve["equity"] = values
+            if save_path.endswith(".csv"):
+                os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+                curve_frame(curve).to_csv(save_path, index=False)
+            else:
+                save_curve(save_path, curve)
+
+        return trades, metrics
+
+    except Exception as e:
+        print(f"❌ Error during fast backtest of {symbol}: {e}")
+        return None, {}
+
+
+# === Parity Check ===
+# Runs each strategy through Cerebro (bulk setup) and the fast path and
+# compares trade lists, equity curves and summary metrics:
+#   python -m backtester.fast_path                 # synthetic universe
+#   python -m backtester.fast_path --symbol BTC-USD --symbol AAPL
+def cerebro_trades(df, strategy_class, params=None, costs=None, timeframe=DAILY):
+    import backtrader as bt
+    from backtester.analyzers import RunMetrics
+    from backtester.costs import CostCommission
+    from backtester.feeds import ArrayFeed, FEED_TIMEFRAMES
+
+    class TradeLog(bt.Analyzer):
+        def start(self):
+            self.trades = []
+
+        def notify_trade(self, trade):
+            if trade.justopened:
+                self.trades.append({"entry_date": bt.num2date(trade.dtopen), "size": float(trade.size),
+                                    "entry_price": trade.price, "exit_date": pd.NaT,
+                                    "exit_price": np.nan, "pnl": np.nan})
+            elif trade.status == trade.Closed:
+                self.trades[-1].update(exit_date=bt.num2date(trade.dtclose), pnl=trade.pnlcomm)
+
+        def get_analysis(self):
+            return self.trades
+
+    frame = df.set_index("Date") if "Date" in df.columns else df
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.addstrategy(strategy_class, **(params or {}))
+    bar_timeframe, compression = FEED_TIMEFRAMES[timeframe]
+    data = ArrayFeed(dataname=frame.rename(columns=str.lower), timeframe=bar_timeframe, compression=compression)
+    cerebro.adddata(data)
+    cerebro.broker.set_cash(STARTING_CASH)
+    if costs is not None:
+        cerebro.broker.addcommissioninfo(CostCommission(model=costs, data=data))
+    cerebro.addanalyzer(RunMetrics, _name="metrics", periods_per_year=bars_per_year(timeframe), bar_sharpe=timeframe != DAILY)
+    cerebro.addanalyzer(TradeLog, _name="trades")
+    strat = cerebro.run()[0]
+
+    run = strat.analyzers.metrics.get_analysis()
+    trades = pd.DataFrame(strat.analyzers.trades.get_analysis(), columns=["entry_date", "exit_date", "size", "entry_price", "exit_price", "pnl"])
+    metrics = summary_metrics(STARTING_CASH, float(cerebro.broker.getvalue()), run["total_trades"], run["won_trades"],
+                              run["sharperatio"], run["max_drawdown"], run["extra"])
+    return trades, run["curve"], metrics
+
+
+def compare_run(symbol, strategy_name, strategy_class, df, save_dir, rtol=1e-9, costs=None, timeframe=DAILY):
+    problems = []
+    try:
+        bt_trades, bt_curve, bt_metrics = cerebro_trades(df, strategy_class, costs=costs, timeframe=timeframe)
+    except Exception as e:
+        bt_trades, bt_curve, bt_metrics = None, None, {"Error": str(e)}
+
+    path = f"{save_dir}/{strategy_name}/{symbol}.npy"
+    fast_trades, fast_metrics = run_fast_backtest(symbol, strategy_name, df, save_path=path, costs=costs, timeframe=timeframe)
+    if fast_trades is None or bt_trades is None:
+        side = "both engines" if fast_trades is None and bt_trades is None else "only one side"
+        problems.append(f"{side} failed: cerebro={bt_metrics} fast={fast_metrics}")
+        return problems
+
+    if len(bt_trades) != len(fast_trades):
+        problems.append(f"{len(bt_trades)} Cerebro trades vs {len(fast_trades)} fast")
+    else:
+        bt_dates = pd.to_datetime(bt_trades["entry_date"]).to_numpy(dtype="M8[s]")
+        if not np.array_equal(bt_dates, fast_trades["entry_date"].to_numpy(dtype="M8[s]")):
+            problems.append("trade entry dates differ")
+        if not np.array_equal(bt_trades["size"].to_numpy(), fast_trades["size"].to_numpy()):
+            problems.append("trade sides differ")
+        if not np.allclose(bt_trades["pnl"].to_numpy(dtype=float), fast_trades["pnl"].to_numpy(dtype=float),
+                           rtol=rtol, atol=1e-6, equal_nan=True):
+            problems.append("trade PnL differs")
+
+    fast_curve = np.load(path)
+    if not np.allclose(bt_curve["equity"], fast_curve["equity"], rtol=1e-6):
+        problems.append("equity curves differ")
+    for name, value in bt_metrics.items():
+        if not np.isclose(value, fast_metrics[name], rtol=1e-6, atol=0.011, equal_nan=True):
+            problems.append(f"{name}: Cerebro {value} vs fast {fast_metrics[name]}")
+    return problems
+
+
+def main():
+    import tempfile
+    from data.synthetic import synthetic_universe
+    from backtester.costs import parse_costs
+    from strategies.backtrader_strategies import SMACrossoverStrategy, RSIStrategy, PNShootStrategy, logger as strategy_logger
+
+    parser = argparse.ArgumentParser(description="Check the fast path against Cerebro")
+    parser.add_argument("--symbol", action="append", help="Cached symbol to check (repeatable); default is a synthetic universe")
+    parser.add_argument("--symbols", type=int, default=20, help="Synthetic symbols")
+    parser.add_argument("--bars", type=int, default=1000, help="Bars per synthetic symbol")
+    parser.add_argument("--costs", help="Cost model for both engines, e.g. bps=10,spread=0.1")
+    parser.add_argument("--timeframe", choices=PYRAMID, default=DAILY, help="Bar pyramid level of the --symbol data")
+    args = parser.parse_args()
+    costs = parse_costs(args.costs)
+
+    if args.symbol:
+        from fetch_data import fetch_data
+        universe = {s: fetch_data(s, timeframe=args.timeframe) for s in args.symbol}
+        universe = {s: df for s, df in universe.items() if df is not None and not df.empty}
+    else:
+        universe = synthetic_universe(n_symbols=args.symbols, n_bars=args.bars)
+
+    strategy_logger.setLevel(logging.WARNING)
+    classes = {"sma_crossover": SMACrossoverStrategy, "rsi": RSIStrategy, "pnshoot": PNShootStrategy}
+    failures = 0
+    with tempfile.TemporaryDirectory() as save_dir:
+        for symbol, df in universe.items():
+            for name, strategy_class in classes.items():
+                problems = compare_run(symbol, name, strategy_class, df, save_dir, costs=costs, timeframe=args.timeframe)
+                if problems:
+                    failures += 1
+                    print(f"❌ {symbol} [{name}]: " + "; ".join(problems))
+
+    total = len(universe) * len(classes)
+    print(f"✅ {total - failures}/{total} runs match Cerebro" if not failures else f"⚠️ {failures}/{total} runs differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import hashlib
+import inspect
+import json
+import os
+from datetime import datetime
+
+# === Run Manifest ===
+# Records, per (symbol, strategy) task, a hash of everything that determines
+# its result (price data fingerprint, strategy source and params, engine
+# version) next to the metrics it produced. A later run whose task hashes
+# still match can reuse those metrics instead of running the backtest again.
+
+MANIFEST_PATH = "results/manifest.json"
+
+
+def task_key(symbol, strategy_name, costs=None, timeframe="1d"):
+    # Intraday runs and runs with a cost model are separate tasks from the
+    # daily, cost-free ones
+    key = f"{symbol}|{strategy_name}"
+    if timeframe != "1d":
+        key += f"|{timeframe}"
+    return key + (f"|costs={costs}" if costs else "")
+
+
+def strategy_fingerprint(strategy_class):
+    params = getattr(strategy_class, "params", None)
+    items = dict(params._getitems()) if hasattr(params, "_getitems") else {}
+    try:
+        source = inspect.getsource(strategy_class)
+    except (OSError, TypeError):
+        source = strategy_class.__qualname__
+    return hashlib.blake2b(f"{source}|{sorted(items.items())}".encode(), digest_size=16).hexdigest()
+
+
+def task_hash(data_fingerprint, strategy_fp, engine_version, **options):
+    payload = json.dumps([data_fingerprint, strategy_fp, engine_version, sorted(options.items())], default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Ignoring unreadable manifest {path}: {e}")
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def cached_result(manifest, key, input_hash):
+    # Summary row from the last run if the task's inputs are unchanged
+    entry = manifest.get(key)
+    if entry and entry.get("hash") == input_hash:
+        return entry["result"]
+    return None
+
+
+def record_result(manifest, key, input_hash, result):
+    manifest[key] = {
+        "hash": input_hash,
+        "result": result,
+        "updated": datetime.now().isoformat(timespec="seconds")
+    }
@@ -0,0 +1,145 @@
+import math
+import numpy as np
+
+# === Run Metrics ===
+# One set of equity-curve metrics for every engine, computed either bar by bar
+# (MetricsAccumulator, for loops and Backtrader analyzers) or over whole arrays
+# (batch_metrics, for the vectorized and batched engines). Both give the same
+# numbers for the same curve:
+#   - Sharpe Ratio:  mean / sample stddev of bar returns, annualized
+#   - Sortino Ratio: mean / downside deviation (losses only, over all bars)
+#   - Max Drawdown:  worst drop from the running peak, negative percent
+#   - Calmar Ratio:  annualized growth / |max drawdown|
+#   - Exposure:      percent of bars with an open position
+#   - Turnover:      traded notional as a multiple of equity, summed over bars
+# The accumulator holds a few running sums (Welford mean / variance, running
+# peak), so memory stays constant whatever the curve length. Undefined ratios
+# (no losses, no drawdown) are NaN; a curve without returns has Sharpe 0.
+# Deviations and drawdowns under TOLERANCE count as zero: engines that build
+# equity with different float operations leave one-ulp wiggles (~1e-16) on a
+# flat curve, which would otherwise turn into ratios of 1e17.
+
+PERIODS_PER_YEAR = 252
+TOLERANCE = 1e-12
+
+
+class MetricsAccumulator:
+    def __init__(self, periods_per_year=PERIODS_PER_YEAR):
+        self.periods_per_year = periods_per_year
+        self.start = None
+        self.last = None
+        self.bars = 0
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.downside = 0.0
+        self.peak = -math.inf
+        self.drawdown = 0.0
+        self.exposed = 0
+        self.turnover = 0.0
+        self.opened = 0
+        self.closed = 0
+        self.wins = 0
+
+    def update(self, value, position=0, traded=0.0):
+        # value: equity after the bar; position: size held through it;
+        # traded: notional filled on it
+        if self.last is None:
+            self.start = value
+        else:
+            r = value / self.last - 1.0
+            self.n += 1
+            delta = r - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (r - self.mean)
+            self.downside += min(r, 0.0) ** 2
+        self.last = value
+        self.bars += 1
+
+        self.peak = max(self.peak, value)
+        self.drawdown = min(self.drawdown, (value - self.peak) / self.peak)
+        self.exposed += position != 0
+        if traded:
+            self.turnover += traded / value
+
+    def open_trade(self):
+        self.opened += 1
+
+    def close_trade(self, won):
+        self.closed += 1
+        self.wins += bool(won)
+
+    def result(self):
+        scale = math.sqrt(self.periods_per_year)
+        if self.n == 0:
+            sharpe = 0.0
+        else:
+            std = math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else math.nan
+            sharpe = self.mean / std * scale if std > TOLERANCE else math.nan
+        downside = math.sqrt(self.downside / self.n) if self.n else 0.0
+        sortino = self.mean / downside * scale if downside > TOLERANCE else math.nan
+        return {
+            "Sharpe Ratio": sharpe,
+            "Sortino Ratio": sortino,
+            "Max Drawdown": self.drawdown * 100,
+            "Calmar Ratio": _calmar(self.start, self.last, self.n, self.drawdown, self.periods_per_year),
+            "Exposure": self.exposed / self.bars * 100 if self.bars else math.nan,
+            "Turnover": self.turnover
+        }
+
+
+def _calmar(start, end, n_returns, drawdown, periods_per_year):
+    if not n_returns or drawdown > -TOLERANCE or start is None or end / start <= 0:
+        return math.nan
+    growth = (end / start) ** (periods_per_year / n_returns) - 1.0
+    return growth / -drawdown
+
+
+def batch_metrics(equity, active=None, positions=None, traded=None, periods_per_year=PERIODS_PER_YEAR):
+    # equity: (dates,) or (dates, ...) curves, time along axis 0. active marks
+    # the bars each curve is measured on (default: all); rows in between carry
+    # the previous value forward, so a return between two active rows spans
+    # any gap (e.g. weekends for equities next to crypto). positions / traded
+    # (same shape) add Exposure and Turnover.
+    equity = np.asarray(equity, dtype=float)
+    active = np.ones(equity.shape, dtype=bool) if active is None else np.asarray(active, dtype=bool)
+    has_data = active.any(axis=0)
+    first_active = active.argmax(axis=0)
+    start_value = np.take_along_axis(equity, np.expand_dims(first_active, 0), axis=0)[0]
+    end_value = equity[-1]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        started = np.logical_or.accumulate(active, axis=0)
+        returns = np.where(active[1:] & started[:-1], equity[1:] / equity[:-1] - 1, np.nan)
+        n_returns = (~np.isnan(returns)).sum(axis=0)
+        mean = np.nansum(returns, axis=0) / n_returns
+        var = np.nansum((returns - mean) ** 2, axis=0) / (n_returns - 1)
+        scale = np.sqrt(periods_per_year)
+        std = np.sqrt(var)
+        sharpe = np.where(n_returns > 0, np.where(std > TOLERANCE, mean / std * scale, np.nan), 0.0)
+        downside = np.sqrt(np.nansum(np.minimum(returns, 0.0) ** 2, axis=0) / n_returns)
+        sortino = np.where(downside > TOLERANCE, mean / downside * scale, np.nan)
+
+        rolling_max = np.fmax.accumulate(equity, axis=0)
+        drawdown = np.where(active, (equity - rolling_max) / rolling_max, np.nan)
+        max_drawdown = np.nanmin(np.where(has_data, drawdown, 0.0), axis=0)
+
+        ratio = end_value / start_value
+        growth = np.where(ratio > 0, ratio, np.nan) ** (periods_per_year / n_returns) - 1.0
+        calmar = np.where((n_returns > 0) & (max_drawdown < -TOLERANCE), growth / -max_drawdown, np.nan)
+
+    metrics = {
+        "Sharpe Ratio": sharpe,
+        "Sortino Ratio": sortino,
+        "Max Drawdown": max_drawdown * 100,
+        "Calmar Ratio": calmar
+    }
+    bars = active.sum(axis=0)
+    if positions is not None:
+        exposed = (active & (np.asarray(positions) != 0)).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            metrics["Exposure"] = exposed / bars * 100
+    if traded is not None:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            metrics["Turnover"] = np.where(active, np.asarray(traded, dtype=float) / equity, 0.0).sum(axis=0)
+    return metrics
@@ -0,0 +1,194 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from multiprocessing import Pool, cpu_count
+from data.bar_pyramid import PYRAMID, bars_per_year
+from data.price_store import DAILY
+
+# === Monte Carlo Robustness ===
+# Resamples a strategy's results thousands of times to get distributions of
+# return, Sharpe and max drawdown instead of one point estimate. Two methods:
+#   - "trades": draw per-trade returns with replacement (trade order luck)
+#   - "block":  circular block bootstrap of equity bar returns, which keeps
+#               short-range autocorrelation (volatility clusters) intact
+# Paths are generated chunk by chunk as (paths, steps) index matrices, so all
+# the work is NumPy and memory stays at chunk_size x steps. Each chunk gets its
+# own child of one SeedSequence, so results only depend on the seed.
+
+N_PATHS = 10000
+CHUNK_SIZE = 1000
+BLOCK_SIZE = 20
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def trade_path_indices(rng, n_trades, n_paths, length=None):
+    return rng.integers(0, n_trades, size=(n_paths, length or n_trades))
+
+
+def block_path_indices(rng, n_returns, n_paths, block_size=BLOCK_SIZE, length=None):
+    # Random block starts, each expanded into block_size consecutive
+    # (wrapping) indices, trimmed to the path length
+    length = length or n_returns
+    n_blocks = -(-length // block_size)
+    starts = rng.integers(0, n_returns, size=(n_paths, n_blocks, 1))
+    idx = (starts + np.arange(block_size)) % n_returns
+    return idx.reshape(n_paths, -1)[:, :length]
+
+
+def path_metrics(returns, periods_per_year=252):
+    # returns: (paths, steps) simple returns -> one value per path
+    equity = np.cumprod(1.0 + returns, axis=1)
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = returns.std(axis=1, ddof=1)
+        sharpe = np.where(std > 0, returns.mean(axis=1) / std * np.sqrt(periods_per_year), np.nan)
+    return {
+        "Percent Return": (equity[:, -1] - 1.0) * 100,
+        "Sharpe Ratio": sharpe,
+        "Max Drawdown": (equity / peaks - 1.0).min(axis=1) * 100
+    }
+
+
+def simulate(returns, method="block", n_paths=N_PATHS, seed=0, chunk_size=CHUNK_SIZE,
+             block_size=BLOCK_SIZE, periods_per_year=252):
+    # Distributions of path_metrics over n_paths resampled paths
+    returns = np.asarray(returns, dtype=float)
+    returns = returns[~np.isnan(returns)]
+    if len(returns) < 2:
+        raise ValueError(f"Need at least 2 returns, got {len(returns)}")
+
+    n_chunks = -(-n_paths // chunk_size)
+    children = np.random.SeedSequence(seed).spawn(n_chunks)
+    parts = []
+    for c, child in enumerate(children):
+        rng = np.random.default_rng(child)
+        size = min(chunk_size, n_paths - c * chunk_size)
+        if method == "trades":
+            idx = trade_path_indices(rng, len(returns), size)
+        elif method == "block":
+            idx = block_path_indices(rng, len(returns), size, block_size)
+        else:
+            raise ValueError(f"Unknown method {method!r}")
+        parts.append(path_metrics(returns[idx], periods_per_year))
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+def summarize(distributions):
+    # One flat row: "<metric> p5", ..., "<metric> mean", plus the odds of a loss
+    row = {}
+    for name, values in distributions.items():
+        for q, v in zip(PERCENTILES, np.nanpercentile(values, PERCENTILES)):
+            row[f"{name} p{q}"] = round(float(v), 2)
+        row[f"{name} mean"] = round(float(np.nanmean(values)), 2)
+    row["Loss Probability"] = round(float(np.mean(distributions["Percent Return"] < 0) * 100), 2)
+    return row
+
+
+# === Return Series ===
+def equity_returns(strategy_name, symbol, timeframe=DAILY, costs=None, start_date=None, end_date=None):
+    # Bar returns of a saved equity curve (results/equity_curves, that
+    # timeframe's and --costs run's curves) in float64, with the bars per
+    # year the engines annualize that timeframe by. start_date / end_date
+    # (inclusive / exclusive, like fetch_window) trim the curve.
+    from backtester.equity_store import load_curve
+    curve = load_curve(strategy_name, symbol, costs=costs, timeframe=timeframe)
+    if curve is None:
+        return None
+    if start_date is not None:
+        curve = curve[curve["Date"] >= pd.Timestamp(start_date)]
+    if end_date is not None:
+        curve = curve[curve["Date"] < pd.Timestamp(end_date)]
+    equity = curve["Equity"].to_numpy(dtype=np.float64)
+    return equity[1:] / equity[:-1] - 1.0, bars_per_year(timeframe)
+
+
+def trade_returns(strategy_name, symbol, start_date="2022-01-01", end_date="2025-05-01", params=None,
+                  timeframe=DAILY):
+    # Per-trade price returns of the strategy's fast-path trades (all-in
+    # sizing), plus trades per year so the resampled Sharpe is annualized
+    from fetch_data import fetch_window
+    from backtester.fast_path import simulate_broker, trade_records
+    from strategies.indicators import IndicatorCache
+    from strategies.signals import position_builders
+
+    df = fetch_window(symbol, start_date, end_date, timeframe=timeframe)
+    if df is None or df.empty:
+        return None
+    if "Date" in df.columns:
+        df = df.set_index("Date")
+    cache = IndicatorCache(df)
+    positions = cache.positions(strategy_name, params or {}, position_builders[strategy_name])
+    open_ = df["Open"].to_numpy(dtype=float)
+    held, _, _ = simulate_broker(open_, df["Close"].to_numpy(dtype=float), positions)
+    trades = trade_records(np.asarray(df.index, dtype="M8[s]"), open_, held).dropna(subset=["pnl"])
+    returns = (np.sign(trades["size"]) * (trades["exit_price"] / trades["entry_price"] - 1.0)).to_numpy()
+    years = max((df.index[-1] - df.index[0]).days / 365.25, 1 / 365.25)
+    return returns, len(returns) / years
+
+
+# === Per-Symbol Run (pool worker) ===
+def run_symbol(args_tuple):
+    symbol, strategy_name, method, n_paths, seed, block_size, timeframe, costs, start, end = args_tuple
+    try:
+        if method == "trades":
+            series = trade_returns(strategy_name, symbol, start, end, timeframe=timeframe)
+        else:
+            series = equity_returns(strategy_name, symbol, timeframe, costs, start, end)
+        if series is None:
+            raise ValueError("No equity curve or price data")
+        returns, periods = series
+        distributions = simulate(returns, method, n_paths, seed, block_size=block_size, periods_per_year=periods)
+        return {"Symbol": symbol, "Strategy": strategy_name, "Method": method, **summarize(distributions)}
+    except Exception as e:
+        print(f"❌ Monte Carlo failed for {symbol} [{strategy_name}]: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo / bootstrap robustness of backtest results")
+    parser.add_argument("--strategy", required=True, help="Strategy whose results to resample")
+    parser.add_argument("--symbol", action="append", help="Symbol (repeatable); default: every symbol in the results")
+    parser.add_argument("--method", choices=["block", "trades"], default="block")
+    parser.add_argument("--paths", type=int, default=N_PATHS)
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeframe", choices=PYRAMID, default=DAILY,
+                        help="Bar size the results were run on (picks its results and annualization)")
+    parser.add_argument("--start", default="2022-01-01", help="Window start: the trades' prices, or where saved curves are cut")
+    parser.add_argument("--end", default="2025-05-01", help="Window end (exclusive)")
+    parser.add_argument("--costs", help="Resample the results of the main.py --costs run with this spec (block method)")
+    parser.add_argument("--workers", type=int, default=cpu_count())
+    args = parser.parse_args()
+    if args.costs and args.method == "trades":
+        parser.error("--costs picks saved equity curves and only applies to --method block")
+
+    if args.symbol:
+        symbols = args.symbol
+    else:
+        from backtester.result_sink import load_summary
+        summary = load_summary(args.strategy, costs=args.costs, timeframe=args.timeframe)
+        symbols = sorted(summary["Symbol"]) if summary is not None else []
+    if not symbols:
+        print("❌ No symbols to resample (run main.py first or pass --symbol)")
+        return
+
+    print(f"🎲 {args.paths} {args.method} paths x {len(symbols)} symbols [{args.strategy}] using {args.workers} cores...")
+    tasks = [(s, args.strategy, args.method, args.paths, args.seed, args.block_size, args.timeframe, args.costs,
+              args.start, args.end)
+             for s in symbols]
+    with Pool(processes=max(1, args.workers)) as pool:
+        rows = [r for r in pool.imap_unordered(run_symbol, tasks) if r is not None]
+
+    if rows:
+        os.makedirs("results/monte_carlo", exist_ok=True)
+        path = f"results/monte_carlo/monte_carlo_{args.strategy}_{args.method}.csv"
+        df = pd.DataFrame(rows).sort_values("Symbol")
+        df.to_csv(path, index=False)
+        print(f"✅ Saved {len(df)} distributions to {path}")
+        print(df[["Symbol", "Percent Return p5", "Percent Return p50", "Percent Return p95",
+                  "Sharpe Ratio p50", "Max Drawdown p5", "Loss Probability"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
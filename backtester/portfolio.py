@@ -0,0 +1,199 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from backtester.batch import align_matrix, _ffill_prices
+from backtester.engine import equity_from_positions, _compute_metrics
+from backtester.costs import parse_costs, split_fills
+
+# === Portfolio Engine ===
+# Runs one strategy across many symbols from a single cash pool on an aligned
+# dates x symbols matrix. The strategy's per-symbol positions (1 / -1 / 0) are
+# turned into target weights by an allocation rule; on each rebalance date the
+# book is traded to those weights at the close, and between rebalance dates
+# share counts stay fixed and the weights drift with prices.
+#
+# Rebalance dates are every date a position opens, closes or flips, plus an
+# optional periodic schedule; weights are only read on those dates. Only the
+# price matrix and a few dates x symbols arrays are held, and equity between
+# rebalances is one matrix-vector product per segment.
+
+STARTING_CASH = 10000
+
+
+def align_positions(frames, strategy_name, params=None):
+    # frames: {symbol: OHLCV frame} -> (dates, symbols, close, positions)
+    from strategies.indicators import IndicatorCache
+    from strategies.signals import position_builders
+
+    index, symbols, close = align_matrix(frames)
+    build = position_builders[strategy_name]
+    columns = {}
+    for symbol in symbols:
+        df = frames[symbol]
+        if "Date" in df.columns:
+            df = df.set_index("Date")
+        columns[symbol] = pd.Series(IndicatorCache(df).positions(strategy_name, params or {}, build), index=df.index)
+
+    # A symbol keeps its position over dates it has no bar (e.g. weekends)
+    positions = pd.DataFrame(columns).reindex(index).ffill().fillna(0).to_numpy(dtype=np.int8)
+    return index, symbols, close, positions
+
+
+# === Allocation Rules ===
+# Each returns dates x symbols target weights with sum(|w|) <= 1 per date
+def equal_weight(positions, close=None, max_positions=None):
+    # Each open position gets 1/max_positions of equity (the rest stays in
+    # cash); with more open positions than that, 1/n_open each
+    n_open = np.abs(positions).sum(axis=1, keepdims=True)
+    slots = np.maximum(n_open, max_positions or 1)
+    return positions / slots
+
+
+def inverse_volatility(positions, close, lookback=20, max_positions=None):
+    # Weights proportional to 1 / trailing volatility of daily returns
+    returns = pd.DataFrame(close).ffill().pct_change(fill_method=None)
+    vol = returns.rolling(lookback, min_periods=2).std().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = np.where((positions != 0) & (vol > 0), positions / vol, 0.0)
+    gross = np.abs(raw).sum(axis=1, keepdims=True)
+    n_open = (raw != 0).sum(axis=1, keepdims=True)
+    scale = np.minimum(1.0, n_open / (max_positions or 1)) if max_positions else 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(gross > 0, raw / gross * scale, 0.0)
+
+
+allocations = {
+    "equal": equal_weight,
+    "inverse_vol": inverse_volatility
+}
+
+
+def rebalance_schedule(index, positions, freq=None):
+    # True on dates the book is traded: any position opens, closes or flips,
+    # plus periodic dates (freq is a pandas period alias such as "W", "M", "Q")
+    changed = np.ones(len(index), dtype=bool)
+    changed[1:] = (positions[1:] != positions[:-1]).any(axis=1)
+    if freq:
+        periods = pd.DatetimeIndex(index).to_period(freq)
+        changed[1:] |= np.asarray(periods[1:] != periods[:-1])
+    return changed
+
+
+# === Simulation ===
+def simulate_portfolio(close, weights, rebalance, starting_cash=STARTING_CASH, costs=None, high=None, low=None):
+    # costs: optional backtester.costs model charged on each rebalance's
+    # fills (targets are sized before fees, which come out of cash).
+    # Symbols without a bar on a rebalance date can't trade and keep their
+    # shares; the others are sized from what those leave free, so the book
+    # stays within sum(|w|) <= 1, and the skipped trades are made on the next
+    # date the missing bars come back.
+    close = np.asarray(close, dtype=float)
+    valid = ~np.isnan(close)
+    prices = np.nan_to_num(_ffill_prices(close, valid))
+
+    n_dates, n_symbols = close.shape
+    equity = np.full(n_dates, float(starting_cash))
+    turnover = np.zeros(n_dates)
+    shares = np.zeros(n_symbols)
+    cash = float(starting_cash)
+    volume = 0.0
+
+    resumed = np.zeros(n_dates, dtype=bool)
+    resumed[1:] = (valid[1:] & ~valid[:-1]).any(axis=1)
+    dates = np.flatnonzero(rebalance | resumed)
+    bounds = np.append(dates[1:], n_dates)
+    deferred = False
+    for r, end in zip(dates, bounds):
+        price = prices[r]
+        if rebalance[r] or deferred:
+            value = cash + shares @ price
+            stale = ~valid[r]
+            # Equity per unit of weight: all of it, unless the stale holdings
+            # leave less for the weights that can trade
+            free_weight = 1.0 - np.abs(weights[r][stale]).sum()
+            budget = max(value - np.abs(shares[stale]) @ price[stale], 0.0)
+            scale = min(value, budget / free_weight) if free_weight > 0 else 0.0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                wanted = np.where(price > 0, weights[r] * value / price, 0.0)
+                target = np.where(price > 0, weights[r] * scale / price, 0.0)
+            target = np.where(stale, shares, target)
+            deferred = bool(np.any(stale & ~np.isclose(wanted, shares)))
+
+            turnover[r] = np.abs(target - shares) @ price
+            cash = value - target @ price
+            if costs is not None:
+                bar_high = high[r] if high is not None else None
+                bar_low = low[r] if low is not None else None
+                closed, opened = split_fills(shares, target)
+                cash -= float(np.sum(costs.cost(closed, price, bar_high, bar_low, volume) +
+                                     costs.cost(opened, price, bar_high, bar_low, volume)))
+                volume += turnover[r]
+            shares = target
+        equity[r:end] = cash + prices[r:end] @ shares
+
+    return equity, turnover
+
+
+def backtest_portfolio(close, positions, index, allocation="equal", rebalance_freq=None,
+                       max_positions=None, starting_cash=STARTING_CASH, costs=None, high=None, low=None):
+    weights = allocations[allocation](positions, close, max_positions=max_positions)
+    rebalance = rebalance_schedule(index, positions, rebalance_freq)
+    equity, turnover = simulate_portfolio(close, weights, rebalance, starting_cash, costs, high, low)
+
+    # Per-symbol trade counts / wins on the engine's close-to-close definition
+    filled = _ffill_prices(np.asarray(close, dtype=float), ~np.isnan(close))
+    _, _, exits, wins = equity_from_positions(filled, positions)
+    metrics = _compute_metrics(equity, int(exits.sum()), int(wins.sum()), np.abs(weights).sum(axis=1), turnover)
+    metrics["Rebalances"] = int(rebalance.sum())
+    return equity, weights, metrics
+
+
+def main():
+    from fetch_data import fetch_window
+    from main import load_symbols_from_csv
+    from backtester.equity_store import CURVE_DTYPE, save_curve
+    from strategies.signals import position_builders
+
+    parser = argparse.ArgumentParser(description="Backtest one strategy as a shared-cash portfolio")
+    parser.add_argument("--strategy", choices=list(position_builders.keys()), required=True)
+    parser.add_argument("--symbol", action="append", help="Symbol (repeatable); default: the full symbol list")
+    parser.add_argument("--start", default="2022-01-01")
+    parser.add_argument("--end", default="2025-05-01")
+    parser.add_argument("--allocation", choices=list(allocations.keys()), default="equal")
+    parser.add_argument("--max-positions", type=int, help="Equity slots; each open position gets at most 1/N")
+    parser.add_argument("--rebalance", help="Extra periodic rebalance (pandas period alias: W, M, Q)")
+    parser.add_argument("--cash", type=float, default=STARTING_CASH)
+    parser.add_argument("--costs", help="Commission / slippage per fill, e.g. bps=10,spread=0.1")
+    args = parser.parse_args()
+    costs = parse_costs(args.costs)
+
+    symbols = args.symbol or load_symbols_from_csv()
+    frames = {s: fetch_window(s, args.start, args.end) for s in symbols}
+    frames = {s: df for s, df in frames.items() if df is not None and not df.empty}
+    if not frames:
+        print("❌ No price data for any symbol")
+        return
+
+    index, symbols, close, positions = align_positions(frames, args.strategy)
+    print(f"📦 Portfolio of {len(symbols)} symbols x {len(index)} dates [{args.strategy}, {args.allocation}]")
+    high = low = None
+    if costs is not None:
+        high = align_matrix(frames, "High")[2]
+        low = align_matrix(frames, "Low")[2]
+    equity, weights, metrics = backtest_portfolio(
+        close, positions, index, args.allocation, args.rebalance, args.max_positions, args.cash, costs, high, low
+    )
+
+    os.makedirs("results/portfolio", exist_ok=True)
+    curve = np.empty(len(equity), dtype=CURVE_DTYPE)
+    curve["date"] = np.asarray(index, dtype="M8[s]")
+    curve["equity"] = equity
+    path = f"results/portfolio/{args.strategy}_{args.allocation}.npy"
+    save_curve(path, curve)
+    print(f"✅ Saved portfolio equity curve to {path}")
+    print("📊 Metrics:", metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import cProfile
+import os
+import time
+from contextlib import contextmanager
+
+# === Pipeline Timing ===
+# span(stage) times a block with perf_counter and records it, with the
+# symbol/strategy of the enclosing task() and the worker pid, in a per-process
+# list. Workers hand their spans back with each unit's rows (drain_spans) and
+# main.py writes them all to results/timings.csv, next to the summaries, and
+# prints totals per stage. A span costs about a microsecond.
+#
+# With --profile N, each task also runs under cProfile and dumps its stats to
+# results/profiles/; after the run only the N slowest tasks' dumps are kept:
+#   python -m pstats results/profiles/pnshoot_BTC_USD.prof
+
+TIMINGS_PATH = "results/timings.csv"
+PROFILE_DIR = "results/profiles"
+SPAN_COLUMNS = ["Stage", "Symbol", "Strategy", "Worker", "Seconds"]
+
+_spans = []
+_labels = {}
+
+
+@contextmanager
+def span(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _spans.append((stage, _labels.get("symbol"), _labels.get("strategy"), os.getpid(), time.perf_counter() - start))
+
+
+@contextmanager
+def task(symbol, strategy=None, profile=False):
+    # Labels the spans opened inside, and is itself timed as stage "task"
+    # (or "unit" for per-symbol work shared by several strategies)
+    previous = dict(_labels)
+    _labels.update(symbol=symbol, strategy=strategy)
+    profiler = cProfile.Profile() if profile else None
+    try:
+        with span("task" if strategy else "unit"):
+            if profiler is not None:
+                profiler.enable()
+            try:
+                yield
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+    finally:
+        _labels.clear()
+        _labels.update(previous)
+        if profiler is not None:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            profiler.dump_stats(profile_path(strategy, symbol))
+
+
+def drain_spans():
+    global _spans
+    spans, _spans = _spans, []
+    return spans
+
+
+def profile_path(strategy, symbol, profile_dir=PROFILE_DIR):
+    from data.price_store import safe_symbol
+    return os.path.join(profile_dir, f"{strategy}_{safe_symbol(symbol)}.prof")
+
+
+# === Reports ===
+def timings_frame(spans):
+    import pandas as pd
+    return pd.DataFrame(spans, columns=SPAN_COLUMNS)
+
+
+def summarize_timings(df):
+    # Totals per stage, per (strategy, stage) and per worker (busy time)
+    agg = ["count", "sum", "mean", "max"]
+    return {
+        "stage": df.groupby("Stage")["Seconds"].agg(agg).sort_values("sum", ascending=False),
+        "strategy": df[df["Strategy"].notna()].groupby(["Strategy", "Stage"])["Seconds"].agg(agg),
+        "worker": df[df["Stage"] == "unit"].groupby("Worker")["Seconds"].agg(agg)
+    }
+
+
+def save_timings(spans, path=TIMINGS_PATH):
+    df = timings_frame(spans)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    df.to_csv(path, index=False)
+    return df
+
+
+def keep_slowest_profiles(df, n, profile_dir=PROFILE_DIR):
+    # Delete all task profiles but the n slowest; returns the kept paths
+    tasks = df[df["Stage"] == "task"].sort_values("Seconds", ascending=False)
+    keep = {profile_path(r.Strategy, r.Symbol, profile_dir) for r in tasks.head(n).itertuples()}
+    if os.path.isdir(profile_dir):
+        for name in os.listdir(profile_dir):
+            path = os.path.join(profile_dir, name)
+            if name.endswith(".prof") and path not in keep:
+                os.remove(path)
+    return [p for p in keep if os.path.exists(p)]
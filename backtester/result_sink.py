@@ -0,0 +1,161 @@
+import os
+import sqlite3
+from datetime import datetime
+import pandas as pd
+
+# === Result Sink ===
+# Single SQLite store for backtest results. The parent process writes rows as
+# workers finish (committing in batches), keeping the latest result per
+# (symbol, strategy, timeframe, costs), so intraday runs and runs with a cost
+# model (Costs holds the --costs spec, '' without) sit next to the daily,
+# cost-free ones instead of replacing them. summary_all, summary_<strategy> and failures are SQL views
+# over that table, and the legacy CSVs are exported from those views.
+
+RESULTS_DB = "results/results.db"
+RESULTS_DIR = "results"
+# Run variant columns in the key, with the value of a default run
+KEY_DEFAULTS = {"Timeframe": "1d", "Costs": ""}
+KEY_COLUMNS = ["Symbol", "Strategy", *KEY_DEFAULTS]
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _variant(costs=None, timeframe=None):
+    return {"Timeframe": timeframe or KEY_DEFAULTS["Timeframe"], "Costs": costs or KEY_DEFAULTS["Costs"]}
+
+
+class ResultSink:
+    def __init__(self, metric_names, strategy_names, path=RESULTS_DB, batch_size=50, on_commit=None, costs=None,
+                 timeframe=None):
+        self.metric_names = list(metric_names)
+        self.strategy_names = list(strategy_names)
+        self.variant = _variant(costs, timeframe)
+        self.path = path
+        self.batch_size = batch_size
+        self.on_commit = on_commit
+        self.run_id = datetime.now().isoformat(timespec="seconds")
+        self.written = 0
+        self.failed = 0
+        self._pending = []
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        existing = [row[1] for row in self.conn.execute("PRAGMA table_info(results)")]
+        rebuild = bool(existing) and not set(KEY_COLUMNS) <= set(existing)
+        if rebuild:
+            # SQLite can't change a primary key in place: the table is rebuilt
+            # and its rows become the default variant
+            self.conn.execute("ALTER TABLE results RENAME TO results_old")
+        variants = ", ".join(f"{_quote(c)} TEXT NOT NULL DEFAULT {_literal(d)}" for c, d in KEY_DEFAULTS.items())
+        columns = ", ".join(f"{_quote(m)} NUMERIC" for m in self.metric_names)
+        key = ", ".join(_quote(c) for c in KEY_COLUMNS)
+        self.conn.execute(
+            f'CREATE TABLE IF NOT EXISTS results ("Symbol" TEXT NOT NULL, "Strategy" TEXT NOT NULL, {variants}, '
+            f'{columns}, "Error" TEXT, "Run" TEXT, "Updated" TEXT, PRIMARY KEY ({key}))'
+        )
+        # Metrics added after the table was created (or only in the old one)
+        # become new columns
+        current = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        for m in [*self.metric_names, *existing]:
+            if m not in current:
+                self.conn.execute(f"ALTER TABLE results ADD COLUMN {_quote(m)} NUMERIC")
+                current.add(m)
+        if rebuild:
+            copied = ", ".join(_quote(c) for c in existing)
+            self.conn.execute(f"INSERT INTO results ({copied}) SELECT {copied} FROM results_old")
+            self.conn.execute("DROP TABLE results_old")
+        self.conn.execute('CREATE INDEX IF NOT EXISTS results_strategy ON results ("Strategy")')
+        self._create_views()
+        self.conn.commit()
+
+    def _create_views(self):
+        select = ", ".join(_quote(c) for c in [*KEY_COLUMNS, *self.metric_names])
+        order = ", ".join(_quote(c) for c in ["Strategy", "Symbol", *KEY_DEFAULTS])
+        views = {"summary_all": 'WHERE "Error" IS NULL'}
+        for s in self.strategy_names:
+            views[f"summary_{s}"] = f'WHERE "Error" IS NULL AND "Strategy" = {_literal(s)}'
+        for name, where in views.items():
+            self.conn.execute(f"DROP VIEW IF EXISTS {_quote(name)}")
+            self.conn.execute(f'CREATE VIEW {_quote(name)} AS SELECT {select} FROM results {where} ORDER BY {order}')
+        keys = ", ".join(_quote(c) for c in KEY_COLUMNS)
+        self.conn.execute("DROP VIEW IF EXISTS failures")
+        self.conn.execute(f'CREATE VIEW failures AS SELECT {keys}, "Error" FROM results WHERE "Error" IS NOT NULL ORDER BY {order}')
+
+    def write(self, row):
+        self._pending.append(row)
+        if "Error" in row:
+            self.failed += 1
+        else:
+            self.written += 1
+        if len(self._pending) >= self.batch_size:
+            self.commit()
+
+    def commit(self):
+        if not self._pending:
+            return
+        columns = ["Symbol", "Strategy", *self.variant, *self.metric_names, "Error", "Run", "Updated"]
+        now = datetime.now().isoformat(timespec="seconds")
+        values = [
+            [r["Symbol"], r["Strategy"], *self.variant.values(), *[r.get(m) for m in self.metric_names],
+             r.get("Error"), self.run_id, now]
+            for r in self._pending
+        ]
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO results ({', '.join(_quote(c) for c in columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            values
+        )
+        self.conn.commit()
+        self._pending = []
+        if self.on_commit:
+            self.on_commit()
+
+    def export_csv(self, results_dir=RESULTS_DIR):
+        # Regenerate the summary/failure CSVs from the views
+        self.commit()
+        views = ["summary_all", *[f"summary_{s}" for s in self.strategy_names], "failures"]
+        for name in views:
+            pd.read_sql_query(f"SELECT * FROM {_quote(name)}", self.conn).to_csv(f"{results_dir}/{name}.csv", index=False)
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+
+# === Queries ===
+# Read a summary from the store, falling back to the exported CSV when there
+# is no database yet (e.g. results copied from another machine). Only the rows
+# of one run variant are returned (default: the daily, cost-free runs).
+def _variant_rows(df, costs=None, timeframe=None):
+    for column, value in _variant(costs, timeframe).items():
+        if column in df.columns:
+            df = df[df[column].fillna(KEY_DEFAULTS[column]) == value]
+    return df.reset_index(drop=True)
+
+
+def load_summary(strategy=None, db_path=RESULTS_DB, results_dir=RESULTS_DIR, costs=None, timeframe=None):
+    view = f"summary_{strategy}" if strategy else "summary_all"
+    if os.path.exists(db_path):
+        with sqlite3.connect(db_path) as conn:
+            try:
+                return _variant_rows(pd.read_sql_query(f"SELECT * FROM {_quote(view)}", conn), costs, timeframe)
+            except pd.errors.DatabaseError:
+                if strategy:
+                    df = pd.read_sql_query("SELECT * FROM summary_all", conn)
+                    return _variant_rows(df[df["Strategy"] == strategy], costs, timeframe)
+                raise
+
+    csv_path = f"{results_dir}/{view}.csv"
+    if os.path.exists(csv_path):
+        return _variant_rows(pd.read_csv(csv_path), costs, timeframe)
+    return None
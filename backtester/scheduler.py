@@ -0,0 +1,31 @@
+# === Cost-Aware Scheduling ===
+# Tasks are grouped per symbol (one data load per unit of work) and dispatched
+# longest-first, so the long crypto histories and slow strategies start early
+# instead of straggling at the end. With imap_unordered and chunksize=1 each
+# idle worker pulls the next unit as soon as it finishes its current one.
+
+# Relative per-bar cost of each strategy, measured as "task" seconds per bar
+# in results/timings.csv on the default fast path (re-measure after changing
+# a strategy or its engine)
+STRATEGY_WEIGHTS = {
+    "sma_crossover": 1.6,
+    "rsi": 1.0,
+    "pnshoot": 1.0
+}
+
+
+def estimate_cost(bars, strategy_names):
+    return bars * sum(STRATEGY_WEIGHTS.get(s, 1.0) for s in strategy_names)
+
+
+def build_work_units(tasks, bar_counts):
+    # tasks: [(symbol, strategy)] -> [(symbol, [strategies])], costliest first
+    by_symbol = {}
+    for symbol, strategy in tasks:
+        by_symbol.setdefault(symbol, []).append(strategy)
+    return sorted(
+        by_symbol.items(),
+        key=lambda unit: estimate_cost(bar_counts.get(unit[0], 0), unit[1]),
+        reverse=True
+    )
+
@@ -0,0 +1,71 @@
+import argparse
+import os
+import resource
+import sys
+import time
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.synthetic import synthetic_universe
+from run_backtest import run_backtest
+from strategies.backtrader_strategies import SMACrossoverStrategy, RSIStrategy, PNShootStrategy
+
+# === Bulk Mode Benchmark ===
+# Runs the same synthetic sweep through run_backtest's default Cerebro setup
+# and through bulk mode (optionally with exactbars), each in a fresh process so
+# peak RSS is comparable, and checks both produce identical metrics.
+
+STRATEGIES = {
+    "sma_crossover": SMACrossoverStrategy,
+    "rsi": RSIStrategy,
+    "pnshoot": PNShootStrategy
+}
+
+
+def run_sweep(args_tuple):
+    n_symbols, n_bars, options = args_tuple
+    universe = synthetic_universe(n_symbols=n_symbols, n_bars=n_bars)
+    out_dir = f"/tmp/bench_bulk_mode_{os.getpid()}"
+
+    sys.stdout = open(os.devnull, "w")  # default mode prints per run
+    start = time.perf_counter()
+    metrics = {}
+    for symbol, df in universe.items():
+        for name, strategy_class in STRATEGIES.items():
+            _, m = run_backtest(symbol, strategy_class, name, save_path=f"{out_dir}/{name}/{symbol}.npy", df=df, **options)
+            metrics[(symbol, name)] = m
+    elapsed = time.perf_counter() - start
+    sys.stdout = sys.__stdout__
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return elapsed, peak_mb, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare default vs bulk Cerebro configuration")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--bars", type=int, default=1000)
+    args = parser.parse_args()
+
+    modes = {
+        "default": {},
+        "bulk": dict(bulk=True),
+        "bulk exactbars=1": dict(bulk=True, exactbars=1)
+    }
+    runs = args.symbols * len(STRATEGIES)
+    print(f"🚀 {runs} backtests per mode ({args.symbols} symbols x {args.bars} bars)")
+
+    baseline = None
+    for label, options in modes.items():
+        with Pool(processes=1) as pool:
+            elapsed, peak_mb, metrics = pool.apply(run_sweep, ((args.symbols, args.bars, options),))
+        if baseline is None:
+            baseline = (elapsed, metrics)
+        speedup = baseline[0] / elapsed
+        match = "✅" if metrics == baseline[1] else "❌ metrics differ"
+        print(f"{label:>18}: {elapsed:7.2f}s  {runs / elapsed:6.1f} runs/s  peak {peak_mb:6.0f} MB  x{speedup:.2f}  {match}")
+
+
+if __name__ == "__main__":
+    main()
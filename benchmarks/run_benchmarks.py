@@ -0,0 +1,257 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.synthetic import synthetic_universe
+from strategies.signals import position_builders
+
+# === Benchmark Suite ===
+# Throughput of the backtest hot paths on a synthetic GBM universe: each
+# benchmark reports bars/sec and runs/sec (best of --repeat), every run is
+# appended to a JSON history, and throughput more than --threshold below the
+# median of the last recorded runs with the same universe size is flagged.
+#   python benchmarks/run_benchmarks.py                       # everything
+#   python benchmarks/run_benchmarks.py --filter fast_path --symbols 50
+#   python benchmarks/run_benchmarks.py --fail-on-regression  # for CI
+
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+HISTORY_WINDOW = 5
+THRESHOLD = 0.15
+
+# name -> setup(universe, workdir) returning (run, bars, runs); run() is the
+# timed part, bars/runs the work one call does
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def total_bars(universe):
+    return sum(len(df) for df in universe.values())
+
+
+def with_signals(df):
+    # Engine input: 1 / -1 on a 5/20 SMA regime, like a plain crossover
+    close = df["Close"]
+    out = df.copy()
+    out["Signal"] = np.where(close.rolling(5).mean() > close.rolling(20).mean(), 1, -1)
+    return out
+
+
+# === Engines ===
+@benchmark("engine.loop")
+def bench_engine_loop(universe, workdir):
+    from backtester.engine import backtest
+    frames = [with_signals(df) for df in universe.values()]
+    return lambda: [backtest(df, mode="loop") for df in frames], total_bars(universe), len(frames)
+
+
+@benchmark("engine.vectorized")
+def bench_engine_vectorized(universe, workdir):
+    from backtester.engine import backtest
+    frames = [with_signals(df) for df in universe.values()]
+    return lambda: [backtest(df, mode="vectorized") for df in frames], total_bars(universe), len(frames)
+
+
+@benchmark("batch.positions")
+def bench_batch(universe, workdir):
+    from backtester.batch import align_matrix, backtest_batch_positions
+    from strategies.indicators import IndicatorCache
+    _, _, close = align_matrix(universe)
+    positions = np.stack([
+        np.stack([IndicatorCache(df).positions(name, {}, build) for df in universe.values()], axis=1)
+        for name, build in position_builders.items()
+    ])
+    return lambda: backtest_batch_positions(close, positions), total_bars(universe) * len(positions), positions.shape[0] * positions.shape[2]
+
+
+def register_strategy_benchmarks(name):
+    @benchmark(f"signals.{name}")
+    def bench_signals(universe, workdir):
+        from strategies.indicators import IndicatorCache
+        build = position_builders[name]
+        return lambda: [IndicatorCache(df).positions(name, {}, build) for df in universe.values()], total_bars(universe), len(universe)
+
+    @benchmark(f"fast_path.{name}")
+    def bench_fast_path(universe, workdir):
+        from backtester.fast_path import run_fast_backtest
+        return lambda: [
+            run_fast_backtest(symbol, name, df, save_path=f"{workdir}/{name}/{symbol}.npy")
+            for symbol, df in universe.items()
+        ], total_bars(universe), len(universe)
+
+    @benchmark(f"cerebro.{name}")
+    def bench_cerebro(universe, workdir):
+        from run_backtest import run_backtest
+        from main import strategy_map
+        return lambda: [
+            run_backtest(symbol, strategy_map[name], name, save_path=f"{workdir}/{name}/{symbol}.npy", df=df, bulk=True)
+            for symbol, df in universe.items()
+        ], total_bars(universe), len(universe)
+
+
+for strategy_name in position_builders:
+    register_strategy_benchmarks(strategy_name)
+
+
+@benchmark("cerebro_default.sma_crossover")
+def bench_cerebro_default(universe, workdir):
+    from run_backtest import run_backtest
+    from strategies.backtrader_strategies import SMACrossoverStrategy
+    return lambda: [
+        run_backtest(symbol, SMACrossoverStrategy, "sma_crossover", save_path=f"{workdir}/default/{symbol}.npy", df=df)
+        for symbol, df in universe.items()
+    ], total_bars(universe), len(universe)
+
+
+# === Loaders ===
+# Run inside workdir, so fetch_data's relative data/store is a scratch store
+@benchmark("loader.load_prices")
+def bench_load_prices(universe, workdir):
+    from data.price_store import load_prices, write_prices
+    for symbol, df in universe.items():
+        write_prices(symbol, df)
+    return lambda: [load_prices(symbol) for symbol in universe], total_bars(universe), len(universe)
+
+
+@benchmark("loader.fetch_window")
+def bench_fetch_window(universe, workdir):
+    from data.price_store import write_prices
+    from fetch_data import fetch_window
+    for symbol, df in universe.items():
+        write_prices(symbol, df)
+    return lambda: [fetch_window(symbol, "2000-01-01", "2100-01-01") for symbol in universe], total_bars(universe), len(universe)
+
+
+# === Runner ===
+def time_benchmark(setup, universe, repeat):
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                run, bars, runs = setup(universe, workdir)
+                times = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    run()
+                    times.append(time.perf_counter() - start)
+        finally:
+            os.chdir(cwd)
+    seconds = min(times)
+    return {"seconds": round(seconds, 6), "bars_per_sec": round(bars / seconds, 1), "runs_per_sec": round(runs / seconds, 2)}
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(HISTORY_PATH))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Ignoring unreadable benchmark history {path}: {e}")
+        return []
+
+
+def save_history(history, path=HISTORY_PATH):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp, path)
+
+
+def baseline(history, config, name, window=HISTORY_WINDOW):
+    # Median bars/sec of the last runs of this benchmark on the same setup
+    past = [run["results"][name]["bars_per_sec"] for run in history
+            if run["config"] == config and name in run["results"]]
+    return float(np.median(past[-window:])) if past else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the backtest hot paths on synthetic data")
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--bars", type=int, default=1000, help="Bars per synthetic symbol")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per benchmark (best is kept)")
+    parser.add_argument("--filter", help="Only run benchmarks whose name matches this regex")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Flag throughput drops larger than this fraction")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--no-save", action="store_true", help="Don't append this run to the history")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 if anything regressed")
+    parser.add_argument("--list", action="store_true", help="List benchmark names and exit")
+    args = parser.parse_args()
+
+    names = [n for n in BENCHMARKS if not args.filter or re.search(args.filter, n)]
+    if args.list:
+        print("\n".join(names))
+        return
+    if not names:
+        print(f"❌ No benchmarks match {args.filter!r}")
+        sys.exit(1)
+
+    import logging
+    from strategies.backtrader_strategies import logger as strategy_logger
+    strategy_logger.setLevel(logging.WARNING)
+
+    config = {"symbols": args.symbols, "bars": args.bars}
+    universe = synthetic_universe(n_symbols=args.symbols, n_bars=args.bars)
+    history = load_history(args.history)
+    print(f"🚀 {len(names)} benchmarks on {args.symbols} symbols x {args.bars} bars (best of {args.repeat})")
+    print(f"{'benchmark':<32}{'seconds':>10}{'bars/s':>14}{'runs/s':>10}{'vs median':>11}")
+
+    results, regressions = {}, []
+    for name in names:
+        result = time_benchmark(BENCHMARKS[name], universe, args.repeat)
+        results[name] = result
+        ref = baseline(history, config, name)
+        change = "" if ref is None else f"{result['bars_per_sec'] / ref - 1:+.1%}"
+        flag = ""
+        if ref is not None and result["bars_per_sec"] < ref * (1 - args.threshold):
+            regressions.append(name)
+            flag = "  ⚠️ regression"
+        print(f"{name:<32}{result['seconds']:>10.4f}{result['bars_per_sec']:>14,.0f}{result['runs_per_sec']:>10.1f}{change:>11}{flag}")
+
+    if not args.no_save:
+        history.append({
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+            "config": config,
+            "results": results
+        })
+        save_history(history, args.history)
+        print(f"✅ Appended results to {args.history}")
+
+    if regressions:
+        print(f"⚠️ {len(regressions)} benchmark(s) more than {args.threshold:.0%} slower than the recorded median: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import os
+import pandas as pd
+from data.price_store import DAILY, STORE_DIR, legacy_csv_path, load_prices, normalize_prices, write_prices
+from data.timeframes import PYRAMID, TIMEFRAMES, bars_per_year
+
+# === Bar Pyramid ===
+# Minute bars are ingested once and aggregated up a pyramid, 1m -> 5m -> 1h
+# -> 1d, each level resampled from the one below and written to the price
+# store (data/store/<timeframe>/<SYM>.parquet; daily bars stay in the main
+# store). Backtests then load the timeframe they ask for as stored bars, so
+# intraday history, 1440x the size of the daily bars for crypto, is never
+# resampled per run. Appending minutes only rebuilds the coarser bars from
+# the first day touched.
+#   python -m data.bar_pyramid --symbol BTC-USD --csv btc_usd_1m.csv
+#   python main.py --symbol BTC-USD --timeframe 1h
+
+OHLCV_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def resample_ohlcv(df, timeframe):
+    # Bars are stamped with the start of their interval, like yfinance's
+    # intraday bars; intervals without a trade are dropped
+    agg = {c: how for c, how in OHLCV_AGG.items() if c in df.columns}
+    bars = df.resample(TIMEFRAMES[timeframe][0], label="left", closed="left").agg(agg)
+    return bars[bars["Close"].notna()]
+
+
+def read_minutes(path):
+    # Minute CSV with a Date or Datetime column and OHLCV columns in any case
+    df = pd.read_csv(path)
+    df = df.rename(columns=lambda c: c.strip().capitalize())
+    if "Datetime" in df.columns:
+        df = df.rename(columns={"Datetime": "Date"})
+    if "Date" not in df.columns or "Close" not in df.columns:
+        raise ValueError(f"{path} needs Date/Datetime and Close columns")
+    return df
+
+
+def _utc_naive(df):
+    # The store filters on naive timestamps; intraday feeds are usually UTC
+    if df.index.tz is not None:
+        df.index = df.index.tz_convert("UTC").tz_localize(None)
+    return df
+
+
+def _replace_bars(stored, fresh):
+    if stored is None:
+        return fresh
+    return pd.concat([stored[~stored.index.isin(fresh.index)], fresh]).sort_index()
+
+
+def build_pyramid(symbol, minutes=None, store_dir=STORE_DIR, daily=None):
+    # minutes: new 1m bars (Date column or index), merged into the stored 1m
+    # level with new bars winning; None rebuilds every level from the stored
+    # 1m bars. daily: write the 1d level into the daily store, replacing the
+    # days the minutes cover (default: only if no daily bar predates them).
+    # Returns {timeframe: bars in the store}.
+    stored = load_prices(symbol, store_dir=store_dir, timeframe="1m")
+    if minutes is None:
+        if stored is None:
+            raise ValueError(f"No 1m bars stored for {symbol}")
+        level, since = stored, None
+    else:
+        fresh = _utc_naive(normalize_prices(minutes))
+        if fresh.empty:
+            raise ValueError(f"No minute bars given for {symbol}")
+        level = _replace_bars(stored, fresh)
+        write_prices(symbol, level, store_dir, timeframe="1m")
+        since = fresh.index[0].floor("1D")
+
+    if daily is None:
+        # Only daily bars the minutes already cover (none, or ones this
+        # pyramid wrote) are kept in step; longer histories, in the store or
+        # the legacy CSV cache, are left alone
+        days = load_prices(symbol, columns=["Close"], store_dir=store_dir)
+        if days is None:
+            daily = not os.path.exists(legacy_csv_path(symbol, store_dir))
+        else:
+            daily = days.empty or days.index[0] >= level.index[0].floor("1D")
+    counts = {"1m": len(level)}
+    for timeframe in PYRAMID[1:]:
+        if timeframe == DAILY and not daily:
+            break
+        # Every level divides a day, so from the first touched day on the
+        # level below is complete; a missing level is built from all of it.
+        # Daily bars from other sources are only replaced on covered days.
+        existing = load_prices(symbol, store_dir=store_dir, timeframe=timeframe)
+        partial = since is not None and existing is not None
+        bars = resample_ohlcv(level[level.index >= since] if partial else level, timeframe)
+        if partial or (existing is not None and timeframe == DAILY):
+            bars = _replace_bars(existing, bars)
+        write_prices(symbol, bars, store_dir, timeframe=timeframe)
+        counts[timeframe] = len(bars)
+        level = bars
+    return counts
+
+
+def load_bars(symbol, timeframe=DAILY, start=None, end=None, columns=None, store_dir=STORE_DIR):
+    # Stored bars of one pyramid level, Date-indexed (None if not built)
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Unknown timeframe {timeframe!r}, expected one of {PYRAMID}")
+    return load_prices(symbol, columns, start, end, store_dir, timeframe=timeframe)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest minute bars and build the 1m -> 5m -> 1h -> 1d pyramid.")
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--csv", help="Minute bars to ingest; without it, rebuild from the stored 1m bars")
+    parser.add_argument("--daily", action="store_true", help="Also replace the symbol's daily bars on the days covered")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    args = parser.parse_args()
+
+    minutes = read_minutes(args.csv) if args.csv else None
+    counts = build_pyramid(args.symbol, minutes, args.store_dir, daily=True if args.daily else None)
+    print(f"✅ Bar pyramid for {args.symbol}: " + ", ".join(f"{tf} {n:,} bars" for tf, n in counts.items()))
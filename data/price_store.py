@@ -0,0 +1,108 @@
+import argparse
+import glob
+import os
+import pandas as pd
+
+# === Columnar Price Store ===
+# One Parquet file per symbol under data/store/, holding typed OHLCV columns
+# with the Date column as a datetime index. Reads are memory-mapped and can
+# project columns and a date range, so a backtest only loads what it needs.
+# Daily bars live at the top level; intraday timeframes built by
+# data/bar_pyramid.py get a subdirectory each (data/store/1h/BTC_USD.parquet).
+
+STORE_DIR = "data/store"
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+DAILY = "1d"
+
+
+def safe_symbol(symbol):
+    return symbol.replace("-", "_").replace("/", "_")
+
+
+def store_path(symbol, store_dir=STORE_DIR, timeframe=DAILY):
+    if timeframe != DAILY:
+        store_dir = f"{store_dir}/{timeframe}"
+    return f"{store_dir}/{safe_symbol(symbol)}.parquet"
+
+
+def legacy_csv_path(symbol, store_dir=STORE_DIR):
+    # The legacy CSV cache sits next to the store (data/historical_<SYM>.csv
+    # beside data/store/)
+    data_dir = os.path.dirname(os.path.normpath(store_dir)) or "."
+    return f"{data_dir}/historical_{safe_symbol(symbol)}.csv"
+
+
+def has_prices(symbol, store_dir=STORE_DIR, timeframe=DAILY):
+    return os.path.exists(store_path(symbol, store_dir, timeframe))
+
+
+def normalize_prices(df, price_dtype="float64"):
+    # Accepts fetch_data / yfinance style frames (Date column or index)
+    if "Date" in df.columns:
+        df = df.set_index("Date")
+    df.index = pd.to_datetime(df.index)
+    df.index.name = "Date"
+    df = df[[c for c in PRICE_COLUMNS if c in df.columns]]
+    dtypes = {c: price_dtype for c in df.columns if c != "Volume"}
+    if "Volume" in df.columns:
+        dtypes["Volume"] = "float64"
+    return df.astype(dtypes).sort_index()
+
+
+def write_prices(symbol, df, store_dir=STORE_DIR, price_dtype="float64", timeframe=DAILY):
+    path = store_path(symbol, store_dir, timeframe)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    normalize_prices(df, price_dtype).to_parquet(path, engine="pyarrow", index=True)
+    return path
+
+
+def load_prices(symbol, columns=None, start=None, end=None, store_dir=STORE_DIR, timeframe=DAILY):
+    # Returns a Date-indexed frame, or None if the symbol isn't in the store.
+    # start is inclusive and end exclusive, matching yfinance's download range.
+    path = store_path(symbol, store_dir, timeframe)
+    if not os.path.exists(path):
+        return None
+
+    filters = []
+    if start is not None:
+        filters.append(("Date", ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append(("Date", "<", pd.Timestamp(end)))
+
+    return pd.read_parquet(
+        path,
+        engine="pyarrow",
+        columns=list(columns) if columns is not None else None,
+        filters=filters or None,
+        memory_map=True
+    )
+
+
+# === CSV Migration ===
+# One-shot conversion of the legacy data/historical_<SYM>.csv cache
+def migrate_csv_cache(data_dir="data", store_dir=STORE_DIR, overwrite=False):
+    migrated = 0
+    for csv_path in sorted(glob.glob(f"{data_dir}/historical_*.csv")):
+        name = os.path.basename(csv_path)[len("historical_"):-len(".csv")]
+        if has_prices(name, store_dir) and not overwrite:
+            continue
+        try:
+            df = pd.read_csv(csv_path, parse_dates=["Date"])
+            if df.empty or "Close" not in df.columns:
+                print(f"⚠️ Skipping {csv_path}: no usable prices")
+                continue
+            write_prices(name, df, store_dir)
+            migrated += 1
+        except Exception as e:
+            print(f"❌ Failed to migrate {csv_path}: {e}")
+    print(f"✅ Migrated {migrated} CSV files into {store_dir}")
+    return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate the CSV price cache to the Parquet store.")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args()
+    migrate_csv_cache(args.data_dir, args.store_dir, args.overwrite)
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from data.price_store import PRICE_COLUMNS
+
+# === Shared Price Matrix ===
+# The parent loads every symbol once and packs the OHLCV rows into a single
+# memory-mapped .npy file (symbols stacked back to back, plus a parallel date
+# array). Pool workers attach to the same files and slice out a symbol by its
+# row offset, so the OS page cache is shared and nothing is re-parsed.
+
+# Set in each worker by attach_shared_prices
+_shared = None
+
+
+def build_shared_prices(symbols, loader, directory=None):
+    # loader(symbol) -> DataFrame with a Date column or index, or None
+    frames = {}
+    for symbol in symbols:
+        df = loader(symbol)
+        if df is None or df.empty:
+            continue
+        if "Date" in df.columns:
+            df = df.set_index("Date")
+        frames[symbol] = df
+
+    directory = directory or tempfile.mkdtemp(prefix="midas_prices_")
+    os.makedirs(directory, exist_ok=True)
+    total_rows = sum(len(df) for df in frames.values())
+
+    ohlcv_path = os.path.join(directory, "ohlcv.npy")
+    dates_path = os.path.join(directory, "dates.npy")
+    ohlcv = np.lib.format.open_memmap(ohlcv_path, mode="w+", dtype=np.float64, shape=(total_rows, len(PRICE_COLUMNS)))
+    dates = np.lib.format.open_memmap(dates_path, mode="w+", dtype="datetime64[ns]", shape=(total_rows,))
+
+    index = {}
+    offset = 0
+    for symbol, df in frames.items():
+        n = len(df)
+        ohlcv[offset:offset + n] = df.reindex(columns=PRICE_COLUMNS).to_numpy(dtype=np.float64)
+        dates[offset:offset + n] = pd.to_datetime(df.index).to_numpy(dtype="datetime64[ns]")
+        index[symbol] = (offset, n)
+        offset += n
+
+    ohlcv.flush()
+    dates.flush()
+    del ohlcv, dates
+
+    # Small and picklable: this is what gets shipped to the workers
+    return {"directory": directory, "ohlcv": ohlcv_path, "dates": dates_path, "index": index}
+
+
+def attach_shared_prices(descriptor):
+    # Pool initializer: map the files read-only, no data is copied
+    global _shared
+    _shared = {
+        "ohlcv": np.load(descriptor["ohlcv"], mmap_mode="r"),
+        "dates": np.load(descriptor["dates"], mmap_mode="r"),
+        "index": descriptor["index"]
+    }
+
+
+def is_attached():
+    return _shared is not None
+
+
+def get_shared_frame(symbol):
+    # Zero-copy view of one symbol's rows, indexed by Date (None if missing)
+    if _shared is None or symbol not in _shared["index"]:
+        return None
+    offset, n = _shared["index"][symbol]
+    values = _shared["ohlcv"][offset:offset + n]
+    dates = pd.DatetimeIndex(_shared["dates"][offset:offset + n], name="Date")
+    return pd.DataFrame(values, index=dates, columns=PRICE_COLUMNS, copy=False)
+
+
+def release_shared_prices(descriptor):
+    shutil.rmtree(descriptor["directory"], ignore_errors=True)
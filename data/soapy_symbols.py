@@ -1,34 +1,170 @@
-import pandas as pd
+import os
 import re
+import numpy as np
+import pandas as pd
+
+TICKER_PATTERN = r'[A-Z0-9.\-]{1,10}'
+
+# === Symbol Files ===
+# Asset class -> source CSV. Order matters: a symbol listed in several files
+# keeps the first class it appears under.
+SYMBOL_FILES = {
+    "crypto_pair": "data/symbols/crypto_pairs.csv",
+    "crypto_equity": "data/symbols/crypto_public.csv",
+    "quant": "data/symbols/quant_public.csv"
+}
+REGISTRY_PATH = "data/symbols/registry.npz"
 
 def is_valid_ticker(ticker: str) -> bool:
-    return isinstance(ticker, str) and re.match(r'^[A-Z0-9.\-]{1,10}$', ticker.strip())
+    return isinstance(ticker, str) and re.fullmatch(TICKER_PATTERN, ticker.strip()) is not None
+
+def valid_tickers(tickers: pd.Series) -> pd.Series:
+    # Vectorized is_valid_ticker: stripped tickers that pass, NaNs dropped
+    tickers = tickers.dropna().astype(str).str.strip()
+    return tickers[tickers.str.fullmatch(TICKER_PATTERN)]
 
 def clean_crypto_public(filepath: str) -> list:
-    df = pd.read_csv(filepath, on_bad_lines='skip', engine='python')
+    df = pd.read_csv(filepath, on_bad_lines='skip')
 
     if "Ticker" not in df.columns:
         raise ValueError("Missing 'Ticker' column in crypto_public.csv")
 
     # Remove content references and special chars
-    df["Ticker"] = df["Ticker"].astype(str).str.extract(r'([A-Z.]+)')[0]
-    df = df[df["Ticker"].notnull()]
-    df["Ticker"] = df["Ticker"].str.upper().str.strip()
-
-    return sorted([ticker for ticker in df["Ticker"] if is_valid_ticker(ticker)])
+    tickers = df["Ticker"].astype(str).str.extract(r'([A-Z.]+)')[0]
+    return sorted(valid_tickers(tickers.str.upper()))
 
 def clean_crypto_pairs(filepath: str) -> list:
     df = pd.read_csv(filepath)
     if "Trading Pair" not in df.columns:
         raise ValueError("Missing 'Trading Pair' column in crypto_pairs.csv")
 
-    tickers = df["Trading Pair"].astype(str).str.replace("/", "-", regex=False).str.upper().str.strip()
-    return sorted([t for t in tickers if is_valid_ticker(t)])
+    tickers = df["Trading Pair"].astype(str).str.replace("/", "-", regex=False).str.upper()
+    return sorted(valid_tickers(tickers))
 
 def clean_quant_public(filepath: str) -> list:
-    df = pd.read_csv(filepath, on_bad_lines='skip', engine='python')
+    df = pd.read_csv(filepath, on_bad_lines='skip')
     if "Ticker" not in df.columns:
         raise ValueError("Missing 'Ticker' column in quant_public.csv")
 
-    tickers = df["Ticker"].astype(str).str.upper().str.strip()
-    return sorted([t for t in tickers if is_valid_ticker(t)])
+    return sorted(valid_tickers(df["Ticker"].astype(str).str.upper()))
+
+cleaners = {
+    "crypto_pair": clean_crypto_pairs,
+    "crypto_equity": clean_crypto_public,
+    "quant": clean_quant_public
+}
+
+
+# === Symbol Registry ===
+# Every symbol from the symbol files, deduplicated once, with a stable integer
+# id and an asset class, so downstream arrays can be indexed by id instead of
+# dict-keyed by ticker. The registry is cached as a small .npz next to the
+# sources and rebuilt when any source file's mtime or size changes; ids
+# already handed out are kept on rebuild and new symbols get the next ones.
+class SymbolRegistry:
+    def __init__(self, symbols, ids, classes, class_names):
+        order = np.argsort(ids)
+        self.symbols = np.asarray(symbols)[order]
+        self.ids = np.asarray(ids, dtype=np.int32)[order]
+        self.classes = np.asarray(classes, dtype=np.int8)[order]
+        self.class_names = list(class_names)
+        self._index = pd.Index(self.symbols)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self._index
+
+    def id(self, symbol):
+        return int(self.ids[self._index.get_loc(symbol)])
+
+    def ids_for(self, symbols):
+        # Vectorized lookup; -1 for symbols not in the registry
+        pos = self._index.get_indexer(list(symbols))
+        return np.where(pos >= 0, self.ids[pos], -1)
+
+    def symbol(self, symbol_id):
+        pos = np.searchsorted(self.ids, symbol_id)
+        if pos >= len(self.ids) or self.ids[pos] != symbol_id:
+            raise KeyError(symbol_id)
+        return str(self.symbols[pos])
+
+    def asset_class(self, symbol):
+        return self.class_names[self.classes[self._index.get_loc(symbol)]]
+
+    def of_class(self, asset_class):
+        return sorted(self.symbols[self.classes == self.class_names.index(asset_class)].tolist())
+
+    def frame(self):
+        return pd.DataFrame({
+            "Id": self.ids,
+            "Symbol": self.symbols,
+            "Asset Class": pd.Categorical.from_codes(self.classes, self.class_names)
+        })
+
+
+def _source_stamp(files):
+    stats = [os.stat(path) for path in files.values()]
+    return np.array([[s.st_mtime_ns, s.st_size] for s in stats], dtype=np.int64)
+
+
+def build_registry(files=SYMBOL_FILES, previous=None):
+    symbols, classes = [], []
+    for code, (asset_class, path) in enumerate(files.items()):
+        tickers = cleaners[asset_class](path)
+        symbols.extend(tickers)
+        classes.extend([code] * len(tickers))
+    df = pd.DataFrame({"symbol": symbols, "class": classes}).drop_duplicates("symbol")
+
+    # Keep ids from the previous registry, number new symbols after them
+    ids = previous.ids_for(df["symbol"]) if previous is not None else np.full(len(df), -1)
+    new = ids < 0
+    start = int(previous.ids.max()) + 1 if previous is not None and len(previous) else 0
+    order = np.argsort(df["symbol"].to_numpy()[new], kind="stable")
+    ids[np.flatnonzero(new)[order]] = start + np.arange(new.sum())
+    return SymbolRegistry(df["symbol"].to_numpy(dtype=str), ids, df["class"].to_numpy(), files.keys())
+
+
+def _read_index(path):
+    with np.load(path, allow_pickle=False) as npz:
+        return {k: npz[k] for k in npz.files}
+
+
+def load_registry(files=SYMBOL_FILES, index_path=REGISTRY_PATH, rebuild=False):
+    stamp = _source_stamp(files)
+    previous = None
+    if os.path.exists(index_path):
+        try:
+            saved = _read_index(index_path)
+            previous = SymbolRegistry(saved["symbols"], saved["ids"], saved["classes"], saved["class_names"])
+            fresh = (
+                not rebuild
+                and list(saved["sources"]) == list(files.values())
+                and np.array_equal(saved["stamp"], stamp)
+            )
+            if fresh:
+                return previous
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable symbol index {index_path}: {e}")
+            previous = None
+
+    registry = build_registry(files, previous)
+    tmp = f"{index_path}.tmp.npz"
+    np.savez(
+        tmp,
+        symbols=registry.symbols,
+        ids=registry.ids,
+        classes=registry.classes,
+        class_names=np.array(registry.class_names),
+        sources=np.array(list(files.values())),
+        stamp=stamp
+    )
+    os.replace(tmp, index_path)
+    return registry
+
+
+if __name__ == "__main__":
+    registry = load_registry(rebuild=True)
+    print(f"✅ {len(registry)} symbols indexed to {REGISTRY_PATH}")
+    print(registry.frame().to_string(index=False))
@@ -0,0 +1,38 @@
+import zlib
+import numpy as np
+import pandas as pd
+
+# === Synthetic OHLCV ===
+# Geometric Brownian motion price paths shaped like yfinance output (Date index,
+# Open/High/Low/Close/Volume). Used as an offline data provider and for
+# benchmarking without network access.
+
+def symbol_seed(symbol, seed=0):
+    # Stable per-symbol seed so the same symbol always gets the same path
+    return (zlib.crc32(symbol.encode()) + seed) & 0xFFFFFFFF
+
+
+def synthetic_ohlcv(n_bars=1000, start="2022-01-01", freq="D", seed=None,
+                    start_price=100.0, mu=0.05, sigma=0.4, periods_per_year=252):
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / periods_per_year
+    log_returns = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal(n_bars)
+    close = start_price * np.exp(np.cumsum(log_returns))
+
+    open_ = np.empty(n_bars)
+    open_[0] = start_price
+    open_[1:] = close[:-1] * (1 + 0.25 * sigma * np.sqrt(dt) * rng.standard_normal(n_bars - 1))
+    wick = np.abs(rng.standard_normal((2, n_bars))) * 0.5 * sigma * np.sqrt(dt)
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = np.round(rng.lognormal(mean=15, sigma=0.5, size=n_bars))
+
+    index = pd.date_range(start=start, periods=n_bars, freq=freq, name="Date")
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def synthetic_universe(n_symbols=100, n_bars=1000, seed=0, **kwargs):
+    return {
+        f"SYN{i:04d}": synthetic_ohlcv(n_bars, seed=symbol_seed(f"SYN{i:04d}", seed), **kwargs)
+        for i in range(n_symbols)
+    }
@@ -0,0 +1,18 @@
+# === Bar Timeframes ===
+# Levels of the bar pyramid (data/bar_pyramid.py), kept apart from it so the
+# CLIs can offer them as --timeframe choices without importing pandas first.
+
+# timeframe -> (pandas resample rule, bars per year). Intraday data is
+# crypto, which trades around the clock; daily bars keep the 252 trading
+# days every engine annualizes by.
+TIMEFRAMES = {
+    "1m": ("1min", 365 * 24 * 60),
+    "5m": ("5min", 365 * 24 * 12),
+    "1h": ("1h", 365 * 24),
+    "1d": ("1D", 252)
+}
+PYRAMID = list(TIMEFRAMES)
+
+
+def bars_per_year(timeframe="1d"):
+    return TIMEFRAMES[timeframe][1]
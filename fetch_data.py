@@ -1,51 +1,204 @@
-import yfinance as yf
 import pandas as pd
+import numpy as np
 import os
+from data.price_store import DAILY, load_prices, write_prices, store_path, has_prices
+
+def fetch_data(symbol: str, start_date: str = "2022-01-01", end_date: str = "2025-05-01",
+               refresh: bool = False, downloader=None, timeframe: str = DAILY) -> pd.DataFrame | None:
+    # Intraday timeframes are served from the bar pyramid only
+    if timeframe != DAILY:
+        return fetch_bars(symbol, timeframe)
 
-def fetch_data(symbol: str, start_date: str = "2022-01-01", end_date: str = "2025-05-01") -> pd.DataFrame | None:
     # Format safe file path
     safe_symbol = symbol.replace("-", "_").replace("/", "_")
     file_path = f"data/historical_{safe_symbol}.csv"
+    cached = None
+
+    # ✅ Step 1: Use the columnar store if the symbol is in it
+    try:
+        df = load_prices(symbol)
+        if df is not None:
+            if df.empty or "Close" not in df.columns or df["Close"].isna().all():
+                print(f"⚠️ Stored prices invalid or incomplete for {symbol}, re-downloading...")
+            else:
+                print(f"📂 Using stored data for {symbol} from {store_path(symbol)}")
+                cached = df.reset_index()
+    except Exception as e:
+        print(f"⚠️ Failed to load stored data for {symbol}: {e}, re-downloading...")
 
-    # ✅ Step 1: Use cached file if it exists
-    if os.path.exists(file_path):
+    # 📂 Step 1b: Fall back to a legacy CSV cache and move it into the store
+    if cached is None and os.path.exists(file_path):
         print(f"📂 Using cached data for {symbol} from {file_path}")
         try:
             df = pd.read_csv(file_path, parse_dates=["Date"])
             if df.empty or "Close" not in df.columns or df["Close"].isna().all():
                 print(f"⚠️ Cached file invalid or incomplete for {symbol}, re-downloading...")
             else:
-                return df
+                write_prices(symbol, df)
+                cached = df
         except Exception as e:
             print(f"⚠️ Failed to load cached data for {symbol}: {e}, re-downloading...")
 
+    if cached is not None:
+        if not refresh:
+            return cached
+        return update_cached_data(symbol, cached, start_date, end_date, downloader)
+
     # 📥 Step 2: Download fresh data if no valid cache
     print(f"📥 Downloading data for {symbol} from {start_date} to {end_date}...")
 
     try:
-        df = yf.download(symbol, start=start_date, end=end_date, group_by="ticker")
+        df = download_data(symbol, start_date, end_date, downloader)
 
-        if df.empty:
+        if df is None:
             print(f"⚠️ No data found for {symbol}")
             return None
 
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(-1)
-
-        df = df.drop(columns=["Adj Close"], errors="ignore")
-        df.reset_index(inplace=True)
-        df.index.name = "Index"
-
         if "Close" not in df.columns or df["Close"].isna().all():
             print(f"⚠️ Close prices missing or invalid for {symbol}")
             return None
 
-        os.makedirs("data", exist_ok=True)
-        df.to_csv(file_path, index=False)
+        saved_path = write_prices(symbol, df)
 
-        print(f"✅ Saved {symbol} data to {file_path}")
+        print(f"✅ Saved {symbol} data to {saved_path}")
         return df
 
     except Exception as e:
         print(f"❌ Failed to fetch {symbol}: {e}")
         return None
+
+
+# === Date Window ===
+# fetch_data serves whatever history is cached; callers that only want
+# [start_date, end_date) (main.py, walk_forward.py) clip it here
+def fetch_window(symbol: str, start_date: str = "2022-01-01", end_date: str = "2025-05-01",
+                 refresh: bool = False, timeframe: str = DAILY) -> pd.DataFrame | None:
+    if timeframe != DAILY:
+        return fetch_bars(symbol, timeframe, start_date, end_date)
+    df = fetch_data(symbol, start_date, end_date, refresh)
+    if df is None:
+        return None
+    dates = pd.to_datetime(df["Date"] if "Date" in df.columns else df.index)
+    mask = (dates >= pd.Timestamp(start_date)) & (dates < pd.Timestamp(end_date))
+    window = df.loc[np.asarray(mask)]
+    return window.reset_index(drop=True) if "Date" in df.columns else window
+
+
+# === Intraday Bars ===
+# Minute data isn't downloaded here: it is ingested into the bar pyramid
+# (data/bar_pyramid.py), and each timeframe is read back as stored bars
+def fetch_bars(symbol: str, timeframe: str, start_date: str | None = None,
+               end_date: str | None = None) -> pd.DataFrame | None:
+    df = load_prices(symbol, start=start_date, end=end_date, timeframe=timeframe)
+    if df is None or df.empty:
+        print(f"⚠️ No {timeframe} bars stored for {symbol} (python -m data.bar_pyramid --symbol {symbol} --csv ...)")
+        return None
+    return df.reset_index()
+
+
+def has_cached_data(symbol: str) -> bool:
+    # True if fetch_data can serve the symbol without downloading
+    safe_symbol = symbol.replace("-", "_").replace("/", "_")
+    return has_prices(symbol) or os.path.exists(f"data/historical_{safe_symbol}.csv")
+
+
+# === Download ===
+# downloader(symbol, start, end) must return a yf.download-style frame; tests
+# and offline runs pass a local stand-in instead of hitting Yahoo.
+def download_data(symbol, start_date, end_date, downloader=None):
+    downloader = downloader or _yf_download
+    return normalize_download(downloader(symbol, start_date, end_date))
+
+
+def normalize_download(df):
+    if df is None or df.empty:
+        return None
+
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(-1)
+
+    df = df.drop(columns=["Adj Close"], errors="ignore")
+    df.reset_index(inplace=True)
+    df.index.name = "Index"
+    return df
+
+
+def _yf_download(symbol, start_date, end_date):
+    import yfinance as yf  # deferred: most runs are served from the store
+    return yf.download(symbol, start=start_date, end=end_date, group_by="ticker")
+
+
+# === Trading Calendar ===
+# Crypto pairs (yfinance's BASE-QUOTE tickers, e.g. BTC-USD, ETH-BTC) trade
+# every day; everything else is treated as a weekday-only listing
+CRYPTO_QUOTES = {"USD", "USDT", "USDC", "EUR", "BTC", "ETH", "BNB"}
+
+
+def is_crypto(symbol: str) -> bool:
+    base, _, quote = symbol.upper().rpartition("-")
+    return bool(base) and quote in CRYPTO_QUOTES
+
+
+def trading_days(symbol: str, start, end) -> pd.DatetimeIndex:
+    return pd.date_range(start, end) if is_crypto(symbol) else pd.bdate_range(start, end)
+
+
+# === Incremental Refresh ===
+# Extends a cached history to cover [start_date, end_date) by fetching only the
+# missing head and tail. The tail request starts at the last cached bar so the
+# overlap can be checked; if the provider has restated history (e.g. split or
+# dividend adjustments), the whole range is downloaded again instead.
+def update_cached_data(symbol, cached, start_date, end_date, downloader=None, rtol=1e-6):
+    cached = cached.sort_values("Date").reset_index(drop=True)
+    first, last = cached["Date"].iloc[0], cached["Date"].iloc[-1]
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    pieces = [cached]
+
+    try:
+        # Only days the asset trades on, so an equity's weekend/holiday start
+        # doesn't re-request an empty head on every refresh
+        if len(trading_days(symbol, start, first - pd.Timedelta(days=1))) > 0:
+            print(f"📥 Fetching {symbol} head from {start.date()} to {first.date()}...")
+            head = download_data(symbol, start.strftime("%Y-%m-%d"), first.strftime("%Y-%m-%d"), downloader)
+            if head is not None:
+                pieces.insert(0, head)
+
+        if last + pd.Timedelta(days=1) < end:
+            print(f"📥 Fetching {symbol} tail from {last.date()} to {end.date()}...")
+            tail = download_data(symbol, last.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), downloader)
+            if tail is not None:
+                if not _overlap_matches(cached, tail, rtol):
+                    print(f"⚠️ Cached history for {symbol} no longer matches the provider, re-downloading...")
+                    df = _redownload(symbol, min(start, first), end, downloader)
+                    return df if df is not None else cached
+                pieces.append(tail)
+
+    except Exception as e:
+        print(f"❌ Failed to refresh {symbol}: {e}")
+        return cached
+
+    if len(pieces) == 1:
+        print(f"✅ {symbol} is already up to date")
+        return cached
+
+    df = pd.concat(pieces, ignore_index=True)
+    df = df.drop_duplicates(subset="Date", keep="last").sort_values("Date").reset_index(drop=True)
+    write_prices(symbol, df)
+    print(f"✅ Appended {len(df) - len(cached)} bars to {symbol}")
+    return df
+
+
+def _overlap_matches(cached, fresh, rtol):
+    overlap = cached.merge(fresh, on="Date", suffixes=("_cached", "_fresh"))
+    if overlap.empty:
+        return True
+    return np.allclose(overlap["Close_cached"], overlap["Close_fresh"], rtol=rtol, equal_nan=True)
+
+
+def _redownload(symbol, start, end, downloader):
+    df = download_data(symbol, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"), downloader)
+    if df is None or "Close" not in df.columns or df["Close"].isna().all():
+        print(f"⚠️ Close prices missing or invalid for {symbol}, keeping cached data")
+        return None
+    write_prices(symbol, df)
+    return df
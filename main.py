@@ -1,78 +1,174 @@
-
 import argparse
+import importlib
 import os
-import pandas as pd
-from fetch_data import fetch_data
-from run_backtest import run_backtest
-from strategies.backtrader_strategies import SMACrossoverStrategy, RSIStrategy, PNShootStrategy
-from data.soapy_symbols import clean_crypto_pairs, clean_crypto_public, clean_quant_public
-import re
-import csv
-from multiprocessing import Pool, cpu_count
+import time
+from functools import partial
+from multiprocessing import cpu_count, get_context
+from data.timeframes import PYRAMID
+
+# === Deferred Imports ===
+# Importing main stays light (walk_forward.py, optimize.py and prefetch.py
+# only want load_symbols_from_csv): backtrader, the engines and the price
+# loaders are imported after argument parsing, once per process. Pool workers
+# run init_worker, which imports them up front instead of on the first task;
+# with --start-method forkserver the fork server imports them once and every
+# worker is forked from it already loaded.
+HEAVY_MODULES = [
+    "numpy", "pandas", "backtrader", "fetch_data", "run_backtest",
+    "backtester.fast_path", "strategies.backtrader_strategies", "data.shared_prices"
+]
+
+def preload_modules(modules=HEAVY_MODULES):
+    # {module: seconds}; time already spent importing a module's dependencies
+    # for an earlier entry isn't counted again
+    times = {}
+    for name in modules:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        times[name] = time.perf_counter() - start
+    return times
+
+def init_worker(shared, cache_dir=None):
+    preload_modules()
+    from data.shared_prices import attach_shared_prices
+    from backtester.profiling import drain_spans
+    attach_shared_prices(shared)
+    open_indicator_store(cache_dir)
+    drain_spans()  # forked workers inherit the parent's spans
+
+# Persistent indicator / position cache of this process (None when disabled)
+_indicator_store = None
+
+def open_indicator_store(cache_dir):
+    global _indicator_store
+    from strategies.indicator_store import IndicatorStore
+    _indicator_store = IndicatorStore(cache_dir) if cache_dir else None
+
+def print_import_profile(times, startup):
+    print("⏱️ Import profile:")
+    for name, seconds in sorted(times.items(), key=lambda kv: -kv[1]):
+        print(f"   {name:<36}{seconds * 1000:8.1f} ms")
+    print(f"   {'total imports':<36}{sum(times.values()) * 1000:8.1f} ms")
+    print(f"   {'startup until first task':<36}{startup * 1000:8.1f} ms")
 
 # === Strategy Mapping ===
-# Map strategy names (as used in CLI or task list) to actual Backtrader-compatible strategy classes
-strategy_map = {
-    "sma_crossover": SMACrossoverStrategy,
-    "rsi": RSIStrategy,
-    "pnshoot": PNShootStrategy
+# Map strategy names (as used in CLI or task list) to actual Backtrader-compatible strategy classes.
+# The classes are looked up on first use, so backtrader is only imported when needed.
+STRATEGY_CLASSES = {
+    "sma_crossover": "SMACrossoverStrategy",
+    "rsi": "RSIStrategy",
+    "pnshoot": "PNShootStrategy"
 }
 
-# === Ticker Validation ===
-# Ensure ticker strings are in a valid format
-def is_valid_ticker(ticker):
-    return isinstance(ticker, str) and re.match(r'^[A-Z0-9\.\-]{1,10}$', ticker.strip())
+def load_strategy(name):
+    from strategies import backtrader_strategies
+    return getattr(backtrader_strategies, STRATEGY_CLASSES[name])
+
+def __getattr__(name):
+    # main.strategy_map, built on first access
+    if name == "strategy_map":
+        return {s: load_strategy(s) for s in STRATEGY_CLASSES}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # === Load Symbols from CSV ===
-# Load and combine cleaned symbol lists from crypto and quant CSVs
+# Cleaned, deduplicated symbols from the crypto and quant CSVs, served from
+# the symbol registry's index (rebuilt when a CSV changes)
 def load_symbols_from_csv():
-    tickers = set(
-        clean_crypto_pairs("data/symbols/crypto_pairs.csv") +
-        clean_crypto_public("data/symbols/crypto_public.csv") +
-        clean_quant_public("data/symbols/quant_public.csv")
-    )
-    return sorted(tickers)
+    from data.soapy_symbols import load_registry
+    return sorted(load_registry().symbols.tolist())
 
 # === Core Backtest Execution Function ===
-# This gets called per (symbol, strategy) pair in parallel
-def run_backtest_combo(args_tuple):
+# This gets called per (symbol, strategy) pair; df skips the data load when the
+# caller already has the symbol's prices. With engine="fast", strategies that
+# have an array translation skip Cerebro (see backtester/fast_path.py).
+def run_backtest_combo(args_tuple, df=None, bulk=True, engine="fast", cache=None, costs=None, profile=False, timeframe="1d",
+                       curve_dir=None):
+    from data.shared_prices import is_attached, get_shared_frame
+    from fetch_data import fetch_data
+    from backtester.equity_store import EQUITY_DIR, curve_path
+    from backtester.fast_path import run_fast_backtest, has_fast_path
+    from backtester.profiling import task, span
     symbol, strategy_name = args_tuple
-    strategy_class = strategy_map[strategy_name]
-    try:
-        # Fetch historical data
-        df = fetch_data(symbol)
-        if df is None or df.empty:
-            raise ValueError("No valid data")
-
-        # Run the backtest
-        results, metrics = run_backtest(
-            symbol=symbol,
-            strategy_class=strategy_class,
-            strategy_name=strategy_name,
-            save_path=f"results/equity_curves/{strategy_name}/{symbol}.csv"
-        )
-
-        # Check if results are usable
-        if results is None or not isinstance(results, list) or len(results) == 0:
-            raise ValueError("Backtest returned no usable results")
-        if not metrics or not isinstance(metrics, dict):
-            raise ValueError("Metrics were not returned properly")
-
-        # Return summary row
-        return {
-            "Symbol": symbol,
-            "Strategy": strategy_name,
-            **metrics
-        }
+    # Timed (and with profile=True, cProfiled) as one task
+    with task(symbol, strategy_name, profile=profile):
+        try:
+            # Use the parent's shared price matrix when attached, else fetch directly
+            if df is None:
+                with span("load"):
+                    df = get_shared_frame(symbol) if is_attached() else fetch_data(symbol, timeframe=timeframe)
+            if df is None or df.empty:
+                raise ValueError("No valid data")
 
-    except Exception as e:
-        # Log failure
-        print(f"❌ Error on {symbol} [{strategy_name}]: {e}")
-        return {
-            "Symbol": symbol,
-            "Strategy": strategy_name,
-            "Error": str(e)
-        }
+            # Run the backtest
+            if engine == "fast" and has_fast_path(strategy_name):
+                results, metrics = run_fast_backtest(
+                    symbol,
+                    strategy_name,
+                    df,
+                    save_path=curve_path(strategy_name, symbol, curve_dir or EQUITY_DIR),
+                    cache=cache,
+                    costs=costs,
+                    timeframe=timeframe
+                )
+                usable = results is not None
+            else:
+                from run_backtest import run_backtest
+                results, metrics = run_backtest(
+                    symbol=symbol,
+                    strategy_class=load_strategy(strategy_name),
+                    strategy_name=strategy_name,
+                    save_path=curve_path(strategy_name, symbol, curve_dir or EQUITY_DIR),
+                    df=df,
+                    bulk=bulk,
+                    costs=costs,
+                    timeframe=timeframe
+                )
+                usable = results is not None and isinstance(results, list) and len(results) > 0
+
+            # Check if results are usable
+            if not usable:
+                raise ValueError("Backtest returned no usable results")
+            if not metrics or not isinstance(metrics, dict):
+                raise ValueError("Metrics were not returned properly")
+
+            # Return summary row
+            return {
+                "Symbol": symbol,
+                "Strategy": strategy_name,
+                **metrics
+            }
+
+        except Exception as e:
+            # Log failure
+            print(f"❌ Error on {symbol} [{strategy_name}]: {e}")
+            return {
+                "Symbol": symbol,
+                "Strategy": strategy_name,
+                "Error": str(e)
+            }
+
+# === Per-Symbol Work Unit ===
+# Runs every pending strategy for one symbol on a single data load; returns
+# the summary rows and the unit's timing spans (backtester/profiling.py)
+def run_symbol_tasks(args_tuple, bulk=True, engine="fast", costs=None, profile=False, timeframe="1d", curve_dir=None):
+    from data.shared_prices import is_attached, get_shared_frame
+    from fetch_data import fetch_data
+    from strategies.indicators import IndicatorCache
+    from backtester.profiling import task, span, drain_spans
+    symbol, strategy_names = args_tuple
+    with task(symbol):
+        with span("load"):
+            df = get_shared_frame(symbol) if is_attached() else fetch_data(symbol, timeframe=timeframe)
+        if df is None or df.empty:
+            print(f"❌ Error on {symbol}: No valid data")
+            rows = [{"Symbol": symbol, "Strategy": s, "Error": "No valid data"} for s in strategy_names]
+        else:
+            # Indicators shared by the fast-path strategies, persisted across runs
+            cache = IndicatorCache(df, symbol=symbol, store=_indicator_store)
+            rows = [run_backtest_combo((symbol, s), df=df, bulk=bulk, engine=engine, cache=cache, costs=costs, profile=profile,
+                                       timeframe=timeframe, curve_dir=curve_dir)
+                    for s in strategy_names]
+    return rows, drain_spans()
 
 # === Main Execution ===
 # Runs a full backtest suite over selected strategies and symbols
@@ -81,54 +177,161 @@ def main():
     parser.add_argument("--symbol", help="Single ticker symbol (e.g. SOL-USD)")
     parser.add_argument("--start", default="2022-01-01")
     parser.add_argument("--end", default="2025-05-01")
+    parser.add_argument("--refresh", action="store_true", help="Append missing bars to the cached data before running")
+    parser.add_argument("--incremental", action="store_true", help="Reuse results from the run manifest for tasks whose inputs are unchanged")
+    parser.add_argument("--engine", choices=["fast", "cerebro"], default="fast", help="Array fast path where available (default) or Backtrader for everything")
+    parser.add_argument("--verbose", action="store_true", help="Full Cerebro setup with per-run and per-order output instead of bulk mode")
+    parser.add_argument("--timeframe", choices=PYRAMID, default="1d", help="Bar size; intraday bars come from the bar pyramid (data/bar_pyramid.py)")
+    parser.add_argument("--costs", help="Commission / slippage for every run, e.g. bps=10,spread=0.1 (see backtester/costs.py)")
+    parser.add_argument("--workers", type=int, default=cpu_count(), help="Worker processes (default: all cores)")
+    parser.add_argument("--start-method", choices=["fork", "spawn", "forkserver"], help="Worker start method (default: the platform's); forkserver preloads the heavy imports once")
+    parser.add_argument("--import-profile", action="store_true", help="Report import and startup time")
+    parser.add_argument("--cache-dir", default="data/indicator_cache", help="Persistent indicator cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the indicator cache")
+    parser.add_argument("--profile", type=int, metavar="N", help="cProfile every task and keep the dumps of the N slowest in results/profiles/")
     args = parser.parse_args()
 
+    # Heavy imports happen here, after argument errors and --help
+    started = time.perf_counter()
+    import_times = preload_modules()
+    from fetch_data import fetch_window
+    from prefetch import prefetch
+    from run_backtest import ENGINE_VERSION, METRIC_NAMES
+    from data.shared_prices import build_shared_prices, attach_shared_prices, get_shared_frame, release_shared_prices
+    from backtester.manifest import load_manifest, save_manifest, task_key, task_hash, strategy_fingerprint, cached_result, record_result
+    from backtester.scheduler import build_work_units
+    from backtester.result_sink import ResultSink
+    from backtester.equity_store import variant_dir
+    from backtester.fast_path import has_fast_path
+    from backtester.costs import parse_costs
+    from backtester.profiling import span, drain_spans, save_timings, summarize_timings, keep_slowest_profiles, TIMINGS_PATH
+    from strategies.signals import position_builders
+    from strategies.indicator_store import data_fingerprint
+    costs = parse_costs(args.costs)
+
     # Load symbols: either just one, or all from CSVs
     symbols = [args.symbol] if args.symbol else load_symbols_from_csv()
-    strategy_names = list(strategy_map.keys())
+    strategy_names = list(STRATEGY_CLASSES.keys())
 
-    # Prepare output directories
+    # Prepare output directories; intraday runs and runs with costs keep their
+    # own curves
+    curve_dir = variant_dir(costs=args.costs, timeframe=args.timeframe)
     os.makedirs("results", exist_ok=True)
     for s in strategy_names:
-        os.makedirs(f"results/equity_curves/{s}", exist_ok=True)
-
-    # Clear failure log
-    with open("results/failures.csv", "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Symbol", "Strategy", "Error"])
+        os.makedirs(f"{curve_dir}/{s}", exist_ok=True)
 
     # Create workload list
     tasks = [(symbol, strategy) for strategy in strategy_names for symbol in symbols]
-    print(f"🚀 Running {len(tasks)} backtests using {min(cpu_count(), 4)} cores...")
 
-    # Execute in parallel
-    with Pool(processes=min(cpu_count(), 4)) as pool:
-        results = pool.map(run_backtest_combo, tasks)
+    # Download anything missing from the price store before any backtests start
+    # (intraday bars are ingested into the bar pyramid, not downloaded)
+    with span("prefetch"):
+        if args.timeframe == "1d":
+            prefetch(symbols, args.start, args.end)
+
+    # Load every symbol once into a memory-mapped matrix the workers attach to
+    loader = partial(fetch_window, start_date=args.start, end_date=args.end, refresh=args.refresh, timeframe=args.timeframe)
+    with span("share_prices"):
+        shared = build_shared_prices(symbols, loader)
+    print(f"📦 Shared {len(shared['index'])}/{len(symbols)} symbols with workers")
+
+    # Hash each task's inputs; with --incremental, unchanged tasks reuse the
+    # manifest's result and only the rest go to the pool
+    attach_shared_prices(shared)
+    with span("hash_inputs"):
+        manifest = load_manifest()
+        data_fps = {s: data_fingerprint(get_shared_frame(s)) for s in shared["index"]}
+        strategy_fps = {s: strategy_fingerprint(load_strategy(s)) for s in strategy_names}
+        if args.engine == "fast":
+            strategy_fps.update({s: strategy_fps[s] + strategy_fingerprint(position_builders[s]) for s in strategy_names if has_fast_path(s)})
+        options = {"engine": args.engine}
+        if args.costs:
+            options["costs"] = args.costs
+        if args.timeframe != "1d":
+            options["timeframe"] = args.timeframe
+        task_hashes = {
+            (symbol, strategy): task_hash(data_fps[symbol], strategy_fps[strategy], ENGINE_VERSION, **options)
+            for symbol, strategy in tasks if symbol in data_fps
+        }
 
-    # Separate successes and failures
-    all_summaries = []
-    all_failures = []
+    # Results go to the SQLite result store as they arrive, committed in
+    # batches; the manifest is saved with every commit so an interrupted run
+    # can be resumed with --incremental
+    sink = ResultSink(METRIC_NAMES, strategy_names, on_commit=lambda: save_manifest(manifest), costs=args.costs,
+                      timeframe=args.timeframe)
 
-    for r in results:
-        if "Error" in r:
-            all_failures.append(r)
+    pending = []
+    for symbol, strategy in tasks:
+        input_hash = task_hashes.get((symbol, strategy))
+        key = task_key(symbol, strategy, args.costs, args.timeframe)
+        cached = cached_result(manifest, key, input_hash) if args.incremental and input_hash else None
+        if cached is not None:
+            sink.write(cached)
         else:
-            all_summaries.append(r)
-
-    # Save summaries per strategy and all together
-    if all_summaries:
-        df = pd.DataFrame(all_summaries)
-        for strategy in strategy_names:
-            df[df["Strategy"] == strategy].to_csv(f"results/summary_{strategy}.csv", index=False)
-        df.to_csv("results/summary_all.csv", index=False)
-        print("✅ Summaries saved.")
-
-    # Save any failures
-    if all_failures:
-        with open("results/failures.csv", "a", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["Symbol", "Strategy", "Error"])
-            writer.writerows(all_failures)
-        print("⚠️ Failures logged.")
+            pending.append((symbol, strategy))
+    if sink.written:
+        print(f"♻️ Reusing {sink.written} unchanged results from the manifest")
+
+    # Group by symbol and dispatch the costliest units first
+    bar_counts = {s: n for s, (_, n) in shared["index"].items()}
+    units = build_work_units(pending, bar_counts)
+    workers = max(1, min(args.workers, len(units) or 1))
+    print(f"🚀 Running {len(pending)} backtests ({len(units)} symbols) using {workers} cores...")
+    if args.import_profile:
+        print_import_profile(import_times, time.perf_counter() - started)
+
+    # Execute in parallel; workers pull the next unit as soon as they're free.
+    # A single worker (e.g. --symbol runs) runs in this process, no pool.
+    run_unit = partial(run_symbol_tasks, bulk=not args.verbose, engine=args.engine, costs=costs, profile=bool(args.profile),
+                       timeframe=args.timeframe, curve_dir=curve_dir)
+    cache_dir = None if args.no_cache else args.cache_dir
+    spans = []
+    pool = None
+    try:
+        with span("backtests"):
+            if workers > 1:
+                context = get_context(args.start_method)
+                if args.start_method == "forkserver":
+                    context.set_forkserver_preload(HEAVY_MODULES)
+                pool = context.Pool(processes=workers, initializer=init_worker, initargs=(shared, cache_dir))
+                unit_rows = pool.imap_unordered(run_unit, units, chunksize=1)
+            else:
+                open_indicator_store(cache_dir)
+                unit_rows = map(run_unit, units)
+
+            for rows, unit_spans in unit_rows:
+                spans.extend(unit_spans)
+                for r in rows:
+                    sink.write(r)
+                    # Record fresh results so the next incremental run can skip them
+                    key = task_key(r["Symbol"], r["Strategy"], args.costs, args.timeframe)
+                    input_hash = task_hashes.get((r["Symbol"], r["Strategy"]))
+                    if "Error" in r or input_hash is None:
+                        manifest.pop(key, None)
+                    else:
+                        record_result(manifest, key, input_hash, r)
+
+        # Regenerate the summary/failure CSVs from the store's views
+        sink.export_csv()
+    finally:
+        if pool is not None:
+            pool.terminate()
+        sink.close()
+        save_manifest(manifest)
+        release_shared_prices(shared)
+
+    print(f"✅ Summaries saved to {sink.path} ({sink.written} results).")
+    if sink.failed:
+        print(f"⚠️ {sink.failed} failures logged.")
+
+    # Where the time went: raw spans next to the summaries, totals per stage
+    timings = save_timings(spans + drain_spans())
+    stages = summarize_timings(timings)["stage"]
+    print(f"⏱️ Timings saved to {TIMINGS_PATH}")
+    print(stages.round(4).to_string())
+    if args.profile:
+        for path in keep_slowest_profiles(timings, args.profile):
+            print(f"🔍 Profile kept: {path}")
 
 # Entry point
 if __name__ == "__main__":
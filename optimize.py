@@ -0,0 +1,157 @@
+
+import argparse
+import itertools
+import os
+import numpy as np
+import pandas as pd
+from multiprocessing import Pool, cpu_count
+from fetch_data import fetch_window
+from main import load_symbols_from_csv
+from backtester.batch import backtest_batch_positions, metrics_frame
+from strategies.indicators import IndicatorCache
+from strategies.indicator_store import IndicatorStore, INDICATOR_CACHE_DIR
+from strategies.signals import position_builders
+
+# === Parameter Grids ===
+# Default sweep per strategy (names match the Backtrader params)
+param_grids = {
+    "sma_crossover": {
+        "short": range(3, 31),
+        "long": range(10, 201, 5)
+    },
+    "rsi": {
+        "period": range(5, 31),
+        "lower": range(15, 41, 5),
+        "upper": range(60, 86, 5)
+    },
+    "pnshoot": {
+        "fast_period": range(5, 51, 5),
+        "slow_period": range(20, 201, 10),
+        "adx_period": [10, 14, 20],
+        "volume_period": [10, 20, 30],
+        "adx_threshold": [20, 25, 30]
+    }
+}
+
+# Combinations that make no sense for a strategy are dropped before running
+constraints = {
+    "sma_crossover": lambda p: p["short"] < p["long"],
+    "rsi": lambda p: p["lower"] < p["upper"],
+    "pnshoot": lambda p: p["fast_period"] < p["slow_period"]
+}
+
+BATCH_SIZE = 256
+
+# Set in each worker by init_worker when the disk cache is enabled
+_store = None
+
+
+def init_worker(cache_dir):
+    global _store
+    _store = IndicatorStore(cache_dir) if cache_dir else None
+
+
+def expand_grid(strategy_name, grid):
+    names = list(grid.keys())
+    combos = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    valid = constraints.get(strategy_name, lambda p: True)
+    return [p for p in combos if valid(p)]
+
+
+# === Per-Symbol Sweep ===
+# Runs every strategy's grid for one symbol. Indicators live in one cache per
+# symbol, so each distinct window is computed once and shared by every
+# combination (and strategy) that uses it. Prices cover the same
+# start / end window as main.py runs.
+def optimize_symbol(args_tuple):
+    symbol, combos_by_strategy, start_date, end_date = args_tuple
+    try:
+        df = fetch_window(symbol, start_date, end_date)
+        if df is None or df.empty:
+            raise ValueError("No valid data")
+
+        cache = IndicatorCache(df, symbol=symbol, store=_store)
+        close = cache.column("Close")[:, None]
+        frames = {}
+
+        for strategy_name, combos in combos_by_strategy.items():
+            build = position_builders[strategy_name]
+            parts = []
+            for start in range(0, len(combos), BATCH_SIZE):
+                chunk = combos[start:start + BATCH_SIZE]
+                positions = np.stack([build(cache, **params) for params in chunk])[:, :, None]
+                _, metrics = backtest_batch_positions(close, positions)
+                parts.append(metrics_frame(metrics, [symbol], chunk))
+            frames[strategy_name] = pd.concat(parts, ignore_index=True)
+
+        return symbol, frames, None
+
+    except Exception as e:
+        print(f"❌ Error optimizing {symbol}: {e}")
+        return symbol, {}, str(e)
+
+
+def rank_results(df, metric):
+    df = df.copy()
+    df["Rank"] = df.groupby("Symbol")[metric].rank(ascending=False, method="first", na_option="bottom").astype(int)
+    return df.sort_values(["Symbol", "Rank"]).reset_index(drop=True)
+
+
+def parse_param_overrides(overrides):
+    # "short=5,10,15" -> {"short": [5, 10, 15]}
+    grid = {}
+    for item in overrides or []:
+        name, values = item.split("=", 1)
+        grid[name] = [float(v) if "." in v else int(v) for v in values.split(",")]
+    return grid
+
+
+# === Main Execution ===
+def main():
+    parser = argparse.ArgumentParser(description="Grid-search strategy parameters per symbol.")
+    parser.add_argument("--symbol", help="Single ticker symbol (e.g. SOL-USD)")
+    parser.add_argument("--strategy", choices=list(param_grids.keys()), help="Only sweep this strategy")
+    parser.add_argument("--start", default="2022-01-01")
+    parser.add_argument("--end", default="2025-05-01")
+    parser.add_argument("--param", action="append", help="Override a grid axis, e.g. --param short=5,10,15")
+    parser.add_argument("--metric", default="Sharpe Ratio", help="Metric used to rank combinations")
+    parser.add_argument("--top", type=int, default=5, help="Rows per symbol to print")
+    parser.add_argument("--workers", type=int, default=cpu_count())
+    parser.add_argument("--cache-dir", default=INDICATOR_CACHE_DIR, help="Persistent indicator cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the indicator cache")
+    args = parser.parse_args()
+
+    symbols = [args.symbol] if args.symbol else load_symbols_from_csv()
+    strategy_names = [args.strategy] if args.strategy else list(param_grids.keys())
+
+    overrides = parse_param_overrides(args.param)
+    combos_by_strategy = {
+        s: expand_grid(s, {**param_grids[s], **{k: v for k, v in overrides.items() if k in param_grids[s]}})
+        for s in strategy_names
+    }
+    total = sum(len(c) for c in combos_by_strategy.values()) * len(symbols)
+    print(f"🔍 Sweeping {total} combinations over {len(symbols)} symbols using {args.workers} cores...")
+
+    tasks = [(symbol, combos_by_strategy, args.start, args.end) for symbol in symbols]
+    results = {s: [] for s in strategy_names}
+    cache_dir = None if args.no_cache else args.cache_dir
+    with Pool(processes=max(1, args.workers), initializer=init_worker, initargs=(cache_dir,)) as pool:
+        for symbol, frames, error in pool.imap_unordered(optimize_symbol, tasks):
+            for strategy_name, frame in frames.items():
+                frame.insert(1, "Strategy", strategy_name)
+                results[strategy_name].append(frame)
+
+    os.makedirs("results/optimize", exist_ok=True)
+    for strategy_name, frames in results.items():
+        if not frames:
+            continue
+        ranked = rank_results(pd.concat(frames, ignore_index=True), args.metric)
+        path = f"results/optimize/optimize_{strategy_name}.csv"
+        ranked.to_csv(path, index=False)
+        print(f"✅ Saved {len(ranked)} ranked rows to {path}")
+        print(ranked[ranked["Rank"] <= args.top].to_string(index=False))
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,18 @@
 
 import argparse
-import os
-import pandas as pd
-import matplotlib.pyplot as plt
+from data.timeframes import PYRAMID
 
-def plot_equity_curve(symbol, strategy):
-    filepath = f"results/equity_curves/{strategy}/{symbol}.csv"
-    if not os.path.exists(filepath):
+# matplotlib and the result loaders are imported inside the plot functions,
+# so --help and argument errors return without loading them
+
+def plot_equity_curve(symbol, strategy, costs=None, timeframe="1d"):
+    import matplotlib.pyplot as plt
+    from backtester.equity_store import load_curve
+
+    df = load_curve(strategy, symbol, costs=costs, timeframe=timeframe)
+    if df is None:
         print(f"❌ Equity curve not found for {symbol} [{strategy}]")
         return
-    df = pd.read_csv(filepath)
-    if "Equity" not in df.columns:
-        print(f"❌ 'Equity' column missing in {filepath}")
-        return
 
     plt.figure(figsize=(10, 5))
     plt.plot(df["Equity"], label=f"{symbol} - {strategy}")
@@ -24,17 +24,17 @@ def plot_equity_curve(symbol, strategy):
     plt.tight_layout()
     plt.show()
 
-def plot_summary_metric(metric="Percent Return", strategy=None):
-    summary_path = "results/summary_all.csv"
-    if not os.path.exists(summary_path):
-        print("❌ summary_all.csv not found")
+def plot_summary_metric(metric="Percent Return", strategy=None, costs=None, timeframe="1d"):
+    import matplotlib.pyplot as plt
+    from backtester.result_sink import load_summary
+
+    df = load_summary(strategy, costs=costs, timeframe=timeframe)
+    if df is None:
+        print("❌ No results found (run main.py first)")
         return
-    df = pd.read_csv(summary_path)
-    if strategy:
-        df = df[df["Strategy"] == strategy]
 
     if metric not in df.columns:
-        print(f"❌ Metric '{metric}' not found in summary_all.csv")
+        print(f"❌ Metric '{metric}' not found in the results")
         return
 
     df_sorted = df.sort_values(metric, ascending=False)
@@ -52,12 +52,14 @@ def main():
     parser.add_argument("--symbol", help="Symbol to plot equity curve for")
     parser.add_argument("--strategy", help="Strategy used for that symbol")
     parser.add_argument("--metric", help="Summary metric to plot across symbols")
+    parser.add_argument("--costs", help="Plot the results of the main.py --costs run with this spec")
+    parser.add_argument("--timeframe", choices=PYRAMID, default="1d", help="Plot the results of a main.py run at this bar size")
     args = parser.parse_args()
 
     if args.symbol and args.strategy:
-        plot_equity_curve(args.symbol, args.strategy)
+        plot_equity_curve(args.symbol, args.strategy, args.costs, args.timeframe)
     elif args.metric:
-        plot_summary_metric(metric=args.metric, strategy=args.strategy)
+        plot_summary_metric(metric=args.metric, strategy=args.strategy, costs=args.costs, timeframe=args.timeframe)
     else:
         print("⚠️ Please provide either --symbol and --strategy, or --metric [--strategy]")
 
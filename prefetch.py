@@ -0,0 +1,214 @@
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from fetch_data import normalize_download, has_cached_data
+from data.price_store import STORE_DIR, has_prices, write_prices
+from data.synthetic import synthetic_ohlcv, symbol_seed
+
+# === Providers ===
+# A provider takes (symbols, start, end) and returns {symbol: yf.download-style
+# frame}. Symbols it has no data for are simply left out of the dict.
+
+class YahooProvider:
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory or _default_session
+        self._local = threading.local()
+
+    def session(self):
+        # One HTTP session per download thread, reused across its batches
+        if not hasattr(self._local, "session"):
+            self._local.session = self.session_factory()
+        return self._local.session
+
+    def __call__(self, symbols, start, end):
+        import yfinance as yf  # deferred: only needed when something is missing
+        raw = yf.download(
+            symbols, start=start, end=end, group_by="ticker",
+            threads=False, progress=False, session=self.session()
+        )
+        if raw is None or raw.empty:
+            return {}
+        if not isinstance(raw.columns, pd.MultiIndex):
+            return {symbols[0]: raw}
+
+        # Mixed calendars (crypto next to equities) leave all-NaN rows per ticker
+        frames = {}
+        for symbol in set(raw.columns.get_level_values(0)) & set(symbols):
+            df = raw[symbol].dropna(how="all")
+            if not df.empty:
+                frames[symbol] = df
+        return frames
+
+
+def _default_session():
+    # yfinance wants a curl_cffi session; without it, let yfinance manage its own
+    try:
+        from curl_cffi import requests as curl_requests
+        return curl_requests.Session(impersonate="chrome")
+    except ImportError:
+        return None
+
+
+class FakeProvider:
+    # Offline stand-in: deterministic synthetic bars plus simulated latency,
+    # for benchmarking the prefetch stage without touching the network. Its
+    # bars are fake, so they go to a scratch store_dir, never data/store.
+    def __init__(self, latency=0.2, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def __call__(self, symbols, start, end):
+        with self._lock:
+            self._calls += 1
+            call = self._calls
+        time.sleep(self.latency)
+        if self.failure_rate and (symbol_seed(str(call), self.seed) % 1000) / 1000 < self.failure_rate:
+            raise ConnectionError("simulated provider failure")
+
+        dates = pd.date_range(start=start, end=end, freq="D", inclusive="left")
+        return {
+            symbol: synthetic_ohlcv(len(dates), start=start, seed=symbol_seed(symbol, self.seed))
+            for symbol in symbols
+        }
+
+
+# === Rate Limiting ===
+class RateLimiter:
+    # Token bucket shared by all download threads (requests per second)
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# === Prefetch Stage ===
+# Downloads every missing symbol in multi-ticker batches on a thread pool and
+# writes them to the price store, so backtests only ever read local data.
+def prefetch(symbols, start_date="2022-01-01", end_date="2025-05-01", provider=None,
+             batch_size=20, max_workers=4, rate=2.0, retries=3, backoff=1.0, overwrite=False,
+             store_dir=STORE_DIR):
+    if isinstance(provider, FakeProvider) and os.path.abspath(store_dir) == os.path.abspath(STORE_DIR):
+        raise ValueError("FakeProvider bars must not go to the real price store; pass a scratch store_dir")
+    provider = provider or YahooProvider()
+    # Legacy CSVs only count as cached for the real store
+    cached = has_cached_data if store_dir == STORE_DIR else (lambda s: has_prices(s, store_dir))
+    pending = [s for s in symbols if overwrite or not cached(s)]
+    if not pending:
+        print("📂 All symbols already cached, nothing to prefetch")
+        return {"saved": [], "failed": {}}
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    limiter = RateLimiter(rate, burst=max_workers)
+    saved, failed = [], {}
+    print(f"📥 Prefetching {len(pending)} symbols in {len(batches)} batches using {max_workers} threads...")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_fetch_batch, provider, batch, start_date, end_date, limiter, retries, backoff): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                frames = future.result()
+            except Exception as e:
+                print(f"❌ Batch {batch[0]}..{batch[-1]} failed: {e}")
+                failed.update({s: str(e) for s in batch})
+                continue
+
+            for symbol in batch:
+                df = normalize_download(frames.get(symbol))
+                if df is None or "Close" not in df.columns or df["Close"].isna().all():
+                    failed[symbol] = "No data returned"
+                    continue
+                write_prices(symbol, df, store_dir)
+                saved.append(symbol)
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Prefetched {len(saved)} symbols in {elapsed:.1f}s ({len(failed)} failed)")
+    return {"saved": saved, "failed": failed}
+
+
+def _fetch_batch(provider, batch, start_date, end_date, limiter, retries, backoff):
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        try:
+            return provider(batch, start_date, end_date)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * (2 ** attempt)
+            print(f"⚠️ Batch {batch[0]}..{batch[-1]} failed ({e}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
+# === Main Execution ===
+def main():
+    parser = argparse.ArgumentParser(description="Download the symbol universe into the price store.")
+    parser.add_argument("--symbol", action="append", help="Ticker to fetch (repeatable); default is the full universe")
+    parser.add_argument("--start", default="2022-01-01")
+    parser.add_argument("--end", default="2025-05-01")
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=2.0, help="Max requests per second")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--overwrite", action="store_true", help="Re-download symbols already in the store")
+    parser.add_argument("--fake", action="store_true", help="Use the offline synthetic provider (writes to a scratch store)")
+    parser.add_argument("--store-dir", help=f"Price store to fill (default: {STORE_DIR}; a temporary directory with --fake)")
+    args = parser.parse_args()
+
+    store_dir = args.store_dir or STORE_DIR
+    scratch = None
+    if args.fake:
+        if args.store_dir is None:
+            store_dir = scratch = tempfile.mkdtemp(prefix="midas_fake_store_")
+        elif os.path.abspath(store_dir) == os.path.abspath(STORE_DIR):
+            parser.error("--fake writes synthetic bars; give it a --store-dir other than the real price store")
+
+    if args.symbol:
+        symbols = args.symbol
+    else:
+        from main import load_symbols_from_csv  # main imports this module
+        symbols = load_symbols_from_csv()
+
+    try:
+        prefetch(
+            symbols, args.start, args.end,
+            provider=FakeProvider() if args.fake else None,
+            batch_size=args.batch_size, max_workers=args.workers, rate=args.rate,
+            retries=args.retries, overwrite=args.overwrite, store_dir=store_dir
+        )
+    finally:
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+# Entry point
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,152 @@
 
+import logging
 import os
 import pandas as pd
 import backtrader as bt
 from datetime import datetime
-
-def run_backtest(symbol: str, strategy_class, strategy_name: str, save_path=None, **kwargs):
+from data.price_store import DAILY, load_prices
+from data.bar_pyramid import bars_per_year
+from backtester.equity_store import EquityCurve, curve_path, curve_frame, save_curve
+from backtester.analyzers import EXTRA_METRICS, RunMetrics
+from backtester.feeds import ArrayFeed, FEED_TIMEFRAMES
+from backtester.costs import CostCommission
+from backtester.profiling import span
+from strategies.backtrader_strategies import logger as strategy_logger
+
+# Bump when a change here alters backtest results, so cached runs are redone
+ENGINE_VERSION = "4"
+
+# Summary columns produced by run_backtest, in output order
+METRIC_NAMES = [
+    "Start Equity", "End Equity", "Percent Return", "Total Trades",
+    "Win Rate", "Sharpe Ratio", "Max Drawdown", *EXTRA_METRICS
+]
+
+# === Bulk Mode ===
+# Lean Cerebro for sweeps: an ArrayFeed instead of PandasData, no default
+# observers, one RunMetrics analyzer instead of five, and strategy order
+# logging silenced. exactbars=0 keeps preload/runonce (vectorized indicators),
+# the faster choice for daily histories; pass exactbars=1 to trade that speed
+# for a bounded per-line buffer on very long intraday series.
+BULK_CEREBRO = dict(stdstats=False, preload=True, runonce=True, exactbars=0)
+
+# === Summary Row ===
+# Shared by the Cerebro path and the array fast path (backtester/fast_path.py)
+def summary_metrics(start_equity, end_equity, total_trades, win_trades, sharpe_ratio, max_drawdown, extra=None):
+    # extra: EXTRA_METRICS from backtester/metrics.py (Sortino, Calmar, ...).
+    # Backtrader's Sharpe is None when undefined (one year, flat returns): 0
+    sharpe_ratio = 0.0 if sharpe_ratio is None else sharpe_ratio
+    percent_return = ((end_equity - start_equity) / start_equity) * 100
+    win_rate = (win_trades / total_trades) * 100 if total_trades > 0 else 0
+    return {
+        "Start Equity": round(start_equity, 2),
+        "End Equity": round(end_equity, 2),
+        "Percent Return": round(percent_return, 2),
+        "Total Trades": total_trades,
+        "Win Rate": round(win_rate, 2),
+        "Sharpe Ratio": round(sharpe_ratio, 2),
+        "Max Drawdown": round(max_drawdown, 2),
+        **{k: round(float(v), 2) for k, v in (extra or {}).items()}
+    }
+
+def run_backtest(symbol: str, strategy_class, strategy_name: str, save_path=None, df=None, bulk=False, exactbars=None, costs=None,
+                 timeframe=DAILY, **kwargs):
     safe_symbol = symbol.replace("-", "_").replace("/", "_")
     data_path = f"data/historical_{safe_symbol}.csv"
 
     if save_path is None:
-        save_path = f"results/equity_curve_{safe_symbol}_{strategy_name}.csv"
+        save_path = curve_path(strategy_name, symbol, timeframe=timeframe)
 
-    print(f"📊 Running Backtrader backtest for {symbol} using {strategy_name} strategy...")
+    if not bulk:
+        print(f"📊 Running Backtrader backtest for {symbol} using {strategy_name} strategy...")
 
+    log_level = strategy_logger.level
     try:
-        # Load data
-        df = pd.read_csv(data_path, parse_dates=["Date"])
-        df = df.rename(columns=str.lower)  # Backtrader prefers lowercase
-        df = df.set_index("date")
-
-        # Create Backtrader data feed
-        data = bt.feeds.PandasData(dataname=df)
+        # Load data (callers that already hold the frame pass it in as df)
+        with span("load"):
+            if df is None:
+                df = load_prices(symbol, timeframe=timeframe)
+            if df is None and timeframe == DAILY:
+                df = pd.read_csv(data_path, parse_dates=["Date"])
+            if df is None:
+                raise ValueError(f"No {timeframe} bars stored for {symbol}")
+            if "Date" in df.columns:
+                df = df.set_index("Date")
+            df = df.rename(columns=str.lower)  # Backtrader prefers lowercase
+
+        # Create Backtrader data feed (bulk runs use the faster array feed)
+        with span("feed"):
+            bar_timeframe, compression = FEED_TIMEFRAMES[timeframe]
+            feed = ArrayFeed if bulk else bt.feeds.PandasData
+            data = feed(dataname=df, timeframe=bar_timeframe, compression=compression)
 
         # Initialize Backtrader engine
-        cerebro = bt.Cerebro()
-        cerebro.addstrategy(strategy_class, **kwargs)
-        cerebro.adddata(data)
-        start_equity = 100000
-        cerebro.broker.set_cash(start_equity)
-        cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
-        cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
-        cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
-
-        results = cerebro.run()
+        with span("setup"):
+            if bulk:
+                options = dict(BULK_CEREBRO)
+                if exactbars is not None:
+                    options["exactbars"] = exactbars
+                cerebro = bt.Cerebro(**options)
+                strategy_logger.setLevel(logging.WARNING)
+            else:
+                cerebro = bt.Cerebro()
+            cerebro.addstrategy(strategy_class, **kwargs)
+            cerebro.adddata(data)
+            start_equity = 100000
+            cerebro.broker.set_cash(start_equity)
+            if costs is not None:
+                # Commission / slippage from a backtester.costs model
+                cerebro.broker.addcommissioninfo(CostCommission(model=costs, data=data))
+            cerebro.addanalyzer(RunMetrics, _name='metrics', periods_per_year=bars_per_year(timeframe),
+                                bar_sharpe=timeframe != DAILY)
+            if not bulk:
+                cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe')
+                cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
+                cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+                cerebro.addanalyzer(EquityCurve, _name='equity')
+
+        with span("cerebro_run"):
+            results = cerebro.run()
         strat = results[0]
 
-        end_equity = cerebro.broker.getvalue()
-        percent_return = ((end_equity - start_equity) / start_equity) * 100
-
-        trades = strat.analyzers.trades.get_analysis()
-        total_trades = trades.total.total if trades.total and trades.total.total else 0
-        win_trades = trades.won.total if trades.won and trades.won.total else 0
-        win_rate = (win_trades / total_trades) * 100 if total_trades > 0 else 0
-
-        sharpe = strat.analyzers.sharpe.get_analysis()
-        sharpe_ratio = sharpe.get("sharperatio", 0)
-
-        drawdown = strat.analyzers.drawdown.get_analysis()
-        max_drawdown = drawdown.get("max", {}).get("drawdown", 0)
-
-        metrics = {
-            "Start Equity": round(start_equity, 2),
-            "End Equity": round(end_equity, 2),
-            "Percent Return": round(percent_return, 2),
-            "Total Trades": total_trades,
-            "Win Rate": round(win_rate, 2),
-            "Sharpe Ratio": round(sharpe_ratio, 2),
-            "Max Drawdown": round(max_drawdown, 2)
-        }
-
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-
-        print("📈 Final Portfolio Value:", end_equity)
-        print("📊 Metrics:", metrics)
+        with span("analyzers"):
+            end_equity = float(cerebro.broker.getvalue())
+            run = strat.analyzers.metrics.get_analysis()
+            if bulk:
+                total_trades = run["total_trades"]
+                win_trades = run["won_trades"]
+                sharpe_ratio = run["sharperatio"]
+                max_drawdown = run["max_drawdown"]
+                curve = run["curve"]
+            else:
+                trades = strat.analyzers.trades.get_analysis()
+                total_trades = trades.total.total if trades.total and trades.total.total else 0
+                win_trades = trades.won.total if trades.won and trades.won.total else 0
+
+                sharpe = strat.analyzers.sharpe.get_analysis()
+                sharpe_ratio = sharpe.get("sharperatio", 0) if timeframe == DAILY else run["sharperatio"]
+
+                drawdown = strat.analyzers.drawdown.get_analysis()
+                max_drawdown = drawdown.get("max", {}).get("drawdown", 0)
+                curve = strat.analyzers.equity.get_analysis()
+            metrics = summary_metrics(start_equity, end_equity, total_trades, win_trades, sharpe_ratio, max_drawdown, run["extra"])
+
+        # Save the equity curve (binary .npy unless a .csv path was asked for)
+        with span("save_curve"):
+            if save_path.endswith(".csv"):
+                os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+                curve_frame(curve).to_csv(save_path, index=False)
+            else:
+                save_curve(save_path, curve)
+
+        if not bulk:
+            print("📈 Final Portfolio Value:", end_equity)
+            print("📊 Metrics:", metrics)
 
         return results, metrics
 
     except Exception as e:
         print(f"❌ Error during backtest of {symbol}: {e}")
         return None, {}
+    finally:
+        strategy_logger.setLevel(log_level)
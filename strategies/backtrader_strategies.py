@@ -1,6 +1,17 @@
 
+import logging
 import backtrader as bt
 
+# Order/trade logging goes through this logger; bulk runs raise its level to
+# WARNING so nothing is formatted or printed per bar
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
 class SMACrossoverStrategy(bt.Strategy):
     params = dict(short=5, long=20)
 
@@ -73,8 +84,9 @@ class PNShootStrategy(bt.Strategy):
         self.crossover = bt.indicators.CrossOver(self.sma_fast, self.sma_slow)
 
     def log(self, txt):
-        dt = self.datas[0].datetime.date(0)
-        print(f'{dt.isoformat()}, {txt}')
+        if logger.isEnabledFor(logging.INFO):
+            dt = self.datas[0].datetime.date(0)
+            logger.info(f'{dt.isoformat()}, {txt}')
 
     def next(self):
         if self.order:
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import threading
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# === Persistent Indicator Store ===
+# Content-addressed disk cache for indicator series and strategy positions.
+# Entries are keyed on (symbol, data fingerprint, indicator key), so changed
+# prices or params miss automatically; IndicatorCache puts a code version in
+# the key, so changed indicator or strategy code misses too. Each entry is a
+# one-column Parquet file; the directory is capped at max_bytes and the least
+# recently used entries are evicted first (a hit refreshes the file's mtime).
+
+INDICATOR_CACHE_DIR = "data/indicator_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def data_fingerprint(df, columns=("Open", "High", "Low", "Close", "Volume")):
+    digest = hashlib.blake2b(digest_size=16)
+    dates = df["Date"] if "Date" in df.columns else df.index
+    digest.update(np.asarray(dates, dtype="datetime64[ns]").view(np.int64).tobytes())
+    for column in columns:
+        if column in df.columns:
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+class IndicatorStore:
+    def __init__(self, directory=INDICATOR_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def path(self, symbol, fingerprint, key):
+        name = hashlib.blake2b(repr((symbol, fingerprint, key)).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, f"{name}.parquet")
+
+    def get(self, symbol, fingerprint, key):
+        path = self.path(symbol, fingerprint, key)
+        try:
+            values = pq.read_table(path, memory_map=True).column(0).to_numpy()
+            os.utime(path)
+            return values
+        except (FileNotFoundError, OSError, pa.ArrowInvalid):
+            return None
+
+    def put(self, symbol, fingerprint, key, values):
+        path = self.path(symbol, fingerprint, key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        pq.write_table(pa.table({"value": np.asarray(values)}), tmp_path)
+        new_size = os.path.getsize(tmp_path)
+        try:
+            old_size = os.path.getsize(path)  # an entry being rewritten
+        except FileNotFoundError:
+            old_size = 0
+        os.replace(tmp_path, path)  # atomic, so parallel workers never see half a file
+
+        with self._lock:
+            self._size += new_size - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".parquet"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                yield entry.path, stat.st_mtime, stat.st_size
+
+    def _evict(self):
+        # Rescan so files written by other processes are counted too
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        self._size = sum(size for _, _, size in entries)
+        target = self.max_bytes * 0.9
+        for path, _, size in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except FileNotFoundError:
+                self._size -= size
+
+    def clear(self):
+        for path, _, _ in list(self._entries()):
+            os.remove(path)
+        self._size = 0
@@ -0,0 +1,189 @@
+import functools
+import hashlib
+import inspect
+import os
+import numpy as np
+
+# === Array Indicators ===
+# NumPy versions of the Backtrader indicators used in backtrader_strategies.py.
+# Each follows Backtrader's definition (seeding, warmup length, Wilder
+# smoothing) so signals built from them line up bar for bar with Cerebro.
+# Values are NaN until the indicator would be ready in Backtrader.
+
+def sma(values, period):
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(values, period)
+        out[period - 1:] = windows.mean(axis=1)
+    return out
+
+
+def smma(values, period):
+    # Wilder's smoothed moving average: seeded with the SMA of the first
+    # `period` valid values, then y = y_prev + (x - y_prev) / period
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    start = int(np.argmax(~np.isnan(values))) if (~np.isnan(values)).any() else len(values)
+    seed_at = start + period - 1
+    if seed_at >= len(values):
+        return out
+
+    alpha = 1.0 / period
+    alpha1 = 1.0 - alpha
+    prev = values[start:seed_at + 1].mean()
+    out[seed_at] = prev
+    for i, x in enumerate(values[seed_at + 1:].tolist(), start=seed_at + 1):
+        prev = prev * alpha1 + x * alpha
+        out[i] = prev
+    return out
+
+
+def rsi(close, period=14):
+    close = np.asarray(close, dtype=float)
+    delta = np.full(len(close), np.nan)
+    delta[1:] = np.diff(close)
+    up = smma(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), period)
+    down = smma(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 - 100.0 / (1.0 + up / down)
+
+
+def true_range(high, low, close):
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    tr = np.full(len(close), np.nan)
+    prev_close = close[:-1]
+    tr[1:] = np.maximum(high[1:], prev_close) - np.minimum(low[1:], prev_close)
+    return tr
+
+
+def atr(high, low, close, period=14):
+    return smma(true_range(high, low, close), period)
+
+
+def adx(high, low, close, period=14):
+    high, low = np.asarray(high, dtype=float), np.asarray(low, dtype=float)
+    upmove = np.full(len(high), np.nan)
+    downmove = np.full(len(high), np.nan)
+    upmove[1:] = high[1:] - high[:-1]
+    downmove[1:] = low[:-1] - low[1:]
+
+    valid = ~np.isnan(upmove)
+    plus_dm = np.where(valid, np.where((upmove > downmove) & (upmove > 0.0), upmove, 0.0), np.nan)
+    minus_dm = np.where(valid, np.where((downmove > upmove) & (downmove > 0.0), downmove, 0.0), np.nan)
+
+    avg_tr = atr(high, low, close, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        di_plus = 100.0 * smma(plus_dm, period) / avg_tr
+        di_minus = 100.0 * smma(minus_dm, period) / avg_tr
+        dx = np.abs(di_plus - di_minus) / (di_plus + di_minus)
+    return 100.0 * smma(dx, period)
+
+
+def crossover(fast, slow):
+    # +1 when fast crosses above slow, -1 when it crosses below, else 0.
+    # Like Backtrader, a touch (zero difference) does not reset the side the
+    # lines were last on, so a cross is measured from the last non-zero gap.
+    diff = np.asarray(fast, dtype=float) - np.asarray(slow, dtype=float)
+    out = np.full(len(diff), np.nan)
+    valid = ~np.isnan(diff)
+    if not valid.any():
+        return out
+
+    first = int(np.argmax(valid))
+    keep = valid & ((diff != 0) | (np.arange(len(diff)) == first))
+    last = np.maximum.accumulate(np.where(keep, np.arange(len(diff)), -1))
+    nzd = np.where(last >= 0, diff[np.maximum(last, 0)], np.nan)
+
+    prev_nzd = nzd[:-1]
+    out[1:] = np.where((prev_nzd < 0) & (diff[1:] > 0), 1.0, 0.0) - np.where((prev_nzd > 0) & (diff[1:] < 0), 1.0, 0.0)
+    out[:first + 1] = np.nan
+    return out
+
+
+def first_valid(values):
+    valid = ~np.isnan(values)
+    return int(np.argmax(valid)) if valid.any() else len(values)
+
+
+# === Indicator Cache ===
+# Computes each indicator once per distinct (name, params) and hands the same
+# array to every strategy / parameter combination that asks for it. With a
+# store (strategies.indicator_store.IndicatorStore) and a symbol, results also
+# persist across runs, keyed on a fingerprint of the price data and a code
+# version: a hash of this module's source (and of the signal builder's module
+# for positions), so editing an indicator or a strategy misses the old arrays.
+
+# Bump when a change elsewhere (e.g. engine.positions_from_signals) alters
+# stored indicators or positions
+CACHE_VERSION = "1"
+
+
+@functools.lru_cache(maxsize=None)
+def _source_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+
+def code_version(*objects):
+    # CACHE_VERSION plus the source hash of the modules defining objects
+    paths = [__file__] + [inspect.getsourcefile(obj) for obj in objects]
+    return "|".join([CACHE_VERSION] + [_source_hash(os.path.abspath(p)) for p in paths])
+
+class IndicatorCache:
+    def __init__(self, df, symbol=None, store=None):
+        self.df = df
+        self.symbol = symbol
+        self.store = store if symbol is not None else None
+        self._fingerprint = None
+        self._arrays = {}
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            from strategies.indicator_store import data_fingerprint
+            self._fingerprint = data_fingerprint(self.df)
+        return self._fingerprint
+
+    def column(self, name):
+        return self._get(("column", name), lambda: self.df[name].to_numpy(dtype=float), persist=False)
+
+    def sma(self, period, column="Close"):
+        return self._get(("sma", column, period), lambda: sma(self.column(column), period))
+
+    def rsi(self, period):
+        return self._get(("rsi", period), lambda: rsi(self.column("Close"), period))
+
+    def atr(self, period):
+        return self._get(("atr", period), lambda: atr(self.column("High"), self.column("Low"), self.column("Close"), period))
+
+    def adx(self, period):
+        return self._get(("adx", period), lambda: adx(self.column("High"), self.column("Low"), self.column("Close"), period))
+
+    def crossover(self, fast, slow, column="Close"):
+        # Cheap to rebuild from the cached SMAs, so kept in memory only
+        return self._get(("crossover", column, fast, slow), lambda: crossover(self.sma(fast, column), self.sma(slow, column)), persist=False)
+
+    def positions(self, strategy_name, params, build):
+        # Strategy output (see strategies.signals), cached like an indicator
+        key = ("positions", strategy_name, tuple(sorted(params.items())))
+        return self._get(key, lambda: build(self, **params), version=code_version(build))
+
+    def _get(self, key, compute, persist=True, version=None):
+        if key in self._arrays:
+            return self._arrays[key]
+
+        values = None
+        if persist and self.store is not None:
+            stored_key = (version or code_version(), key)
+            values = self.store.get(self.symbol, self.fingerprint, stored_key)
+        if values is None:
+            values = compute()
+            if persist and self.store is not None:
+                self.store.put(self.symbol, self.fingerprint, stored_key, values)
+
+        self._arrays[key] = values
+        return values
+
+    def __len__(self):
+        return len(self.df)
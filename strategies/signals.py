@@ -0,0 +1,117 @@
+import numpy as np
+from backtester.engine import positions_from_signals
+from strategies.indicators import first_valid
+
+# === Array Signal Builders ===
+# Vectorized equivalents of the Backtrader strategies in backtrader_strategies.py.
+# Each builder takes an IndicatorCache plus the strategy params and returns a
+# per-bar position array (1 long, -1 short, 0 flat) decided on that bar's close.
+# Bars before Backtrader would first call next() (every indicator ready) are flat.
+#
+# The *_events functions return the (enter_long, enter_short, exit) masks the
+# positions come from. They only depend on indicators, so a window of the
+# history can restart flat by running state_machine_positions on slices of
+# them without recomputing anything (see walk_forward.py).
+
+def sma_crossover_events(cache, short=5, long=20):
+    cross = cache.crossover(short, long)
+    warmup = _warmup(cache.sma(short), cache.sma(long), cross)
+    return _after(cross > 0, warmup), np.zeros(len(cross), dtype=bool), _after(cross < 0, warmup)
+
+
+def sma_crossover_positions(cache, short=5, long=20):
+    cross = cache.crossover(short, long)
+    warmup = _warmup(cache.sma(short), cache.sma(long), cross)
+    signal = np.where(cross > 0, 1, np.where(cross < 0, -1, 0))
+    return positions_from_signals(_after(signal, warmup))
+
+
+def rsi_events(cache, period=14, lower=30, upper=70):
+    rsi = cache.rsi(period)
+    warmup = _warmup(rsi)
+    return _after(rsi < lower, warmup), np.zeros(len(rsi), dtype=bool), _after(rsi > upper, warmup)
+
+
+def rsi_positions(cache, period=14, lower=30, upper=70):
+    rsi = cache.rsi(period)
+    signal = np.where(rsi < lower, 1, np.where(rsi > upper, -1, 0))
+    return positions_from_signals(_after(signal, _warmup(rsi)))
+
+
+def pnshoot_events(cache, fast_period=20, slow_period=50, adx_period=14, atr_period=14,
+                   volume_period=20, adx_threshold=25, atr_mult=1.5, risk_reward=2.0):
+    # atr_mult / risk_reward are accepted for parity with the Backtrader params
+    # but, as in PNShootStrategy, they don't drive any decision
+    cross = cache.crossover(fast_period, slow_period)
+    adx = cache.adx(adx_period)
+    volume_sma = cache.sma(volume_period, column="Volume")
+    warmup = _warmup(cache.sma(fast_period), cache.sma(slow_period), adx,
+                     cache.atr(atr_period), volume_sma, cross)
+
+    setup = (adx > adx_threshold) & (cache.column("Volume") > volume_sma)
+    enter_long = _after((cross > 0) & setup, warmup)
+    enter_short = _after((cross < 0) & setup, warmup)
+    exit_position = _after((cross < 0) | (adx < 20), warmup)
+    return enter_long, enter_short, exit_position
+
+
+def pnshoot_positions(cache, **params):
+    return state_machine_positions(*pnshoot_events(cache, **params))
+
+
+def state_machine_positions(enter_long, enter_short, exit_position):
+    # Flat -> long/short on an entry bar, then hold until the next exit bar.
+    # Only jumps between events, so the Python loop runs once per trade.
+    return window_positions(event_index(enter_long, enter_short, exit_position), 0, len(exit_position))
+
+
+def event_index(enter_long, enter_short, exit_position):
+    # Next entry / exit bar at or after each bar, computed once per event set
+    return enter_long, _next_true(enter_long | enter_short), _next_true(exit_position)
+
+
+def window_positions(index, start, end):
+    # state_machine_positions over bars [start, end), starting flat at start,
+    # without re-scanning the masks for every window
+    enter_long, next_entry, next_exit = index
+    n = len(next_exit)
+    positions = np.zeros(end - start, dtype=np.int8)
+
+    i = next_entry[start] if start < n else n
+    while i < end:
+        side = 1 if enter_long[i] else -1
+        j = next_exit[i + 1] if i + 1 < n else n
+        positions[i - start:min(j, end) - start] = side
+        i = next_entry[j + 1] if j + 1 < n else n
+    return positions
+
+
+def _next_true(mask):
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    return np.minimum.accumulate(idx[::-1])[::-1]
+
+
+def _warmup(*arrays):
+    return max(first_valid(a) for a in arrays)
+
+
+def _after(values, start):
+    values = np.array(values)
+    values[:start] = 0
+    return values
+
+
+# === Registry ===
+# Keyed like main.strategy_map so the same names work everywhere
+position_builders = {
+    "sma_crossover": sma_crossover_positions,
+    "rsi": rsi_positions,
+    "pnshoot": pnshoot_positions
+}
+
+event_builders = {
+    "sma_crossover": sma_crossover_events,
+    "rsi": rsi_events,
+    "pnshoot": pnshoot_events
+}
@@ -0,0 +1,233 @@
+import math
+from collections import deque
+import numpy as np
+from strategies import indicators
+
+# === Streaming Indicators ===
+# Constant-time, per-bar versions of the indicators in strategies/indicators.py
+# (same Backtrader seeding and warmup). Each object keeps only the state it
+# needs, returns NaN until it is ready, and can be warmed from an array of
+# history in one call via from_history() before switching to update().
+
+NAN = float("nan")
+
+
+def _div(a, b):
+    # NumPy-style division: x / 0 -> +-inf, 0 / 0 -> NaN
+    if b == 0:
+        return NAN if a == 0 or a != a else math.copysign(math.inf, a)
+    return a / b
+
+
+class StreamingSMA:
+    __slots__ = ("period", "window", "total")
+
+    def __init__(self, period):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+
+    def update(self, x):
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        return self.total / self.period if len(self.window) == self.period else NAN
+
+    @property
+    def value(self):
+        return self.total / self.period if len(self.window) == self.period else NAN
+
+    @classmethod
+    def from_history(cls, values, period):
+        sma = cls(period)
+        tail = np.asarray(values, dtype=float)[-period:]
+        sma.window.extend(tail.tolist())
+        sma.total = float(tail.sum())
+        return sma
+
+
+class StreamingSMMA:
+    # Wilder smoothing; leading NaNs are skipped, like indicators.smma
+    __slots__ = ("period", "count", "seed_total", "value")
+
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.seed_total = 0.0
+        self.value = NAN
+
+    def update(self, x):
+        if self.count == 0 and x != x:
+            return NAN
+        self.count += 1
+        if self.count < self.period:
+            self.seed_total += x
+        elif self.count == self.period:
+            self.value = (self.seed_total + x) / self.period
+        else:
+            self.value += (x - self.value) / self.period
+        return self.value
+
+    @classmethod
+    def from_history(cls, values, period):
+        smma = cls(period)
+        values = np.asarray(values, dtype=float)
+        valid = values[indicators.first_valid(values):]
+        smma.count = len(valid)
+        if smma.count < period:
+            smma.seed_total = float(valid.sum())
+        else:
+            smma.value = float(indicators.smma(valid, period)[-1])
+        return smma
+
+
+class StreamingRSI:
+    __slots__ = ("period", "prev_close", "up", "down", "value")
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_close = None
+        self.up = StreamingSMMA(period)
+        self.down = StreamingSMMA(period)
+        self.value = NAN
+
+    def update(self, close):
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            up = self.up.update(max(delta, 0.0))
+            down = self.down.update(max(-delta, 0.0))
+            self.value = 100.0 - 100.0 / (1.0 + _div(up, down))
+        self.prev_close = close
+        return self.value
+
+    @classmethod
+    def from_history(cls, close, period=14):
+        rsi = cls(period)
+        close = np.asarray(close, dtype=float)
+        if len(close) == 0:
+            return rsi
+        delta = np.diff(close)
+        rsi.up = StreamingSMMA.from_history(np.maximum(delta, 0.0), period)
+        rsi.down = StreamingSMMA.from_history(np.maximum(-delta, 0.0), period)
+        rsi.prev_close = float(close[-1])
+        rsi.value = 100.0 - 100.0 / (1.0 + _div(rsi.up.value, rsi.down.value))
+        return rsi
+
+
+class StreamingATR:
+    __slots__ = ("period", "prev_close", "tr", "value")
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_close = None
+        self.tr = StreamingSMMA(period)
+        self.value = NAN
+
+    def update(self, high, low, close):
+        if self.prev_close is not None:
+            true_range = max(high, self.prev_close) - min(low, self.prev_close)
+            self.value = self.tr.update(true_range)
+        self.prev_close = close
+        return self.value
+
+    @classmethod
+    def from_history(cls, high, low, close, period=14):
+        atr = cls(period)
+        if len(close) == 0:
+            return atr
+        atr.tr = StreamingSMMA.from_history(indicators.true_range(high, low, close)[1:], period)
+        atr.prev_close = float(close[-1])
+        atr.value = atr.tr.value
+        return atr
+
+
+class StreamingADX:
+    __slots__ = ("period", "prev_high", "prev_low", "atr", "plus_dm", "minus_dm", "dx", "value")
+
+    def __init__(self, period=14):
+        self.period = period
+        self.prev_high = None
+        self.prev_low = None
+        self.atr = StreamingATR(period)
+        self.plus_dm = StreamingSMMA(period)
+        self.minus_dm = StreamingSMMA(period)
+        self.dx = StreamingSMMA(period)
+        self.value = NAN
+
+    def update(self, high, low, close):
+        avg_tr = self.atr.update(high, low, close)
+        if self.prev_high is not None:
+            upmove = high - self.prev_high
+            downmove = self.prev_low - low
+            plus = self.plus_dm.update(upmove if upmove > downmove and upmove > 0.0 else 0.0)
+            minus = self.minus_dm.update(downmove if downmove > upmove and downmove > 0.0 else 0.0)
+            if avg_tr == avg_tr:
+                di_plus = 100.0 * _div(plus, avg_tr)
+                di_minus = 100.0 * _div(minus, avg_tr)
+                self.value = 100.0 * self.dx.update(_div(abs(di_plus - di_minus), di_plus + di_minus))
+        self.prev_high, self.prev_low = high, low
+        return self.value
+
+    @classmethod
+    def from_history(cls, high, low, close, period=14):
+        adx = cls(period)
+        high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+        if len(close) == 0:
+            return adx
+
+        upmove = high[1:] - high[:-1]
+        downmove = low[:-1] - low[1:]
+        plus_dm = np.where((upmove > downmove) & (upmove > 0.0), upmove, 0.0)
+        minus_dm = np.where((downmove > upmove) & (downmove > 0.0), downmove, 0.0)
+        avg_tr = indicators.atr(high, low, close, period)[1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            di_plus = 100.0 * indicators.smma(plus_dm, period) / avg_tr
+            di_minus = 100.0 * indicators.smma(minus_dm, period) / avg_tr
+            dx = np.abs(di_plus - di_minus) / (di_plus + di_minus)
+
+        adx.atr = StreamingATR.from_history(high, low, close, period)
+        adx.plus_dm = StreamingSMMA.from_history(plus_dm, period)
+        adx.minus_dm = StreamingSMMA.from_history(minus_dm, period)
+        adx.dx = StreamingSMMA.from_history(dx, period)
+        adx.prev_high, adx.prev_low = float(high[-1]), float(low[-1])
+        adx.value = 100.0 * adx.dx.value
+        return adx
+
+
+class StreamingCrossOver:
+    # +1 / -1 on the bar fast crosses above / below slow, else 0. The side is
+    # judged from the last non-zero gap, so touching doesn't count as a cross.
+    __slots__ = ("last_gap", "value")
+
+    def __init__(self):
+        self.last_gap = None
+        self.value = NAN
+
+    def update(self, fast, slow):
+        gap = fast - slow
+        if gap != gap:
+            self.value = NAN
+            return self.value
+        if self.last_gap is None:
+            self.value = NAN
+        elif self.last_gap < 0 and gap > 0:
+            self.value = 1.0
+        elif self.last_gap > 0 and gap < 0:
+            self.value = -1.0
+        else:
+            self.value = 0.0
+        if gap != 0 or self.last_gap is None:
+            self.last_gap = gap
+        return self.value
+
+    @classmethod
+    def from_history(cls, fast, slow):
+        cross = cls()
+        gap = np.asarray(fast, dtype=float) - np.asarray(slow, dtype=float)
+        valid = gap[indicators.first_valid(gap):]
+        if len(valid):
+            nonzero = valid[valid != 0]
+            cross.last_gap = float(nonzero[-1]) if len(nonzero) else float(valid[0])
+            cross.value = float(indicators.crossover(fast, slow)[-1])
+        return cross
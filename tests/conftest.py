@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the top-level scripts (fetch_data, main, ...) like the CLI does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from data.bar_pyramid import build_pyramid, load_bars
+from data.price_store import legacy_csv_path
+
+
+def minutes(days=2):
+    index = pd.date_range("2024-03-01", periods=days * 24 * 60, freq="1min")
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 0.01, len(index)))
+    return pd.DataFrame({"Date": index, "Open": close, "High": close + 0.05, "Low": close - 0.05,
+                         "Close": close, "Volume": 1.0})
+
+
+def test_levels_aggregate_the_minutes(tmp_path):
+    store = str(tmp_path / "data" / "store")
+    counts = build_pyramid("SYN-USD", minutes(), store)
+    assert counts == {"1m": 2880, "5m": 576, "1h": 48, "1d": 2}
+    hours = load_bars("SYN-USD", "1h", store_dir=store)
+    first = minutes().iloc[:60]
+    assert hours["High"].iloc[0] == first["High"].max()
+    assert hours["Close"].iloc[0] == first["Close"].iloc[-1]
+
+
+def test_daily_default_follows_the_store_location(tmp_path, monkeypatch):
+    # A legacy CSV in the working directory's data/ belongs to another store
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "historical_SYN_USD.csv").write_text("Date,Close\n2020-01-01,1\n")
+    store = str(tmp_path / "other" / "store")
+    assert "1d" in build_pyramid("SYN-USD", minutes(), store)
+
+    # Next to its own store, the CSV's longer history is left alone
+    other_store = str(tmp_path / "third" / "store")
+    csv = legacy_csv_path("SYN-USD", other_store)
+    (tmp_path / "third").mkdir()
+    with open(csv, "w") as f:
+        f.write("Date,Close\n2020-01-01,1\n")
+    assert "1d" not in build_pyramid("SYN-USD", minutes(), other_store)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from backtester.costs import (EXCHANGE_TIERS, CombinedCost, CostModel, FixedBps, PerShare, SpreadSlippage,
+                              TieredFees, parse_costs)
+
+PRICE = np.array([100.0, 50.0, 20.0])
+HIGH = np.array([101.0, 51.0, 20.5])
+LOW = np.array([99.0, 49.5, 19.0])
+
+
+@pytest.mark.parametrize("model", [
+    FixedBps(10),
+    PerShare(0.005),
+    SpreadSlippage(0.1),
+    FixedBps(5) + SpreadSlippage(0.1)
+], ids=repr)
+def test_rate_is_the_cost_of_one_share_over_its_price(model):
+    np.testing.assert_allclose(model.rate(PRICE, HIGH, LOW), model.cost(1.0, PRICE, HIGH, LOW) / PRICE)
+
+
+def test_per_share_rate_ignores_the_minimum():
+    model = PerShare(0.005, minimum=1.0)
+    np.testing.assert_allclose(model.rate(PRICE), 0.005 / PRICE)
+    # The minimum still applies to share-based fills
+    np.testing.assert_allclose(model.cost(10.0, PRICE), [1.0, 1.0, 1.0])
+    np.testing.assert_allclose(model.cost(0.0, PRICE), [0.0, 0.0, 0.0])
+
+
+def test_tiered_rate_uses_the_first_tier():
+    model = TieredFees(EXCHANGE_TIERS)
+    np.testing.assert_allclose(model.rate(PRICE), np.full(3, 10 / 1e4))
+    np.testing.assert_allclose(model.cost(1.0, PRICE, volume=0.0) / PRICE, model.rate(PRICE))
+    # Past a threshold the fill pays the lower tier
+    np.testing.assert_allclose(model.cost(1.0, 100.0, volume=2e6), 100.0 * 9 / 1e4)
+
+
+def test_costs_scale_with_shares_and_ignore_side():
+    model = FixedBps(10) + SpreadSlippage(0.1)
+    np.testing.assert_allclose(model.cost(-3.0, PRICE, HIGH, LOW), 3 * model.cost(1.0, PRICE, HIGH, LOW))
+
+
+def test_parse_costs():
+    model = parse_costs("bps=10,per_share=0.005,min_fee=1,spread=0.1,tiered")
+    assert isinstance(model, CombinedCost)
+    assert [type(m) for m in model.models] == [FixedBps, PerShare, SpreadSlippage, TieredFees]
+    assert parse_costs("") is None
+    with pytest.raises(ValueError):
+        parse_costs("bps=10,rebate=2")
+
+
+def test_cost_model_is_abstract():
+    with pytest.raises(TypeError):
+        CostModel()
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from backtester.batch import backtest_batch
+from backtester.costs import parse_costs
+from backtester.engine import _cost_rates, backtest
+from data.synthetic import synthetic_ohlcv
+
+COSTS = [None, "bps=10", "bps=5,spread=0.1", "per_share=0.005,min_fee=1"]
+
+
+def signal_frame(seed, n_bars=300):
+    df = synthetic_ohlcv(n_bars=n_bars, seed=seed)
+    if "Date" in df.columns:
+        df = df.set_index("Date")
+    rng = np.random.default_rng(seed)
+    df["Signal"] = rng.choice([-1, 0, 1], size=len(df), p=[0.1, 0.8, 0.1])
+    return df
+
+
+@pytest.mark.parametrize("costs", COSTS, ids=lambda spec: spec or "frictionless")
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_loop_vectorized_and_batch_agree(costs, seed):
+    df = signal_frame(seed)
+    model = parse_costs(costs)
+    loop_df, loop = backtest(df, mode="loop", costs=model)
+    vec_df, vec = backtest(df, mode="vectorized", costs=model)
+
+    assert loop["Total Trades"] > 0
+    np.testing.assert_allclose(loop_df["Equity"], vec_df["Equity"], rtol=1e-9)
+    assert loop.keys() == vec.keys()
+    for name, value in loop.items():
+        assert value == pytest.approx(vec[name], rel=1e-9, abs=0.011, nan_ok=True), name
+
+    close = df["Close"].to_numpy()[:, None]
+    rates = _cost_rates(df, model)[:, None] if model is not None else None
+    equity, metrics = backtest_batch(close, df["Signal"].to_numpy()[:, None], cost_rate=rates)
+    # The batch curve includes the skipped first bar
+    np.testing.assert_allclose(equity[1:, 0], loop_df["Equity"], rtol=1e-9)
+    for name, value in loop.items():
+        assert float(metrics[name][0]) == pytest.approx(value, rel=1e-9, abs=0.011, nan_ok=True), name
+
+
+def test_batch_columns_run_independently():
+    frames = [signal_frame(seed) for seed in (1, 2)]
+    close = np.column_stack([f["Close"].to_numpy() for f in frames])
+    signals = np.column_stack([f["Signal"].to_numpy() for f in frames])
+    equity, _ = backtest_batch(close, signals)
+    for column in range(len(frames)):
+        single, _ = backtest_batch(close[:, [column]], signals[:, [column]])
+        np.testing.assert_allclose(equity[:, column], single[:, 0])
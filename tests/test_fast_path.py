@@ -0,0 +1,32 @@
+import pytest
+
+from backtester.costs import parse_costs
+from backtester.fast_path import compare_run
+from data.synthetic import synthetic_ohlcv
+from run_backtest import summary_metrics
+from strategies.backtrader_strategies import PNShootStrategy, RSIStrategy, SMACrossoverStrategy
+
+STRATEGIES = {"sma_crossover": SMACrossoverStrategy, "rsi": RSIStrategy, "pnshoot": PNShootStrategy}
+COSTS = [None, "bps=10,spread=0.1", "per_share=0.005,min_fee=1", "tiered"]
+
+
+@pytest.mark.parametrize("costs", COSTS, ids=lambda spec: spec or "frictionless")
+@pytest.mark.parametrize("strategy_name", list(STRATEGIES))
+@pytest.mark.parametrize("seed", [5, 11])
+def test_fast_path_matches_cerebro(tmp_path, strategy_name, costs, seed):
+    df = synthetic_ohlcv(n_bars=1000, seed=seed)
+    problems = compare_run("SYN", strategy_name, STRATEGIES[strategy_name], df, str(tmp_path), costs=parse_costs(costs))
+    assert problems == []
+
+
+def test_compare_run_reports_both_engines_failing(tmp_path):
+    # Neither engine knows a 2-day bar
+    df = synthetic_ohlcv(n_bars=400, seed=5)
+    problems = compare_run("SYN", "rsi", RSIStrategy, df, str(tmp_path), timeframe="2d")
+    assert len(problems) == 1
+    assert problems[0].startswith("both engines failed")
+
+
+def test_summary_metrics_undefined_sharpe_is_zero():
+    metrics = summary_metrics(100000, 100000, 0, 0, None, 0.0)
+    assert metrics["Sharpe Ratio"] == 0.0
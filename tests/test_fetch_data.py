@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.price_store import load_prices
+from data.synthetic import synthetic_ohlcv
+from fetch_data import is_crypto, update_cached_data
+
+
+class StubDownloader:
+    # yf.download stand-in serving [start, end) of a fixed history
+    def __init__(self, history):
+        self.history = history
+        self.calls = []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        rows = self.history[(self.history.index >= start) & (self.history.index < end)]
+        return rows.copy()
+
+
+def daily_history(freq="D"):
+    return synthetic_ohlcv(n_bars=60, start="2024-01-01", freq=freq, seed=1)
+
+
+def cached_slice(history, start, end):
+    return history[(history.index >= start) & (history.index < end)].reset_index()
+
+
+@pytest.fixture(autouse=True)
+def scratch_store(tmp_path, monkeypatch):
+    # update_cached_data writes to the relative data/store
+    monkeypatch.chdir(tmp_path)
+
+
+def test_is_crypto():
+    assert is_crypto("BTC-USD") and is_crypto("ETH-BTC") and is_crypto("bnb-eth")
+    assert not is_crypto("AAPL") and not is_crypto("BRK-B")
+
+
+def test_crypto_head_gap_on_weekend_is_backfilled():
+    history = daily_history()
+    downloader = StubDownloader(history)
+    # 2024-01-06/07 is a weekend: a crypto cache starting on the Monday
+    # misses two bars
+    cached = cached_slice(history, "2024-01-08", "2024-02-01")
+    df = update_cached_data("BTC-USD", cached, "2024-01-06", "2024-02-01", downloader)
+
+    assert downloader.calls[0] == (pd.Timestamp("2024-01-06"), pd.Timestamp("2024-01-08"))
+    assert df["Date"].iloc[0] == pd.Timestamp("2024-01-06")
+    assert len(df) == len(cached) + 2
+    assert len(load_prices("BTC-USD")) == len(df)
+
+
+def test_equity_weekend_head_is_not_requested():
+    history = daily_history(freq="B")
+    downloader = StubDownloader(history)
+    cached = cached_slice(history, "2024-01-08", "2024-02-01")
+    df = update_cached_data("AAPL", cached, "2024-01-06", "2024-02-01", downloader)
+
+    assert downloader.calls == []
+    assert df.equals(cached.sort_values("Date").reset_index(drop=True))
+
+
+def test_tail_gap_is_appended():
+    history = daily_history()
+    downloader = StubDownloader(history)
+    cached = cached_slice(history, "2024-01-01", "2024-01-20")
+    df = update_cached_data("BTC-USD", cached, "2024-01-01", "2024-02-01", downloader)
+
+    # The tail request starts at the last cached bar to check the overlap
+    assert downloader.calls == [(pd.Timestamp("2024-01-19"), pd.Timestamp("2024-02-01"))]
+    assert df["Date"].iloc[-1] == pd.Timestamp("2024-01-31")
+    assert df["Date"].is_unique
+    np.testing.assert_allclose(df["Close"], history.loc[:"2024-01-31", "Close"])
+
+
+def test_revised_history_is_downloaded_again():
+    history = daily_history()
+    cached = cached_slice(history, "2024-01-01", "2024-01-20")
+    # The provider restated everything (e.g. a split adjustment)
+    restated = history.copy()
+    restated[["Open", "High", "Low", "Close"]] *= 0.5
+    downloader = StubDownloader(restated)
+    df = update_cached_data("BTC-USD", cached, "2024-01-01", "2024-02-01", downloader)
+
+    assert downloader.calls[-1] == (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01"))
+    np.testing.assert_allclose(df["Close"], restated.loc[:"2024-01-31", "Close"])
+    np.testing.assert_allclose(load_prices("BTC-USD")["Close"], restated.loc[:"2024-01-31", "Close"])
+
+
+def test_up_to_date_cache_downloads_nothing():
+    history = daily_history()
+    downloader = StubDownloader(history)
+    cached = cached_slice(history, "2024-01-01", "2024-02-01")
+    df = update_cached_data("BTC-USD", cached, "2024-01-01", "2024-02-01", downloader)
+
+    assert downloader.calls == []
+    assert len(df) == len(cached)
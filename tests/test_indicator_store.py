@@ -0,0 +1,66 @@
+import numpy as np
+
+from data.synthetic import synthetic_ohlcv
+from strategies import indicators
+from strategies.indicators import IndicatorCache
+from strategies.indicator_store import IndicatorStore
+from strategies.signals import position_builders
+
+
+def test_positions_round_trip_through_the_store(tmp_path):
+    store = IndicatorStore(str(tmp_path))
+    df = synthetic_ohlcv(n_bars=300, seed=3)
+    calls = []
+
+    def build(cache, **params):
+        calls.append(params)
+        return position_builders["rsi"](cache, **params)
+
+    first = IndicatorCache(df, symbol="SYN", store=store).positions("rsi", {}, build)
+    again = IndicatorCache(df, symbol="SYN", store=store).positions("rsi", {}, build)
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first, again)
+
+
+def test_code_version_change_misses(tmp_path, monkeypatch):
+    store = IndicatorStore(str(tmp_path))
+    df = synthetic_ohlcv(n_bars=300, seed=3)
+    IndicatorCache(df, symbol="SYN", store=store).sma(20)
+
+    calls = []
+    real_sma = indicators.sma
+    monkeypatch.setattr(indicators, "sma", lambda *a: calls.append(a) or real_sma(*a))
+    IndicatorCache(df, symbol="SYN", store=store).sma(20)
+    assert calls == []
+
+    monkeypatch.setattr(indicators, "CACHE_VERSION", indicators.CACHE_VERSION + "-next")
+    IndicatorCache(df, symbol="SYN", store=store).sma(20)
+    assert len(calls) == 1
+
+
+def test_rewriting_an_entry_keeps_the_size_exact(tmp_path):
+    store = IndicatorStore(str(tmp_path))
+    values = np.arange(1000, dtype=float)
+    for _ in range(3):
+        store.put("SYN", "fp", ("sma", 20), values)
+    store.put("SYN", "fp", ("sma", 50), values)
+    on_disk = sum(f.stat().st_size for f in tmp_path.glob("*.parquet"))
+    assert store._size == on_disk
+
+
+def test_eviction_drops_the_least_recently_used(tmp_path):
+    values = np.arange(1000, dtype=float)
+    probe = IndicatorStore(str(tmp_path / "probe"))
+    probe.put("SYN", "fp", "x", values)
+    entry_size = probe._size
+
+    store = IndicatorStore(str(tmp_path / "store"), max_bytes=int(entry_size * 2.5))
+    for key in ("a", "b"):
+        store.put("SYN", "fp", key, values)
+    # Rewriting "a" must not count twice and push "b" out
+    store.put("SYN", "fp", "a", values)
+    assert store.get("SYN", "fp", "b") is not None
+    store.put("SYN", "fp", "c", values)
+    assert store.get("SYN", "fp", "a") is None
+    assert store.get("SYN", "fp", "b") is not None
+    assert store.get("SYN", "fp", "c") is not None
@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+
+from backtester.metrics import MetricsAccumulator, batch_metrics
+
+RATIOS = ("Sharpe Ratio", "Sortino Ratio", "Calmar Ratio")
+
+
+def accumulate(curve):
+    acc = MetricsAccumulator()
+    for value in curve:
+        acc.update(float(value))
+    return acc.result()
+
+
+def step_curve():
+    # Flat, one gain, flat: no losses and no drawdown
+    curve = np.full(300, 100000.0)
+    curve[150:] *= 1.0001
+    return curve
+
+
+def test_accumulator_matches_batch():
+    rng = np.random.default_rng(1)
+    curve = 100000 * np.cumprod(1 + rng.normal(0.0005, 0.01, 500))
+    loop, batch = accumulate(curve), batch_metrics(curve)
+    for name in (*RATIOS, "Max Drawdown"):
+        assert math.isclose(loop[name], float(batch[name]), rel_tol=1e-9)
+
+
+def test_rounding_noise_leaves_ratios_undefined():
+    # One-ulp dip, as a loop engine summing cash + position value leaves
+    noisy = step_curve()
+    noisy[200] = np.nextafter(noisy[200], 0)
+    for curve in (step_curve(), noisy):
+        loop, batch = accumulate(curve), batch_metrics(curve)
+        for name in ("Sortino Ratio", "Calmar Ratio"):
+            assert math.isnan(loop[name])
+            assert math.isnan(float(batch[name]))
+
+
+def test_flat_curve_sharpe_is_undefined_in_both():
+    curve = np.full(50, 100000.0)
+    assert math.isnan(accumulate(curve)["Sharpe Ratio"])
+    assert math.isnan(float(batch_metrics(curve)["Sharpe Ratio"]))
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from backtester.monte_carlo import block_path_indices, simulate, summarize, trade_path_indices
+
+RETURNS = np.random.default_rng(3).normal(0.001, 0.02, 500)
+
+
+@pytest.mark.parametrize("method", ["block", "trades"])
+def test_same_seed_same_distributions(method):
+    first = simulate(RETURNS, method, n_paths=2500, seed=42, chunk_size=1000)
+    again = simulate(RETURNS, method, n_paths=2500, seed=42, chunk_size=1000)
+    other = simulate(RETURNS, method, n_paths=2500, seed=43, chunk_size=1000)
+    for name in first:
+        np.testing.assert_array_equal(first[name], again[name])
+        assert len(first[name]) == 2500
+    assert not np.array_equal(first["Percent Return"], other["Percent Return"])
+
+
+@pytest.mark.parametrize("n_returns,block_size", [(500, 20), (503, 20), (30, 7), (10, 25)])
+def test_block_paths_are_runs_of_consecutive_returns(n_returns, block_size):
+    idx = block_path_indices(np.random.default_rng(0), n_returns, 50, block_size)
+    assert idx.shape == (50, n_returns)
+    assert idx.min() >= 0 and idx.max() < n_returns
+    # Within a block each index follows the last (wrapping); blocks restart freely
+    steps = (np.diff(idx, axis=1) % n_returns)[:, np.arange(1, n_returns) % block_size != 0]
+    assert (steps == 1).all()
+
+
+def test_block_paths_honour_a_custom_length():
+    idx = block_path_indices(np.random.default_rng(0), 100, 4, block_size=8, length=37)
+    assert idx.shape == (4, 37)
+
+
+def test_trade_paths_draw_with_replacement():
+    idx = trade_path_indices(np.random.default_rng(0), 10, 200)
+    assert idx.shape == (200, 10)
+    assert set(np.unique(idx)) == set(range(10))
+
+
+def test_summarize_reports_percentiles_and_loss_odds():
+    row = summarize({"Percent Return": np.array([-1.0, 1.0, 2.0, 3.0])})
+    assert row["Percent Return p50"] == 1.5
+    assert row["Loss Probability"] == 25.0
+
+
+def test_too_few_returns():
+    with pytest.raises(ValueError):
+        simulate([0.01], "block")
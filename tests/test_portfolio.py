@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from backtester.portfolio import backtest_portfolio, equal_weight, rebalance_schedule, simulate_portfolio
+
+NAN = np.nan
+
+
+def test_shared_cash_splits_equity_between_open_positions():
+    close = np.array([[100.0, 50.0], [100.0, 50.0], [110.0, 50.0], [110.0, 25.0]])
+    positions = np.array([[1, 0], [1, 1], [1, 1], [1, 1]])
+    weights = equal_weight(positions)
+    rebalance = np.array([True, True, False, False])
+    equity, turnover = simulate_portfolio(close, weights, rebalance)
+    # All in A, then half moved to B; between rebalances the shares drift
+    np.testing.assert_allclose(equity, [10000, 10000, 10500, 8000])
+    np.testing.assert_allclose(turnover, [10000, 10000, 0, 0])
+
+
+def test_missing_bar_keeps_the_book_within_equity():
+    close = np.array([[100.0, 50.0], [NAN, 50.0], [100.0, 50.0]])
+    positions = np.array([[1, 0], [1, 1], [1, 1]])
+    weights = equal_weight(positions)
+    rebalance = np.array([True, True, False])
+    equity, turnover = simulate_portfolio(close, weights, rebalance)
+    np.testing.assert_allclose(equity, [10000, 10000, 10000])
+    # A can't sell without a bar, so B waits; both trade once A's bar is back
+    np.testing.assert_allclose(turnover, [10000, 0, 10000])
+
+
+def test_missing_bar_sizes_the_others_from_what_is_left():
+    # A holds a third of equity on a day without a bar, while weights ask for a half
+    close = np.array([[100.0, 50.0, 20.0], [NAN, 50.0, 20.0], [100.0, 50.0, 20.0]])
+    weights = np.array([[1 / 3, 1 / 3, 1 / 3], [0.5, 0.5, 0.0], [0.5, 0.5, 0.0]])
+    rebalance = np.array([True, True, False])
+    _, turnover = simulate_portfolio(close, weights, rebalance)
+    # B stays at its half-weight target (5000): C sells 3333, B buys 1667
+    np.testing.assert_allclose(turnover[1], 10000 / 3 + (5000 - 10000 / 3))
+
+
+def test_max_positions_leaves_free_slots_in_cash():
+    positions = np.array([[1, 0, 0], [1, 1, 0], [1, 1, 1], [1, 1, 1]])
+    weights = equal_weight(positions, max_positions=2)
+    np.testing.assert_allclose(weights[:, 0], [0.5, 0.5, 1 / 3, 1 / 3])
+    assert (np.abs(weights).sum(axis=1) <= 1 + 1e-12).all()
+
+    index = pd.date_range("2024-01-01", periods=4)
+    close = np.full((4, 3), 100.0)
+    close[1:, 0] = 200.0
+    equity, _, metrics = backtest_portfolio(close, positions, index, max_positions=2)
+    # Half the cash sits out the first day; A's doubling then adds 50%
+    np.testing.assert_allclose(equity, [10000, 15000, 15000, 15000])
+    assert metrics["Rebalances"] == 3
+
+
+def test_rebalance_schedule_adds_periodic_dates():
+    index = pd.date_range("2024-01-29", periods=6)
+    positions = np.ones((6, 1), dtype=np.int8)
+    np.testing.assert_array_equal(rebalance_schedule(index, positions), [True, False, False, False, False, False])
+    np.testing.assert_array_equal(rebalance_schedule(index, positions, "M"), [True, False, False, True, False, False])
@@ -0,0 +1,25 @@
+import pytest
+
+from data.price_store import has_prices
+from prefetch import FakeProvider, prefetch
+
+
+@pytest.fixture(autouse=True)
+def scratch_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def test_fake_provider_refuses_the_real_store():
+    with pytest.raises(ValueError):
+        prefetch(["SQ"], provider=FakeProvider(latency=0))
+    assert not has_prices("SQ")
+
+
+def test_fake_provider_fills_a_scratch_store(tmp_path):
+    store = str(tmp_path / "scratch")
+    result = prefetch(["SQ", "GLXY"], provider=FakeProvider(latency=0), store_dir=store, rate=0)
+    assert sorted(result["saved"]) == ["GLXY", "SQ"]
+    assert has_prices("SQ", store) and not has_prices("SQ")
+
+    # Symbols already in the scratch store are skipped
+    assert prefetch(["SQ"], provider=FakeProvider(latency=0), store_dir=store)["saved"] == []
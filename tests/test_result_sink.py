@@ -0,0 +1,64 @@
+import sqlite3
+
+from backtester.result_sink import ResultSink, load_summary
+
+METRICS = ["Percent Return", "Sharpe Ratio"]
+
+
+def write_rows(db_path, returns, **variant):
+    sink = ResultSink(METRICS, ["rsi"], path=str(db_path), **variant)
+    for symbol, value in returns.items():
+        sink.write({"Symbol": symbol, "Strategy": "rsi", "Percent Return": value, "Sharpe Ratio": 1.0})
+    sink.write({"Symbol": "BAD", "Strategy": "rsi", "Error": "No valid data"})
+    sink.close()
+
+
+def test_cost_runs_sit_next_to_cost_free_runs(tmp_path):
+    db_path = tmp_path / "results.db"
+    write_rows(db_path, {"AAA": 5.0, "BBB": 2.0})
+    write_rows(db_path, {"AAA": 4.0}, costs="bps=10")
+
+    plain = load_summary("rsi", db_path=str(db_path))
+    costed = load_summary("rsi", db_path=str(db_path), costs="bps=10")
+    assert dict(zip(plain["Symbol"], plain["Percent Return"])) == {"AAA": 5.0, "BBB": 2.0}
+    assert dict(zip(costed["Symbol"], costed["Percent Return"])) == {"AAA": 4.0}
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM failures").fetchone()[0] == 2
+
+
+def test_old_table_is_migrated_to_the_variant_key(tmp_path):
+    db_path = tmp_path / "results.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute('CREATE TABLE results ("Symbol" TEXT NOT NULL, "Strategy" TEXT NOT NULL, '
+                     '"Percent Return" NUMERIC, "Old Metric" NUMERIC, "Error" TEXT, "Run" TEXT, "Updated" TEXT, '
+                     'PRIMARY KEY ("Symbol", "Strategy"))')
+        conn.execute("""INSERT INTO results VALUES ('AAA', 'rsi', 5.0, 7.0, NULL, 'old', 'old')""")
+
+    write_rows(db_path, {"BBB": 3.0}, costs="bps=10")
+    plain = load_summary("rsi", db_path=str(db_path))
+    assert plain["Symbol"].tolist() == ["AAA"]
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute('SELECT "Old Metric" FROM results WHERE "Symbol" = \'AAA\'').fetchone()[0] == 7.0
+
+
+def test_intraday_runs_keep_their_own_rows(tmp_path):
+    db_path = tmp_path / "results.db"
+    write_rows(db_path, {"AAA": 5.0})
+    write_rows(db_path, {"AAA": 0.5}, timeframe="1h")
+    write_rows(db_path, {"AAA": 0.2}, timeframe="1h", costs="bps=10")
+
+    assert load_summary("rsi", db_path=str(db_path))["Percent Return"].tolist() == [5.0]
+    assert load_summary("rsi", db_path=str(db_path), timeframe="1h")["Percent Return"].tolist() == [0.5]
+    assert load_summary(db_path=str(db_path), timeframe="1h", costs="bps=10")["Percent Return"].tolist() == [0.2]
+
+
+def test_strategy_names_are_escaped_in_the_views(tmp_path):
+    db_path = tmp_path / "results.db"
+    name = "o'neil"
+    sink = ResultSink(METRICS, [name], path=str(db_path))
+    sink.write({"Symbol": "AAA", "Strategy": name, "Percent Return": 5.0, "Sharpe Ratio": 1.0})
+    sink.write({"Symbol": "AAA", "Strategy": "rsi", "Percent Return": 2.0, "Sharpe Ratio": 1.0})
+    sink.close()
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute('SELECT "Strategy", "Percent Return" FROM "summary_o\'neil"').fetchall()
+    assert rows == [(name, 5.0)]
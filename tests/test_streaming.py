@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from data.synthetic import synthetic_ohlcv
+from strategies import indicators
+from strategies.streaming import StreamingADX, StreamingATR, StreamingCrossOver, StreamingRSI, StreamingSMA
+
+SPLITS = [1, 5, 14, 15, 40, 150]
+
+
+@pytest.fixture(scope="module")
+def bars():
+    df = synthetic_ohlcv(n_bars=300, seed=7)
+    return {c: df[c].to_numpy(dtype=float) for c in ("High", "Low", "Close")}
+
+
+def crossing_lines():
+    # Rounded SMAs touch (zero gap) now and then, which must not count as a cross
+    close = np.round(synthetic_ohlcv(n_bars=300, seed=9)["Close"].to_numpy(dtype=float))
+    return np.round(indicators.sma(close, 5)), np.round(indicators.sma(close, 20))
+
+
+# (batch array, history -> streaming object, streaming object, bar -> update args)
+def cases(bars):
+    high, low, close = bars["High"], bars["Low"], bars["Close"]
+    fast, slow = crossing_lines()
+    return {
+        "sma": (indicators.sma(close, 20), lambda n: StreamingSMA.from_history(close[:n], 20),
+                lambda: StreamingSMA(20), lambda i: (close[i],)),
+        "rsi": (indicators.rsi(close, 14), lambda n: StreamingRSI.from_history(close[:n], 14),
+                lambda: StreamingRSI(14), lambda i: (close[i],)),
+        "atr": (indicators.atr(high, low, close, 14), lambda n: StreamingATR.from_history(high[:n], low[:n], close[:n], 14),
+                lambda: StreamingATR(14), lambda i: (high[i], low[i], close[i])),
+        "adx": (indicators.adx(high, low, close, 14), lambda n: StreamingADX.from_history(high[:n], low[:n], close[:n], 14),
+                lambda: StreamingADX(14), lambda i: (high[i], low[i], close[i])),
+        "crossover": (indicators.crossover(fast, slow), lambda n: StreamingCrossOver.from_history(fast[:n], slow[:n]),
+                      lambda: StreamingCrossOver(), lambda i: (fast[i], slow[i])),
+    }
+
+
+NAMES = ["sma", "rsi", "atr", "adx", "crossover"]
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_update_matches_batch(bars, name):
+    expected, _, new, args = cases(bars)[name]
+    stream = new()
+    values = [stream.update(*args(i)) for i in range(len(expected))]
+    np.testing.assert_allclose(values, expected, rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("split", SPLITS)
+@pytest.mark.parametrize("name", NAMES)
+def test_from_history_then_update_matches_batch(bars, name, split):
+    expected, warm, _, args = cases(bars)[name]
+    stream = warm(split)
+    np.testing.assert_allclose(stream.value, expected[split - 1], rtol=1e-9, equal_nan=True)
+    values = [stream.update(*args(i)) for i in range(split, len(expected))]
+    np.testing.assert_allclose(values, expected[split:], rtol=1e-9, equal_nan=True)
+
+
+def test_crossover_lines_do_touch():
+    fast, slow = crossing_lines()
+    gap = fast - slow
+    assert (gap == 0).any()
+    assert np.nansum(np.abs(indicators.crossover(fast, slow))) > 0
@@ -1,11 +1,10 @@
 import os
 import plotly.express as px
-import pandas as pd
-from .utils import load_csv, safe_symbol
+from .utils import load_summary, load_curve, load_curve_file, safe_symbol
 
 def plot_equity_curve(file_path, strategy="sma_crossover", save=False, output_dir="figures"):
-    df = load_csv(file_path)
-    symbol = os.path.basename(file_path).replace(".csv", "")
+    df = load_curve_file(file_path)
+    symbol = os.path.splitext(os.path.basename(file_path))[0]
 
     fig = px.line(df, x="Date", y="Equity", title=f"Equity Curve - {symbol} ({strategy})")
     fig.update_layout(template="plotly_white")
@@ -16,19 +15,16 @@ def plot_equity_curve(file_path, strategy="sma_crossover", save=False, output_di
     fig.show()
 
 def plot_top_n_equity_curves(n=5, strategy="sma_crossover", save=False, output_dir="figures"):
-    summary_path = f"results/summary_{strategy}.csv"
-    if not os.path.exists(summary_path):
-        print(f"❌ {summary_path} not found.")
+    summary = load_summary(strategy)
+    if summary.empty:
         return
 
-    summary = pd.read_csv(summary_path)
     top_symbols = summary.sort_values("Percent Return", ascending=False).head(n)["Symbol"]
 
     fig = None
     for symbol in top_symbols:
-        curve_path = f"results/equity_curves/{safe_symbol}.csv"
-        if os.path.exists(curve_path):
-            df = pd.read_csv(curve_path, parse_dates=["Date"])
+        df = load_curve(strategy, symbol)
+        if df is not None:
             if fig is None:
                 fig = px.line(df, x="Date", y="Equity", labels={"Equity": "Equity ($)"}, title=f"Top {n} Equity Curves ({strategy})")
                 fig.update_traces(name=symbol, selector=dict(name='Equity'))
@@ -1,10 +1,10 @@
 import os
 import plotly.express as px
 import pandas as pd
-from utils import load_csv
+from .utils import load_csv, load_summary
 
-def plot_metric_scatter(csv_file="results/summary_sma_crossover.csv", x_metric="Sharpe Ratio", y_metric="Percent Return", save=False, output_dir="figures"):
-    df = load_csv(csv_file)
+def plot_metric_scatter(csv_file=None, x_metric="Sharpe Ratio", y_metric="Percent Return", save=False, output_dir="figures", strategy="sma_crossover"):
+    df = load_summary(strategy) if csv_file is None else load_csv(csv_file)
 
     fig = px.scatter(df, x=x_metric, y=y_metric, color="Symbol",
                      title=f"{y_metric} vs {x_metric}",
@@ -16,8 +16,8 @@ def plot_metric_scatter(csv_file="results/summary_sma_crossover.csv", x_metric="
         fig.write_image(f"{output_dir}/scatter_{y_metric}_{x_metric}.png")
     fig.show()
 
-def plot_sharpe_distribution(csv_file="results/summary_all.csv", save=False, output_dir="figures"):
-    df = pd.read_csv(csv_file)
+def plot_sharpe_distribution(csv_file=None, save=False, output_dir="figures"):
+    df = load_summary() if csv_file is None else pd.read_csv(csv_file)
     fig = px.histogram(df, x="Sharpe Ratio", nbins=20,
                        title="Distribution of Sharpe Ratios",
                        labels={"Sharpe Ratio": "Sharpe Ratio"})
@@ -32,8 +32,8 @@ def plot_sharpe_distribution(csv_file="results/summary_all.csv", save=False, out
     fig.show()
 
 
-def plot_drawdown_vs_return(csv_file="results/summary_all.csv", save=False, output_dir="figures"):
-    df = pd.read_csv(csv_file)
+def plot_drawdown_vs_return(csv_file=None, save=False, output_dir="figures"):
+    df = load_summary() if csv_file is None else pd.read_csv(csv_file)
     fig = px.scatter(df, x="Max Drawdown", y="Percent Return", color="Strategy",
                      title="Return vs Max Drawdown",
                      labels={"Max Drawdown": "Max Drawdown (%)", "Percent Return": "Percent Return (%)"})
@@ -48,8 +48,8 @@ def plot_drawdown_vs_return(csv_file="results/summary_all.csv", save=False, outp
     fig.show()
 
 
-def plot_winrate_bar(csv_file="results/summary_all.csv", save=False, output_dir="figures"):
-    df = pd.read_csv(csv_file)
+def plot_winrate_bar(csv_file=None, save=False, output_dir="figures"):
+    df = load_summary() if csv_file is None else pd.read_csv(csv_file)
     df = df.sort_values("Win Rate", ascending=False)
     fig = px.bar(df, x="Symbol", y="Win Rate", color="Strategy",
                  title="Win Rate by Symbol",
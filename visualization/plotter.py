@@ -1,11 +1,12 @@
 import os
 import pandas as pd
 import plotly.express as px
+from .utils import load_summary, load_curve_file, load_curve
 
 
 def plot_equity_curve(file_path, strategy="sma_crossover", save=False, output_dir="figures"):
-    df = pd.read_csv(file_path, parse_dates=["Date"])
-    symbol = os.path.basename(file_path).replace(".csv", "")
+    df = load_curve_file(file_path)
+    symbol = os.path.splitext(os.path.basename(file_path))[0]
 
     fig = px.line(
         df,
@@ -26,10 +27,7 @@ def plot_equity_curve(file_path, strategy="sma_crossover", save=False, output_di
 
 
 def plot_summary_bar(strategy="sma_crossover", csv_file=None, metric="Percent Return", save=False, output_dir="figures"):
-    if csv_file is None:
-        csv_file = f"results/summary_{strategy}.csv"
-
-    df = pd.read_csv(csv_file)
+    df = load_summary(strategy) if csv_file is None else pd.read_csv(csv_file)
     df = df.sort_values(metric, ascending=False)
 
     fig = px.bar(df, x="Symbol", y=metric, title=f"{metric} by Symbol ({strategy})", labels={metric: metric})
@@ -45,19 +43,16 @@ def plot_summary_bar(strategy="sma_crossover", csv_file=None, metric="Percent Re
 
 
 def plot_top_n_equity_curves(n=5, strategy="sma_crossover", save=False, output_dir="figures"):
-    summary_path = f"results/summary_{strategy}.csv"
-    if not os.path.exists(summary_path):
-        print(f"❌ {summary_path} not found.")
+    summary = load_summary(strategy)
+    if summary.empty:
         return
 
-    summary = pd.read_csv(summary_path)
     top_symbols = summary.sort_values("Percent Return", ascending=False).head(n)["Symbol"]
 
     fig = None
     for symbol in top_symbols:
-        curve_path = f"results/equity_curves/{symbol}.csv"
-        if os.path.exists(curve_path):
-            df = pd.read_csv(curve_path, parse_dates=["Date"])
+        df = load_curve(strategy, symbol)
+        if df is not None:
             if fig is None:
                 fig = px.line(df, x="Date", y="Equity", labels={"Equity": "Equity ($)"}, title=f"Top {n} Equity Curves ({strategy})")
                 fig.update_traces(name=symbol, selector=dict(name='Equity'))
@@ -1,9 +1,9 @@
 import os
 import plotly.express as px
-from .utils import load_csv
+from .utils import load_csv, load_summary
 
-def plot_summary_bar(csv_file="results/summary_sma_crossover.csv", metric="Percent Return", save=False, output_dir="figures"):
-    df = load_csv(csv_file)
+def plot_summary_bar(csv_file=None, metric="Percent Return", save=False, output_dir="figures", strategy="sma_crossover"):
+    df = load_summary(strategy) if csv_file is None else load_csv(csv_file)
     df = df.sort_values(metric, ascending=False)
 
     fig = px.bar(df, x="Symbol", y=metric, title=f"{metric} by Symbol", labels={metric: metric})
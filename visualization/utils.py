@@ -1,5 +1,7 @@
 import os
 import pandas as pd
+from backtester.result_sink import load_summary as _load_summary
+from backtester.equity_store import load_curve, load_curve_file
 
 def load_csv(path):
     if not os.path.exists(path):
@@ -7,5 +9,12 @@ def load_csv(path):
         return pd.DataFrame()
     return pd.read_csv(path, parse_dates=["Date"]) if "Date" in open(path).readline() else pd.read_csv(path)
 
+def load_summary(strategy=None):
+    df = _load_summary(strategy)
+    if df is None:
+        print(f"⚠️ No results found for {strategy or 'all strategies'}")
+        return pd.DataFrame()
+    return df
+
 def safe_symbol(symbol):
     return symbol.replace("-", "_").replace("/", "_")
@@ -0,0 +1,151 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from multiprocessing import Pool, cpu_count
+from fetch_data import fetch_window
+from main import load_symbols_from_csv
+from optimize import param_grids, expand_grid, parse_param_overrides, BATCH_SIZE
+from backtester.batch import backtest_batch_positions
+from strategies.indicators import IndicatorCache
+from strategies.signals import event_builders, event_index, window_positions
+
+# === Walk-Forward Evaluation ===
+# Splits each symbol's history into rolling train/test windows, picks the best
+# parameter set on each train window (same grids and batch kernel as
+# optimize.py) and scores it on the following test window.
+#
+# Overlapping windows share all of the expensive work: indicators, the
+# entry/exit event masks and their next-event indexes are computed once per
+# (symbol, params) on the full history, with proper warmup, and each window
+# only replays the position state machine from flat at its first bar.
+
+TEST_METRICS = ["Percent Return", "Total Trades", "Win Rate", "Sharpe Ratio", "Max Drawdown"]
+
+
+def walk_forward_windows(n_bars, train_bars, test_bars, step=None):
+    # [(train_start, test_start, test_end)] as bar offsets, test_end exclusive
+    step = step or test_bars
+    windows = []
+    start = 0
+    while start + train_bars + test_bars <= n_bars:
+        windows.append((start, start + train_bars, start + train_bars + test_bars))
+        start += step
+    return windows
+
+
+def score_window(close, indexes, start, end):
+    # Batch metrics for every event set over bars [start, end)
+    positions = np.stack([window_positions(index, start, end) for index in indexes])[:, :, None]
+    _, metrics = backtest_batch_positions(close[start:end, None], positions)
+    return {k: np.asarray(v, dtype=float).reshape(-1) for k, v in metrics.items()}
+
+
+# === Per-Symbol Walk-Forward ===
+def walk_forward_symbol(args_tuple):
+    symbol, combos_by_strategy, start_date, end_date, train_bars, test_bars, step, metric = args_tuple
+    try:
+        df = fetch_window(symbol, start_date, end_date)
+        if df is None or df.empty:
+            raise ValueError("No valid data")
+
+        dates = pd.DatetimeIndex(df["Date"] if "Date" in df.columns else df.index)
+        windows = walk_forward_windows(len(df), train_bars, test_bars, step)
+        if not windows:
+            raise ValueError(f"Only {len(df)} bars, need {train_bars + test_bars} for one window")
+
+        cache = IndicatorCache(df)
+        close = cache.column("Close")
+        frames = {}
+
+        for strategy_name, combos in combos_by_strategy.items():
+            build = event_builders[strategy_name]
+            indexes = [event_index(*build(cache, **params)) for params in combos]
+
+            rows = []
+            for w, (train_start, test_start, test_end) in enumerate(windows):
+                scores = np.concatenate([
+                    score_window(close, indexes[i:i + BATCH_SIZE], train_start, test_start)[metric]
+                    for i in range(0, len(indexes), BATCH_SIZE)
+                ])
+                best = int(np.nanargmax(scores)) if not np.isnan(scores).all() else 0
+                test = score_window(close, [indexes[best]], test_start, test_end)
+
+                rows.append({
+                    "Symbol": symbol,
+                    "Window": w,
+                    "Train Start": dates[train_start].date(),
+                    "Test Start": dates[test_start].date(),
+                    "Test End": dates[test_end - 1].date(),
+                    **combos[best],
+                    f"Train {metric}": scores[best],
+                    **{k: test[k][0] for k in TEST_METRICS}
+                })
+            frames[strategy_name] = pd.DataFrame(rows)
+
+        return symbol, frames, None
+
+    except Exception as e:
+        print(f"❌ Error in walk-forward for {symbol}: {e}")
+        return symbol, {}, str(e)
+
+
+# === Main Execution ===
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward (rolling train/test) parameter evaluation.")
+    parser.add_argument("--symbol", help="Single ticker symbol (e.g. SOL-USD)")
+    parser.add_argument("--strategy", choices=list(param_grids.keys()), help="Only evaluate this strategy")
+    parser.add_argument("--param", action="append", help="Override a grid axis, e.g. --param short=5,10,15")
+    parser.add_argument("--start", default="2022-01-01")
+    parser.add_argument("--end", default="2025-05-01")
+    parser.add_argument("--train", type=int, default=252, help="Bars per train window")
+    parser.add_argument("--test", type=int, default=21, help="Bars per test window")
+    parser.add_argument("--step", type=int, help="Bars between window starts (default: --test)")
+    parser.add_argument("--metric", default="Sharpe Ratio", help="Train metric used to pick params")
+    parser.add_argument("--workers", type=int, default=cpu_count())
+    args = parser.parse_args()
+
+    symbols = [args.symbol] if args.symbol else load_symbols_from_csv()
+    strategy_names = [args.strategy] if args.strategy else list(param_grids.keys())
+
+    overrides = parse_param_overrides(args.param)
+    combos_by_strategy = {
+        s: expand_grid(s, {**param_grids[s], **{k: v for k, v in overrides.items() if k in param_grids[s]}})
+        for s in strategy_names
+    }
+    print(f"🔍 Walk-forward over {len(symbols)} symbols "
+          f"(train {args.train} / test {args.test} bars) using {args.workers} cores...")
+
+    tasks = [
+        (symbol, combos_by_strategy, args.start, args.end, args.train, args.test, args.step, args.metric)
+        for symbol in symbols
+    ]
+    results = {s: [] for s in strategy_names}
+    with Pool(processes=max(1, args.workers)) as pool:
+        for symbol, frames, error in pool.imap_unordered(walk_forward_symbol, tasks):
+            for strategy_name, frame in frames.items():
+                frame.insert(1, "Strategy", strategy_name)
+                results[strategy_name].append(frame)
+
+    os.makedirs("results/walk_forward", exist_ok=True)
+    for strategy_name, frames in results.items():
+        if not frames:
+            continue
+        df = pd.concat(frames, ignore_index=True).sort_values(["Symbol", "Window"])
+        path = f"results/walk_forward/walk_forward_{strategy_name}.csv"
+        df.to_csv(path, index=False)
+        print(f"✅ Saved {len(df)} windows to {path}")
+
+        # Out-of-sample summary: test windows chained per symbol
+        summary = df.groupby("Symbol").agg(
+            Windows=("Window", "count"),
+            **{"OOS Return": ("Percent Return", lambda r: round(((1 + r / 100).prod() - 1) * 100, 2))},
+            **{"Mean Test Sharpe": ("Sharpe Ratio", lambda s: round(s.mean(), 2))},
+            **{f"Mean Train {args.metric}": (f"Train {args.metric}", lambda s: round(s.mean(), 2))}
+        )
+        print(summary.to_string())
+
+
+# Entry point
+if __name__ == "__main__":
+    main()